@@ -0,0 +1,132 @@
+"""SSVEP detection in a separate process, reading EEG from a shared-memory ring buffer."""
+
+import multiprocessing as mp
+import queue
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..signal.ssvep_detector import SSVEPConfig, SSVEPDetector
+from ..stream.realtime import RealtimeConfig, RealtimeScope
+from ..stream.shared_ring import SharedRingBuffer
+
+# (frequency, confidence, scores, rejection_reason, sample_total)
+WorkerResult = Tuple[float, float, Dict[float, float], Optional[str], int]
+
+
+def run_detector(
+    ring_name: str,
+    config: SSVEPConfig,
+    channel_names: Optional[List[str]],
+    step_samples: int,
+    results: "mp.Queue",
+    stop: "mp.Event",
+    realtime: Optional[RealtimeConfig] = None,
+    reports: Optional["mp.Queue"] = None,
+) -> None:
+    """
+    Worker loop: score the latest window once per step_samples of new data.
+
+    Windows are read as views of the shared ring (no copies, no pickling);
+    only the small result tuples cross the process boundary. With realtime,
+    the loop runs under a RealtimeScope whose report is put on reports.
+    """
+    scope = RealtimeScope(realtime) if realtime is not None else None
+    if scope is not None:
+        report = scope.enter()
+        if reports is not None:
+            reports.put(report)
+    ring = SharedRingBuffer.attach(ring_name)
+    detector = SSVEPDetector(config)
+    window_samples = int(config.window_seconds * config.sample_rate)
+    min_needed = max(10, detector.min_padlen() + 8)
+    next_total = ring.total
+    reader = ring.reader()
+    try:
+        while not stop.is_set():
+            total = ring.total
+            if total < next_total + step_samples:
+                time.sleep(0.002)
+                continue
+            next_total = max(next_total + step_samples, total - step_samples)
+
+            # read_total: the sample count the data read ends at (same seqlock read as the data)
+            if config.streaming:
+                # Only samples the streaming filter has not seen yet
+                data, _, lost = reader.read()
+                read_total = reader.position
+                if lost:
+                    detector.reset_stream()
+                freq, conf, scores = detector.detect_streaming(data, channel_names)
+                if detector.stream_samples < 10:
+                    continue
+            else:
+                data, _, read_total = ring.view_latest_with_total(window_samples)
+                if data is None or data.shape[0] < min_needed:
+                    continue
+                freq, conf, scores = detector.detect(data, channel_names)
+            if not ring.is_intact(read_total, data.shape[0]):
+                continue  # writer lapped the window while it was being scored
+            results.put((freq, conf, scores, detector.last_rejection, read_total))
+            if scope is not None:
+                scope.safe_point()
+    finally:
+        ring.close()
+        if scope is not None:
+            scope.exit()
+
+
+class DetectorWorker:
+    """Runs run_detector in a child process and collects its results."""
+
+    def __init__(self, config: SSVEPConfig, realtime: Optional[RealtimeConfig] = None):
+        self.config = config
+        self.realtime = realtime
+        # Spawn: never fork a process that owns a Qt event loop
+        self._ctx = mp.get_context("spawn")
+        self._results = self._ctx.Queue()
+        self._reports = self._ctx.Queue()
+        self._stop = self._ctx.Event()
+        self.process: Optional[mp.Process] = None
+        self._report: Dict[str, Dict] = {}
+
+    def start(self, ring_name: str, channel_names: Optional[List[str]], step_samples: int) -> None:
+        """Start the worker on an existing SharedRingBuffer."""
+        self._stop.clear()
+        self.process = self._ctx.Process(
+            target=run_detector,
+            args=(ring_name, self.config, channel_names, int(step_samples), self._results, self._stop,
+                  self.realtime, self._reports),
+            daemon=True,
+        )
+        self.process.start()
+
+    def poll(self) -> List[WorkerResult]:
+        """Return all results produced since the last poll (non-blocking)."""
+        out = []
+        while True:
+            try:
+                out.append(self._results.get_nowait())
+            except queue.Empty:
+                return out
+
+    def realtime_report(self) -> Dict[str, Dict]:
+        """Which real-time settings took effect in the worker ({} until it has applied them)."""
+        if not self._report:
+            try:
+                self._report = self._reports.get_nowait()
+            except queue.Empty:
+                pass
+        return self._report
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Ask the worker to exit and wait for it."""
+        if self.process is None:
+            return
+        self._stop.set()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
@@ -1,6 +1,7 @@
 #src/neurorelay/bridge/qt_live_bridge.py
 """Qt bridge for live SSVEP predictions."""
 
+import dataclasses
 from typing import List, Dict, Optional, Any
 
 try:
@@ -18,6 +19,7 @@ except ImportError:
             pass
 
 from ..stream.lsl_source import LSLSource, LSLConfig
+from ..stream.realtime import RealtimeConfig, RealtimeScope, format_report
 from ..signal.ssvep_detector import SSVEPDetector, SSVEPConfig
 
 
@@ -28,23 +30,55 @@ class LivePredictor(QObject):
     prediction = Signal(float, float, dict)  # (frequency, confidence, scores)
     status_changed = Signal(str)  # Status message
     data_received = Signal(int)  # Number of samples received
+    rejected = Signal(str)  # Artifact-guard rejection reason for the latest window
+    _samples_ready = Signal()  # Emitted from the acquisition thread, handled on the Qt thread
     
-    def __init__(self, lsl_config: LSLConfig, ssvep_config: SSVEPConfig):
+    def __init__(
+        self,
+        lsl_config: LSLConfig,
+        ssvep_config: SSVEPConfig,
+        step_seconds: Optional[float] = None,
+        worker_process: bool = False,
+        realtime: Optional[RealtimeConfig] = None
+    ):
         if not QT_AVAILABLE:
             raise ImportError("PySide6 not available. Install with: uv sync -E ui")
         
         super().__init__()
+        # Detection in a child process reading the shared-memory ring, off the GUI thread's GIL
+        if worker_process:
+            lsl_config = dataclasses.replace(lsl_config, shared_memory=True)  # leave the caller's config as is
         self.lsl_config = lsl_config
         self.ssvep_config = ssvep_config
         
+        self.worker_process = worker_process
+        self._worker = None
+        if worker_process:
+            self._poll_timer = QTimer(self)
+            self._poll_timer.timeout.connect(self._poll_worker)
+        
         self.lsl_source = LSLSource(lsl_config)
+        
+        # Real-time settings for the decoding thread (this one, or the worker process)
+        self.realtime = realtime
+        self._realtime_scope: Optional[RealtimeScope] = None
+        self.realtime_report: Dict[str, Dict[str, Any]] = {}
         self.detector = SSVEPDetector(ssvep_config)
         
-        # Prediction timer
+        # Prediction timer (used when not driven by incoming samples)
         self.timer = QTimer(self)
         self.timer.timeout.connect(self._predict)
         self.prediction_interval_ms = 250  # 4 Hz prediction rate
         
+        # Data-driven cadence: predict once per step_seconds of new samples
+        self.step_seconds = step_seconds
+        self._subscription: Optional[int] = None
+        self._samples_ready.connect(self._predict)
+        
+        # Cursor over acquired samples for the streaming filter (streaming mode)
+        self._reader = None
+        self._gaps_seen = 0
+        
         self.running = False
     
     def start(self) -> bool:
@@ -59,15 +93,37 @@ class LivePredictor(QObject):
         
         # Update detector sample rate from LSL info
         if self.lsl_source.sample_rate:
-            self.detector.update_config(sample_rate=self.lsl_source.sample_rate)
+            try:
+                self.detector.update_config(sample_rate=self.lsl_source.sample_rate)
+            except ValueError as e:  # e.g. a TRCA model trained at another rate
+                self.lsl_source.close()
+                self.status_changed.emit(f"Detector setup failed: {e}")
+                return False
+        
+        self._reader = self.lsl_source.reader()
+        self._gaps_seen = len(self.lsl_source.gaps)
+        self.detector.reset_stream()
         
         # Start LSL acquisition
         if not self.lsl_source.start():
             self.status_changed.emit("Failed to start LSL acquisition")
             return False
         
-        # Start prediction timer
-        self.timer.start(self.prediction_interval_ms)
+        if self.realtime is not None and not self.worker_process:
+            # _predict runs on this (Qt) thread
+            self._realtime_scope = RealtimeScope(self.realtime)
+            self.realtime_report = self._realtime_scope.enter()
+            print("Decoding real-time mode:\n" + format_report(self.realtime_report))
+            applied = sum(r["applied"] for r in self.realtime_report.values())
+            self.status_changed.emit(f"Real-time mode: {applied}/{len(self.realtime_report)} settings applied")
+        
+        # Start predicting on new data (or on the timer)
+        if self.worker_process:
+            self._start_worker()
+        elif self.step_seconds:
+            self._subscribe_samples()
+        else:
+            self.timer.start(self.prediction_interval_ms)
         self.running = True
         self.status_changed.emit("Live prediction started")
         return True
@@ -78,32 +134,107 @@ class LivePredictor(QObject):
             return
         
         self.timer.stop()
-        self.lsl_source.stop()
+        self._unsubscribe_samples()
+        if self._worker is not None:
+            self._poll_timer.stop()
+            self._worker.stop()
+            self._worker = None
+        if self._realtime_scope is not None:
+            self._realtime_scope.exit()
+            self._realtime_scope = None
+        self.lsl_source.close()
         self.running = False
         self.status_changed.emit("Live prediction stopped")
     
+    def _subscribe_samples(self) -> None:
+        """Request a prediction every step_seconds worth of acquired samples."""
+        step = max(1, int(round(self.step_seconds * (self.lsl_source.sample_rate or self.ssvep_config.sample_rate))))
+        self._subscription = self.lsl_source.subscribe(lambda total: self._samples_ready.emit(), step)
+    
+    def _unsubscribe_samples(self) -> None:
+        if self._subscription is not None:
+            self.lsl_source.unsubscribe(self._subscription)
+            self._subscription = None
+    
+    def _start_worker(self) -> None:
+        """Launch the detector process on the shared ring and poll its results."""
+        from .detector_worker import DetectorWorker
+        
+        sample_rate = self.lsl_source.sample_rate or self.ssvep_config.sample_rate
+        step = self.step_seconds or self.prediction_interval_ms / 1000.0
+        self._worker = DetectorWorker(self.ssvep_config, self.realtime)
+        self.realtime_report = {}
+        self._worker.start(self.lsl_source.buffer.name, self.lsl_source.channel_names,
+                           max(1, int(round(step * sample_rate))))
+        self._poll_timer.start(20)
+    
+    def _restart_worker(self) -> None:
+        """The worker holds its own copy of the config; restart it after changes."""
+        self._poll_timer.stop()
+        self._worker.stop()
+        self._start_worker()
+    
+    def _poll_worker(self) -> None:
+        """Forward results from the detector process as Qt signals."""
+        if self._worker is None:
+            return
+        for best_freq, confidence, scores, rejection, _ in self._worker.poll():
+            if scores:
+                self.prediction.emit(best_freq, confidence, scores)
+            elif rejection:
+                self.rejected.emit(rejection)
+        if self.realtime is not None and not self.realtime_report:
+            self.realtime_report = self._worker.realtime_report()
+        if not self._worker.is_alive():
+            self._poll_timer.stop()
+            self.status_changed.emit("Detector process exited")
+    
     def _predict(self) -> None:
         """Make a prediction and emit results."""
         if not self.running:
             return
         
         try:
-            # Get recent data from LSL source
-            data, timestamps, info = self.lsl_source.get_latest_data(self.ssvep_config.window_seconds)
-            
-            min_needed = max(10, self.detector.min_padlen() + 8)  # small safety margin
-            if data is None or data.shape[0] < min_needed:
-                return
+            gaps = self.lsl_source.gaps
+            if self.ssvep_config.streaming:
+                if len(gaps) != self._gaps_seen:
+                    # Stream reconnected: restart the filter on the samples after the gap
+                    self._gaps_seen = len(gaps)
+                    self._reader.position = max(self._reader.position, gaps[-1][0])
+                    self.detector.reset_stream()
+                # Only feed samples the streaming filter has not seen yet
+                data, _, lost = self._reader.read()
+                if lost:
+                    self.detector.reset_stream()  # filter state no longer matches the signal
+                if data.shape[0] == 0:
+                    return
+                best_freq, confidence, scores = self.detector.detect_streaming(data, self.lsl_source.channel_names)
+                if self.detector.stream_samples < 10:
+                    return
+            else:
+                # Get recent data from LSL source
+                data, timestamps, info = self.lsl_source.get_latest_data(self.ssvep_config.window_seconds, copy=False)
+                
+                min_needed = max(10, self.detector.min_padlen() + 8)  # small safety margin
+                if data is None or data.shape[0] < min_needed:
+                    return
+                if gaps and self.lsl_source.samples_received - gaps[-1][0] < data.shape[0]:
+                    return  # window still spans a reconnect gap
+                
+                # Detect SSVEP with channel names from LSL metadata
+                ch_names = info.get('channel_names') if info else None
+                best_freq, confidence, scores = self.detector.detect(data, ch_names)
             
-            # Detect SSVEP with channel names from LSL metadata
-            ch_names = info.get('channel_names') if info else None
-            best_freq, confidence, scores = self.detector.detect(data, ch_names)
-            
-            # Emit prediction signal
-            self.prediction.emit(best_freq, confidence, scores)
+            # Emit prediction signal (or why the window was dropped)
+            if scores:
+                self.prediction.emit(best_freq, confidence, scores)
+            elif self.detector.last_rejection:
+                self.rejected.emit(self.detector.last_rejection)
             
             # Emit data received signal
             self.data_received.emit(data.shape[0])
+            if self._realtime_scope is not None:
+                self._realtime_scope.safe_point()  # prediction is out; collect now if due
             
         except Exception as e:
             self.status_changed.emit(f"Prediction error: {str(e)}")
@@ -113,30 +244,57 @@ class LivePredictor(QObject):
         """Update target frequencies."""
         self.detector.update_config(frequencies=frequencies)
         self.ssvep_config.frequencies = frequencies
+        if self._worker is not None:
+            self._restart_worker()
     
     def update_prediction_rate(self, rate_hz: float):
-        """Update prediction rate (Hz)."""
+        """Update prediction rate (Hz); switches to wall-clock timer polling."""
         if rate_hz <= 0:
             self.status_changed.emit("Invalid prediction rate (must be > 0)")
             return
         self.prediction_interval_ms = max(50, int(1000 / rate_hz))
         self.timer.setInterval(self.prediction_interval_ms)
+        self.step_seconds = None
         if not self.running:
             return
+        if self._worker is not None:
+            self._restart_worker()
+        elif self._subscription is not None:
+            self._unsubscribe_samples()
+            self.timer.start(self.prediction_interval_ms)
         # Timer automatically uses the new interval on next timeout
     
+    def update_step(self, step_seconds: float):
+        """Predict once per step_seconds of newly acquired samples."""
+        if step_seconds <= 0:
+            self.status_changed.emit("Invalid prediction step (must be > 0)")
+            return
+        self.step_seconds = float(step_seconds)
+        if not self.running:
+            return
+        if self._worker is not None:
+            self._restart_worker()
+            return
+        self.timer.stop()
+        self._unsubscribe_samples()
+        self._subscribe_samples()
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current status information."""
         status = {
             'running': self.running,
             'lsl_connected': self.lsl_source.is_connected() if self.lsl_source else False,
-            'prediction_rate_hz': 1000 / self.prediction_interval_ms if self.prediction_interval_ms > 0 else 0,
+            'prediction_rate_hz': (1.0 / self.step_seconds if self.step_seconds
+                                   else 1000 / self.prediction_interval_ms if self.prediction_interval_ms > 0 else 0),
             'frequencies': self.ssvep_config.frequencies,
-            'window_seconds': self.ssvep_config.window_seconds
+            'window_seconds': self.ssvep_config.window_seconds,
+            'decoder_realtime': self.realtime_report
         }
         
         if self.lsl_source and self.lsl_source.is_connected():
             status.update(self.lsl_source.get_info())
+            # Samples acquired but not yet scored (streaming path): the detector is behind
+            status['reader_backlog'] = self._reader.pending if self._reader is not None else 0
         
         return status
 
@@ -147,7 +305,11 @@ def create_live_predictor(
     window_seconds: float = 3.0,
     channels: Optional[List[str]] = None,
     bandpass: tuple = (5.0, 40.0),
-    notch: Optional[float] = None
+    notch: Optional[float] = None,
+    streaming: bool = False,
+    artifact_guard: bool = False,
+    step_seconds: Optional[float] = None,
+    worker_process: bool = False
 ) -> LivePredictor:
     """Convenience function to create a LivePredictor with common settings."""
     
@@ -165,7 +327,9 @@ def create_live_predictor(
         bandpass_freq=bandpass,
         notch_freq=notch,
         harmonics=2,
-        method="cca"
+        method="cca",
+        streaming=streaming,
+        artifact_guard=artifact_guard
     )
     
-    return LivePredictor(lsl_config, ssvep_config)
\ No newline at end of file
+    return LivePredictor(lsl_config, ssvep_config, step_seconds=step_seconds, worker_process=worker_process)
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""Record labeled SSVEP trials and train a TRCA model for SSVEPDetector(method="trca")."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..signal.ssvep_detector import SSVEPConfig, SSVEPDetector
+from ..signal.trca import train_trca
+
+LABELS = ("SUMMARIZE", "TODOS", "DEADLINES", "EMAIL")
+
+
+def trials_from_labels(data: np.ndarray, labels: np.ndarray, n_classes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cut one trial per contiguous run of a class label.
+
+    Args:
+        data: Samples (n_samples, n_channels)
+        labels: Class index per sample (-1 for rest)
+        n_classes: Number of target classes
+
+    Returns:
+        (trials (n_trials, n_trial_samples, n_channels), trial_labels); trials are
+        cropped to the shortest run so they stack
+    """
+    labels = np.asarray(labels, dtype=int)
+    edges = np.flatnonzero(np.diff(labels)) + 1
+    starts = np.concatenate(([0], edges))
+    stops = np.concatenate((edges, [labels.shape[0]]))
+    runs = [(a, b) for a, b in zip(starts, stops) if 0 <= labels[a] < n_classes]
+    if not runs:
+        raise ValueError("No labeled segments found")
+    length = min(b - a for a, b in runs)
+    trials = np.stack([data[a:a + length] for a, _ in runs])
+    return trials, np.array([labels[a] for a, _ in runs])
+
+
+def trials_from_csv(
+    path: Path, n_classes: int, channels: Optional[List[str]] = None
+) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """Load trials from a replay CSV with a label column (default: every channel column)."""
+    from ..stream.source_replay import channel_columns, load_csv
+
+    arr, header = load_csv(path, channels)
+    channels = list(channels) if channels else channel_columns(header)
+    trials, trial_labels = trials_from_labels(arr[:, 1:-1], arr[:, -1], n_classes)
+    return trials, trial_labels, channels
+
+
+def trials_from_lsl(
+    frequencies: List[float],
+    trial_sec: float,
+    rest_sec: float,
+    rounds: int,
+    stream_type: str = "EEG",
+    stream_name: Optional[str] = None,
+) -> Tuple[np.ndarray, np.ndarray, List[str], float]:
+    """
+    Live calibration run: cue each target on the console while the UI flickers.
+
+    Returns:
+        (trials, trial_labels, channel_names, sample_rate)
+    """
+    from ..stream.lsl_source import LSLConfig, LSLSource
+
+    source = LSLSource(LSLConfig(stream_type=stream_type, stream_name=stream_name,
+                                 buffer_seconds=trial_sec + rest_sec + 2.0))
+    if not source.connect() or not source.start():
+        raise RuntimeError("Could not start LSL acquisition")
+
+    trials = []
+    trial_labels = []
+    try:
+        for r in range(rounds):
+            for k in np.random.permutation(len(frequencies)):
+                label = LABELS[k] if k < len(LABELS) else f"target {k}"
+                print(f"[round {r + 1}/{rounds}] Look at {label} ({frequencies[k]:.2f} Hz)...")
+                time.sleep(rest_sec)
+                time.sleep(trial_sec)
+                data, _, _ = source.get_latest_data(trial_sec)
+                if data is None:
+                    raise RuntimeError("No data received from LSL stream")
+                trials.append(data)
+                trial_labels.append(int(k))
+    finally:
+        source.stop()
+
+    length = min(t.shape[0] for t in trials)
+    return (np.stack([t[-length:] for t in trials]), np.array(trial_labels),
+            source.channel_names, float(source.sample_rate))
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Train a TRCA model from labeled SSVEP trials")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--csv", help="Replay CSV with a label column (t,<channels>,label)")
+    src.add_argument("--lsl", action="store_true", help="Record a live calibration run from LSL")
+    p.add_argument("--out", default="models/trca.npz", help="Output model path")
+    p.add_argument("--freqs", default="8.57,10,12,15", help="Target frequencies (Hz), in label order")
+    p.add_argument("--sr", type=float, default=250.0, help="Sample rate of the CSV (Hz)")
+    p.add_argument("--channels", help="CSV channel columns, comma-separated (default: all)")
+    p.add_argument("--bandpass", default="5,40", help="Bandpass filter range (Hz)")
+    p.add_argument("--notch", type=float, help="Notch filter frequency (Hz)")
+    p.add_argument("--no-ensemble", action="store_true", help="Use per-class filters only")
+    p.add_argument("--trial-sec", type=float, default=4.0, help="Live trial length (s)")
+    p.add_argument("--rest-sec", type=float, default=1.5, help="Live rest/cue time before each trial (s)")
+    p.add_argument("--rounds", type=int, default=5, help="Live trials per target")
+    p.add_argument("--stream-type", default="EEG", help="LSL stream type")
+    p.add_argument("--stream-name", help="LSL stream name (optional)")
+    args = p.parse_args()
+
+    frequencies = [float(f.strip()) for f in args.freqs.split(",")]
+    lo, hi = (float(x) for x in args.bandpass.split(","))
+
+    if args.csv:
+        csv_channels = [c.strip() for c in args.channels.split(",")] if args.channels else None
+        trials, trial_labels, channels = trials_from_csv(Path(args.csv), len(frequencies), csv_channels)
+        sample_rate = args.sr
+    else:
+        trials, trial_labels, channels, sample_rate = trials_from_lsl(
+            frequencies, args.trial_sec, args.rest_sec, args.rounds, args.stream_type, args.stream_name
+        )
+
+    # Same preprocessing the detector applies at inference
+    detector = SSVEPDetector(SSVEPConfig(
+        frequencies=frequencies,
+        sample_rate=sample_rate,
+        window_seconds=trials.shape[1] / sample_rate,
+        bandpass_freq=(lo, hi),
+        notch_freq=args.notch,
+    ))
+    filtered = np.stack([detector.preprocess(t) for t in trials])
+
+    model = train_trca(filtered, trial_labels, frequencies, sample_rate,
+                       channels=channels, ensemble=not args.no_ensemble)
+    model.save(Path(args.out))
+    print(f"Trained TRCA on {len(trials)} trials x {trials.shape[1]} samples x {trials.shape[2]} channels")
+    print(f"Wrote {Path(args.out).resolve()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""Convert replay CSV sessions to the compact binary session format."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from ..stream.session_file import SUFFIX, SessionFile, csv_to_session
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Convert replay CSV (t,<channels>,label) to a binary session file")
+    p.add_argument("csv", nargs="+", help="CSV file(s) to convert")
+    p.add_argument("--out", help=f"Output path (single input only; default: input with {SUFFIX})")
+    p.add_argument("--sr", type=float, help="Sample rate (Hz); default: estimated from the t column")
+    p.add_argument("--channels", help="Channel columns to keep, comma-separated (default: all)")
+    args = p.parse_args()
+
+    if args.out and len(args.csv) > 1:
+        print("--out needs a single input file")
+        return 1
+    channels = [c.strip() for c in args.channels.split(",")] if args.channels else None
+
+    for name in args.csv:
+        src = Path(name)
+        out = Path(args.out) if args.out else src.with_suffix(SUFFIX)
+        csv_to_session(src, out, sample_rate=args.sr, channels=channels)
+        session = SessionFile(out)
+        ratio = src.stat().st_size / max(1, out.stat().st_size)
+        print(f"{src} -> {out}: {len(session)} samples x {len(session.channels)} channels "
+              f"@ {session.sample_rate:g} Hz ({ratio:.1f}x smaller)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
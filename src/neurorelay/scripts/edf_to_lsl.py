@@ -1,26 +1,48 @@
 # edf_to_lsl.py
-import time, numpy as np, pyedflib
-from pylsl import StreamInfo, StreamOutlet
-
-EDF = "session.edf"
-BLK_S = 1.0
-
-f = pyedflib.EdfReader(EDF)
-nch = f.signals_in_file
-fs  = int(round(f.getSampleFrequency(0)))
-ns  = min(f.getNSamples())  # por si difiere entre canales
-labels = f.getSignalLabels()
-
-info = StreamInfo('EDFRelay', 'EEG', nch, fs, 'float32', 'edf-relay')
-out  = StreamOutlet(info, chunk_size=int(fs*BLK_S))
-
-# Carga completa por canal una sola vez (más eficiente)
-signals = [f.readSignal(c).astype('float32', copy=False) for c in range(nch)]
-f.close()
-
-step = int(fs * BLK_S)
-for i in range(0, ns, step):
-    end = min(ns, i + step)
-    chunk = np.stack([sig[i:end] for sig in signals], axis=1)
-    out.push_chunk(chunk.tolist())
-    time.sleep(BLK_S)
+"""Replay an EDF, replay CSV or binary session file to LSL with exact timing."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from ..stream.lsl_replay import PublisherConfig, ReplayPublisher
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Publish a recording as a live LSL EEG stream")
+    p.add_argument("path", nargs="?", default="session.edf", help="EDF, replay CSV or .nrs session file")
+    p.add_argument("--name", default="EDFRelay", help="LSL stream name")
+    p.add_argument("--type", default="EEG", help="LSL stream type")
+    p.add_argument("--source-id", default="edf-relay", help="LSL source_id")
+    p.add_argument("--chunk-sec", type=float, default=0.04, help="Seconds of data per pushed chunk")
+    p.add_argument("--speed", type=float, default=1.0, help="Replay speed (1 = real time, 0 = as fast as possible)")
+    p.add_argument("--channels", help="Channels to publish, comma-separated (default: all)")
+    p.add_argument("--loop", action="store_true", help="Start over at the end of the recording")
+    args = p.parse_args()
+
+    channels = [c.strip() for c in args.channels.split(",")] if args.channels else None
+    config = PublisherConfig(stream_name=args.name, stream_type=args.type, source_id=args.source_id,
+                             chunk_sec=args.chunk_sec, speed=args.speed, loop=args.loop)
+    publisher = ReplayPublisher.from_file(Path(args.path), config, channels)
+    n = publisher.data.shape[0]
+    print(f"Publishing {args.path}: {n} samples x {len(publisher.channels)} channels "
+          f"@ {publisher.sample_rate:g} Hz, speed {args.speed:g}x")
+
+    start = time.monotonic()
+    publisher.start()
+    try:
+        while not publisher.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        publisher.stop()
+    elapsed = time.monotonic() - start
+    print(f"Pushed {publisher.samples_pushed} samples in {elapsed:.2f} s "
+          f"(max lag behind schedule {1000 * publisher.max_lag:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,13 @@
 """Console demo for live SSVEP detection via LSL."""
 
 import argparse
-import time
 import sys
 from typing import List
 
 from ..stream.lsl_source import LSLSource, LSLConfig
 from ..signal.ssvep_detector import SSVEPDetector, SSVEPConfig
+from ..signal.trca import TRCAModel
+from ..stream.realtime import RealtimeConfig, RealtimeScope, format_report
 
 
 def parse_frequencies(freq_str: str) -> List[float]:
@@ -22,18 +23,25 @@ def main():
     parser.add_argument('--stream-type', default='EEG', help='LSL stream type')
     parser.add_argument('--stream-name', help='LSL stream name (optional)')
     parser.add_argument('--timeout', type=float, default=5.0, help='LSL connection timeout')
+    parser.add_argument('--ingest-rate', type=float, help='Decimate to about this rate (Hz) before buffering')
     
     # SSVEP detection options  
     parser.add_argument('--freqs', default="8.57,10,12,15", help='Target frequencies (Hz), comma-separated (default: 8.57,10,12,15)')
     parser.add_argument('--window', type=float, default=3.0, help='Analysis window (seconds)')
-    parser.add_argument('--step', type=float, default=0.5, help='Prediction step (seconds)')
+    parser.add_argument('--step', type=float, default=0.5, help='Prediction step (seconds of new data)')
     parser.add_argument('--channels', help='EEG channels, comma-separated (optional)')
     parser.add_argument('--bandpass', default='5,40', help='Bandpass filter range (Hz)')
     parser.add_argument('--notch', type=float, help='Notch filter frequency (Hz)')
-    parser.add_argument('--method', default='cca', choices=['cca', 'power'], help='Detection method')
+    parser.add_argument('--method', default='cca', choices=['cca', 'fbcca', 'power', 'trca'], help='Detection method')
+    parser.add_argument('--trca-model', help='Trained TRCA model (.npz) for --method trca')
+    parser.add_argument('--streaming', action='store_true', help='Filter only new samples each step (causal SOS state)')
+    parser.add_argument('--artifact-guard', action='store_true', help='Skip windows with amplitude/variance/flatline artifacts')
     
     # Display options
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+    parser.add_argument('--realtime', action='store_true',
+                        help='Raise acquisition/decoding priority where permitted and run GC only between steps')
+    parser.add_argument('--cpus', help='With --realtime: CPU for acquisition,decoding (e.g. 2,3)')
     parser.add_argument('--max-predictions', type=int, help='Max predictions before exit')
     
     args = parser.parse_args()
@@ -47,29 +55,41 @@ def main():
     except Exception:
         print("Invalid --bandpass. Use 'low,high' (e.g., 5,40).")
         return 1
+    acquisition_rt = decoding_rt = None
+    if args.realtime:
+        cpus = [int(c) for c in args.cpus.split(',')] if args.cpus else []
+        acquisition_rt = RealtimeConfig(cpus=cpus[:1] or None, rt_priority=10, nice=-10, gc='disable')
+        decoding_rt = RealtimeConfig(cpus=cpus[1:2] or None, rt_priority=10, nice=-10, gc='disable')
     
     # Create configurations
     lsl_config = LSLConfig(
         stream_type=args.stream_type,
         stream_name=args.stream_name,
         timeout=args.timeout,
-        buffer_seconds=args.window + 2.0  # Extra buffer
+        buffer_seconds=args.window + 2.0,  # Extra buffer
+        channels=channels,
+        target_sample_rate=args.ingest_rate,
+        realtime=acquisition_rt
     )
     
     ssvep_config = SSVEPConfig(
         frequencies=frequencies,
-        sample_rate=250.0,  # Will be updated from LSL
+        # Will be updated from LSL (a TRCA model is checked against the stream rate then)
+        sample_rate=TRCAModel.load(args.trca_model).sample_rate if args.trca_model else 250.0,
         window_seconds=args.window,
         channels=channels,
         bandpass_freq=bandpass,
         notch_freq=args.notch,
-        method=args.method
+        method=args.method,
+        streaming=args.streaming,
+        trca_model=args.trca_model,
+        artifact_guard=args.artifact_guard
     )
     
     print(f"NeuroRelay Live SSVEP Demo")
     print(f"Target frequencies: {frequencies} Hz")
     print(f"Window: {args.window}s, Step: {args.step}s")
-    print(f"Method: {args.method}")
+    print(f"Method: {args.method}{' (streaming)' if args.streaming else ''}")
     if channels:
         print(f"Channels: {channels}")
     print()
@@ -77,6 +97,7 @@ def main():
     # Initialize components
     lsl_source = LSLSource(lsl_config)
     detector = SSVEPDetector(ssvep_config)
+    scope = RealtimeScope(decoding_rt) if decoding_rt else None
     
     try:
         # Connect to LSL
@@ -87,7 +108,11 @@ def main():
         
         # Update detector with actual sample rate
         if lsl_source.sample_rate:
-            detector.update_config(sample_rate=lsl_source.sample_rate)
+            try:
+                detector.update_config(sample_rate=lsl_source.sample_rate)
+            except ValueError as e:
+                print(f"Detector setup failed: {e}")
+                return 1
             print(f"Sample rate: {lsl_source.sample_rate} Hz")
         
         # Start acquisition
@@ -97,31 +122,54 @@ def main():
             return 1
         
         # Wait for initial data
+        sample_rate = lsl_source.sample_rate or ssvep_config.sample_rate
         print(f"Waiting {args.window}s for initial data...")
-        time.sleep(args.window + 0.5)
+        lsl_source.wait_for_samples(int(args.window * sample_rate), timeout=args.window + args.timeout)
         
         print("\nStarting predictions (Ctrl+C to stop):")
         print("=" * 50)
         
+        if scope is not None:
+            print("Decoding real-time mode:\n" + format_report(scope.enter()))
+        
         prediction_count = 0
+        reader = lsl_source.reader()
+        step_samples = max(1, int(round(args.step * sample_rate)))
+        next_total = lsl_source.samples_received
         
         while True:
+            # Predict once per --step of new samples rather than per wall-clock interval
+            if not lsl_source.wait_for_samples(step_samples, timeout=args.step + args.timeout, since=next_total):
+                print("No new samples from LSL stream...")
+                continue
+            next_total += step_samples
+            if lsl_source.samples_received - next_total >= step_samples:
+                next_total = lsl_source.samples_received  # fell behind: skip stale steps
+            
             # Get latest data
-            data, timestamps, metadata = lsl_source.get_latest_data(args.window)
+            data, timestamps, metadata = lsl_source.get_latest_data(args.window, copy=False)
             
             # Check if we have enough data (including filter padding requirements)
             min_needed = max(10, detector.min_padlen() + 8)  # small safety margin
             if data is None or data.shape[0] < min_needed:
                 if args.verbose:
                     print(f"Waiting for more data... (need {min_needed}, have {data.shape[0] if data is not None else 0})")
-                time.sleep(0.1)
                 continue
             
             # Run detection
-            frequency, confidence, scores = detector.detect(
-                data,
-                metadata.get('channel_names') if metadata else None
-            )
+            channel_names = metadata.get('channel_names') if metadata else None
+            if args.streaming:
+                fresh, _, lost = reader.read()
+                if lost:
+                    print(f"Fell behind: {lost} samples lost, restarting filters")
+                    detector.reset_stream()
+                frequency, confidence, scores = detector.detect_streaming(fresh, channel_names)
+            else:
+                frequency, confidence, scores = detector.detect(data, channel_names)
+            
+            if detector.last_rejection:
+                print(f"Rejected: {detector.last_rejection} artifact")
+                continue
             
             # Display result
             if args.verbose:
@@ -131,14 +179,13 @@ def main():
                 print()
             
             print(f"Prediction: {frequency:5.1f} Hz | Confidence: {confidence:.3f}")
+            if scope is not None:
+                scope.safe_point()
             
             prediction_count += 1
             if args.max_predictions and prediction_count >= args.max_predictions:
                 break
             
-            # Wait before next prediction
-            time.sleep(max(0.0, args.step))
-            
     except KeyboardInterrupt:
         print("\nStopping...")
     
@@ -147,6 +194,8 @@ def main():
         return 1
     
     finally:
+        if scope is not None:
+            scope.exit()
         lsl_source.stop()
         print("Demo finished.")
     
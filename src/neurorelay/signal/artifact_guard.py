@@ -0,0 +1,110 @@
+"""Artifact rejection for filtered EEG windows (blinks, movement, flat channels)."""
+
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+import numpy as np
+
+# Reason codes returned by ArtifactGuard.evaluate (0 = clean window)
+REASONS = ("", "amplitude", "variance", "flatline")
+
+
+class ArtifactGuard:
+    """
+    Per-channel amplitude, variance and flatline checks over a window.
+
+    A window is rejected if any channel exceeds max_abs in peak amplitude, has a
+    standard deviation above max_std, or below min_std (flat/disconnected). The
+    thresholds apply to band-passed data, in the stream's units (usually uV).
+
+    Besides stateless checks, the guard can track a sliding window incrementally
+    (running sums and per-chunk peaks) so streaming detection never rescans it.
+    """
+
+    def __init__(self, max_abs: float, max_std: float, min_std: float, refresh_every: int = 1024):
+        self.max_abs = float(max_abs)
+        self.max_std = float(max_std)
+        self.min_std = float(min_std)
+        self.refresh_every = int(refresh_every)
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the incremental window state."""
+        self.count = 0
+        self._sum: Optional[np.ndarray] = None
+        self._sumsq: Optional[np.ndarray] = None
+        self._peaks: Deque[Tuple[int, np.ndarray]] = deque()
+        self._peak_samples = 0
+        self._updates = 0
+
+    def _classify(self, peak: np.ndarray, std: np.ndarray) -> np.ndarray:
+        """Reason code per window from per-channel peak and std (..., n_channels)."""
+        codes = np.zeros(peak.shape[:-1], dtype=np.int8)
+        codes = np.where(np.any(std < self.min_std, axis=-1), 3, codes)
+        codes = np.where(np.any(std > self.max_std, axis=-1), 2, codes)
+        codes = np.where(np.any(peak > self.max_abs, axis=-1), 1, codes)
+        return codes
+
+    def evaluate(self, windows: np.ndarray) -> np.ndarray:
+        """
+        Vectorized check of one or more windows.
+
+        Args:
+            windows: Filtered EEG (..., n_samples, n_channels)
+
+        Returns:
+            Reason codes (...) indexing REASONS; 0 means the window is clean
+        """
+        peak = np.max(np.abs(windows), axis=-2)
+        std = np.std(windows, axis=-2)
+        return self._classify(peak, std)
+
+    def check(self, window: np.ndarray) -> Optional[str]:
+        """Return the rejection reason for one window, or None if it is clean."""
+        code = int(self.evaluate(window))
+        return REASONS[code] if code else None
+
+    def update(self, new: np.ndarray, leaving: np.ndarray) -> None:
+        """
+        Slide the tracked window: add newly filtered samples, drop departing ones.
+
+        Peaks are tracked per incoming chunk; a chunk's peak is kept until all of
+        its samples have left the window, which errs on the side of rejecting.
+        """
+        if self._sum is None:
+            self._sum = np.zeros(new.shape[-1])
+            self._sumsq = np.zeros(new.shape[-1])
+        if new.shape[0]:
+            self._sum += new.sum(axis=0)
+            self._sumsq += np.einsum('nc,nc->c', new, new)
+            self._peaks.append((new.shape[0], np.max(np.abs(new), axis=0)))
+            self._peak_samples += new.shape[0]
+            self.count += new.shape[0]
+            self._updates += 1
+        if leaving.shape[0]:
+            self._sum -= leaving.sum(axis=0)
+            self._sumsq -= np.einsum('nc,nc->c', leaving, leaving)
+            self.count -= leaving.shape[0]
+        while self._peaks and self._peak_samples - self._peaks[0][0] >= self.count:
+            self._peak_samples -= self._peaks.popleft()[0]
+
+    def rebuild(self, window: np.ndarray) -> None:
+        """Reset the tracked window to exactly these samples."""
+        self.reset()
+        self.update(window, window[:0])
+        self._updates = 0
+
+    @property
+    def needs_refresh(self) -> bool:
+        """True once enough updates have run that the running sums should be rebuilt."""
+        return self._updates >= self.refresh_every
+
+    def status(self) -> Optional[str]:
+        """Rejection reason for the tracked window, or None if clean (or empty)."""
+        if self.count < 2 or self._sum is None:
+            return None
+        mean = self._sum / self.count
+        std = np.sqrt(np.maximum(self._sumsq / self.count - mean ** 2, 0.0))
+        peak = np.max(np.stack([p for _, p in self._peaks]), axis=0)
+        code = int(self._classify(peak, std))
+        return REASONS[code] if code else None
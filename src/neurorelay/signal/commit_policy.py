@@ -0,0 +1,146 @@
+"""Selection commit rule: stability, margin, threshold and dwell over successive predictions."""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .dynamic_stopping import DynamicStopping, DynamicStoppingConfig
+
+
+@dataclass
+class CommitPolicyConfig:
+    """Configuration for CommitPolicy (defaults match the live UI)."""
+    tau: float = 0.65  # Minimum confidence of the leading target
+    dwell_sec: float = 1.2  # How long the leader must stay eligible before it commits
+    min_margin: float = 0.05  # Minimum confidence gap between the leader and the runner-up
+    stable_sec: float = 0.75  # Leader unchanged for this long (counted in predictions, see stable_predictions)
+    step_sec: float = 0.25  # Time between predictions of the caller's predictor
+    cooldown_sec: float = 0.75  # No commit this soon after the previous one
+    dynamic_stopping: bool = False  # Also commit early once accumulated evidence meets stop_error_rate
+    stop_error_rate: float = 0.05
+
+    @property
+    def stable_predictions(self) -> int:
+        """Predictions the leader must hold: stable_sec at one prediction per step_sec (3 at 4 Hz, 2 at 2 Hz)."""
+        return max(1, math.ceil(self.stable_sec / max(1e-3, self.step_sec) - 1e-9))
+
+
+class CommitPolicy:
+    """
+    Turns a stream of detector scores into committed selections.
+
+    Times are passed in by the caller (time.monotonic() live, a simulated
+    clock offline), so the same rule drives the UI and offline evaluation.
+    update() only proposes a commit; call commit() once it has been acted on
+    (it also resets stability, dwell and accumulated evidence).
+    """
+
+    def __init__(self, frequencies: Sequence[float], config: Optional[CommitPolicyConfig] = None):
+        self.frequencies = [float(f) for f in frequencies]
+        self.config = config or CommitPolicyConfig()
+        self.stopper: Optional[DynamicStopping] = None
+        if self.config.dynamic_stopping:
+            self.stopper = DynamicStopping(len(self.frequencies),
+                                           DynamicStoppingConfig(error_rate=self.config.stop_error_rate))
+        self.confidences: List[float] = [0.0] * len(self.frequencies)
+        self.top_idx: Optional[int] = None
+        self.last_commit: float = float("-inf")
+        self.reset()
+
+    def reset(self) -> None:
+        """Restart stability, dwell and accumulated evidence."""
+        self.stable_idx: Optional[int] = None
+        self.stable_count = 0
+        self.dwell_idx: Optional[int] = None
+        self.dwell_start: Optional[float] = None
+        if self.stopper is not None:
+            self.stopper.reset()
+
+    def tile_scores(self, scores: Dict[float, float]) -> np.ndarray:
+        """Scores in target order (nearest frequency matching for robustness)."""
+        freqs = list(scores.keys())
+        keys = np.asarray(freqs, dtype=float)
+        return np.array([float(scores[freqs[int(np.argmin(np.abs(keys - f)))]]) for f in self.frequencies])
+
+    @staticmethod
+    def confidences_from(vals: np.ndarray) -> np.ndarray:
+        """Softmax over z-scores (uniform when the scores are flat)."""
+        std = float(np.std(vals))
+        if std > 1e-6:
+            z = (vals - np.mean(vals)) / max(1e-9, std)
+            ex = np.exp(z - np.max(z))
+            return ex / np.sum(ex)
+        return np.ones_like(vals) / max(1, len(vals))
+
+    def update(self, scores: Dict[float, float], now: float, active: bool = True) -> Optional[Tuple[int, float]]:
+        """
+        Add one prediction.
+
+        Args:
+            scores: Detector scores keyed by frequency
+            now: Current time (s) on the caller's clock
+            active: False while selection is paused or idle (evidence is shown, never committed)
+
+        Returns:
+            (target index, confidence) to commit, or None
+        """
+        cfg = self.config
+        vals = self.tile_scores(scores)
+        confs = self.confidences_from(vals)
+        self.confidences = [float(c) for c in confs.tolist()]
+        cooled = (now - self.last_commit) >= cfg.cooldown_sec
+
+        # Dynamic stopping: commit as soon as accumulated evidence meets the error bound
+        if self.stopper is not None:
+            if not active:
+                self.stopper.reset()
+            else:
+                post = self.stopper.update(vals)
+                decision = self.stopper.decision
+                if decision is not None and cooled:
+                    return decision, float(post[decision])
+
+        top_idx = int(np.argmax(confs))
+        top_conf = float(confs[top_idx])
+        second_conf = float(np.partition(confs, -2)[-2]) if len(confs) >= 2 else 0.0
+        self.top_idx = top_idx
+
+        if self.stable_idx == top_idx:
+            self.stable_count += 1
+        else:
+            self.stable_idx = top_idx
+            self.stable_count = 1
+
+        can_dwell = (self.stable_count >= cfg.stable_predictions
+                     and (top_conf - second_conf) >= cfg.min_margin
+                     and top_conf >= cfg.tau)
+
+        if active and can_dwell:
+            if self.dwell_idx != top_idx:
+                self.dwell_idx = top_idx
+                self.dwell_start = now
+            if (now - self.dwell_start) >= cfg.dwell_sec and cooled:
+                return top_idx, top_conf
+        else:
+            # Reset dwell when evidence is insufficient or paused/idle
+            self.dwell_start = None
+            self.dwell_idx = None
+        return None
+
+    def reject(self) -> None:
+        """A window without evidence (e.g. artifact): clear confidences and restart."""
+        self.confidences = [0.0] * len(self.frequencies)
+        self.reset()
+
+    def commit(self, now: float) -> None:
+        """Record a commit at now (starts the cooldown) and restart for the next selection."""
+        self.last_commit = now
+        self.reset()
+
+    def dwell_progress(self, now: float) -> float:
+        """Fraction of dwell_sec the current dwell target has held (0 when none)."""
+        if self.dwell_start is None:
+            return 0.0
+        return min(1.0, max(0.0, (now - self.dwell_start) / max(1e-3, self.config.dwell_sec)))
@@ -0,0 +1,81 @@
+"""Dynamic stopping: sequential evidence accumulation over successive detector scores."""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+@dataclass
+class DynamicStoppingConfig:
+    """Configuration for the Bayesian stopping rule."""
+    error_rate: float = 0.05  # Commit once the posterior of the leader reaches 1 - error_rate
+    evidence_gain: float = 0.5  # Log-likelihood per unit z-score of a target's score
+    decay: float = 0.9  # Fraction of accumulated evidence kept per update (overlapping windows are correlated)
+    min_updates: int = 2  # Never commit on fewer predictions than this
+    min_margin: float = 0.05  # Top-2 score gap, relative to the top score, below which an update adds no evidence
+
+
+class DynamicStopping:
+    """
+    Accumulate per-target evidence across predictions and stop at an error bound.
+
+    Each update turns the detector scores into log-likelihoods proportional to
+    their z-scores and adds them to a leaky running log-posterior (uniform
+    prior). A decision is available as soon as one target's posterior
+    probability reaches 1 - error_rate, so clear signals commit after a couple
+    of predictions while ambiguous ones keep accumulating.
+
+    z-scores ignore how far apart the scores actually are, so an update
+    whose leader beats the runner-up by less than min_margin (relative to
+    the leader's score) is a tie. A tie adds no evidence and only decays
+    what is already there. Without this, a repeated near-tie (overlapping
+    windows are strongly correlated) would commit at any error_rate.
+    """
+
+    def __init__(self, n_targets: int, config: Optional[DynamicStoppingConfig] = None):
+        self.n_targets = int(n_targets)
+        self.config = config or DynamicStoppingConfig()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget accumulated evidence (after a commit, pause or rejected window)."""
+        self.log_evidence = np.zeros(self.n_targets)
+        self.updates = 0
+
+    @property
+    def posterior(self) -> np.ndarray:
+        """Posterior probability of each target (n_targets,)."""
+        e = np.exp(self.log_evidence - np.max(self.log_evidence))
+        return e / np.sum(e)
+
+    def update(self, scores: Sequence[float]) -> np.ndarray:
+        """
+        Add one prediction's evidence.
+
+        Args:
+            scores: Detector scores in target order (n_targets,)
+
+        Returns:
+            Updated posterior (n_targets,)
+        """
+        vals = np.asarray(scores, dtype=np.float64)
+        self.log_evidence = self.config.decay * self.log_evidence
+        if vals.size >= 2:
+            second, top = np.partition(vals, -2)[-2:]
+            if (top - second) < self.config.min_margin * max(abs(float(top)), 1e-12):
+                return self.posterior
+        std = float(np.std(vals))
+        z = (vals - np.mean(vals)) / std if std > 1e-6 else np.zeros_like(vals)
+        self.log_evidence = self.log_evidence + self.config.evidence_gain * z
+        self.updates += 1
+        return self.posterior
+
+    @property
+    def decision(self) -> Optional[int]:
+        """Index of the target to commit, or None while evidence is insufficient."""
+        if self.updates < self.config.min_updates:
+            return None
+        post = self.posterior
+        top = int(np.argmax(post))
+        return top if post[top] >= 1.0 - self.config.error_rate else None
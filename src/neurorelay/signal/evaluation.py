@@ -0,0 +1,234 @@
+"""Closed-loop offline evaluation: replay recorded sessions through the detector and commit rule on a simulated clock."""
+
+from __future__ import annotations
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..stream.source_replay import SegmentIndex
+from .commit_policy import CommitPolicy, CommitPolicyConfig
+from .ssvep_detector import SSVEPConfig, SSVEPDetector, sliding_windows
+
+
+@dataclass
+class EvaluationConfig:
+    """Decoder and commit settings for an evaluation run (defaults match config/default.json)."""
+    frequencies: List[float] = field(default_factory=lambda: [8.57, 10.0, 12.0, 15.0])
+    channels: Optional[List[str]] = None  # Default: every channel in the session
+    window_sec: float = 3.0
+    step_sec: float = 0.25  # Simulated time between predictions
+    method: str = "cca"
+    bandpass_hz: Tuple[float, float] = (5.0, 40.0)
+    notch_hz: Optional[float] = None
+    harmonics: int = 2
+    streaming: bool = False  # Causal streaming filter (detect_streaming) instead of batched windows
+    trca_model: Optional[str] = None
+    artifact_guard: bool = False
+    policy: CommitPolicyConfig = field(default_factory=CommitPolicyConfig)
+
+
+@dataclass
+class SessionResult:
+    """Outcome of one evaluated session."""
+    path: str
+    duration_sec: float  # Simulated (recording) time
+    elapsed_sec: float  # Wall-clock time spent evaluating
+    n_classes: int
+    predictions: int
+    rejected: int  # Windows rejected by the artifact guard
+    trials: int  # Labeled target periods
+    selections: int  # Trials with a commit (the first one counts)
+    correct: int
+    false_commits: int  # Commits on windows that are mostly unlabeled (rest)
+    selection_times: List[float]  # Commit time from trial onset (s), one per selection
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.selections if self.selections else 0.0
+
+    @property
+    def mean_selection_sec(self) -> float:
+        return float(np.mean(self.selection_times)) if self.selection_times else 0.0
+
+    @property
+    def itr_bits_per_min(self) -> float:
+        return itr_bits_per_min(self.n_classes, self.accuracy, self.mean_selection_sec)
+
+    @property
+    def speedup(self) -> float:
+        """Simulated seconds per wall-clock second."""
+        return self.duration_sec / self.elapsed_sec if self.elapsed_sec > 0 else float("inf")
+
+    def as_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        del out["selection_times"]
+        out.update(accuracy=self.accuracy, mean_selection_sec=self.mean_selection_sec,
+                   itr_bits_per_min=self.itr_bits_per_min, speedup=self.speedup)
+        return out
+
+
+def itr_bits_per_min(n_classes: int, accuracy: float, selection_sec: float) -> float:
+    """
+    Wolpaw information transfer rate.
+
+    Bits per selection log2 N + P log2 P + (1 - P) log2((1 - P) / (N - 1)),
+    zero at or below chance, scaled to one selection every selection_sec.
+    """
+    n, p = n_classes, accuracy
+    if n < 2 or selection_sec <= 0 or p <= 1.0 / n:
+        return 0.0
+    bits = math.log2(n) + p * math.log2(p)
+    if p < 1.0:
+        bits += (1.0 - p) * math.log2((1.0 - p) / (n - 1))
+    return bits * 60.0 / selection_sec
+
+
+def load_session(path: Path, channels: Optional[Sequence[str]] = None):
+    """Samples (n, n_channels), label indices (n,), sample rate and channel names of a .nrs or replay CSV session."""
+    from ..stream.session_file import SessionFile, is_session_file
+    from ..stream.source_replay import channel_columns, load_csv
+
+    if is_session_file(path):
+        session = SessionFile(path)
+        idx = session.channel_index(channels)
+        data = session.data if idx is None else session.data[:, idx]
+        return data, np.asarray(session.labels), session.sample_rate, list(channels or session.channels)
+    arr, header = load_csv(path, channels)
+    sample_rate = round(1.0 / float(np.median(np.diff(arr[:, 0]))), 3)
+    return arr[:, 1:-1], arr[:, -1].astype(int), sample_rate, list(channels or channel_columns(header))
+
+
+def _detector(config: EvaluationConfig, sample_rate: float) -> SSVEPDetector:
+    return SSVEPDetector(SSVEPConfig(
+        frequencies=list(config.frequencies),
+        sample_rate=sample_rate,
+        window_seconds=config.window_sec,
+        channels=config.channels,
+        bandpass_freq=tuple(config.bandpass_hz),
+        notch_freq=config.notch_hz,
+        harmonics=config.harmonics,
+        method=config.method,
+        streaming=config.streaming,
+        trca_model=config.trca_model,
+        artifact_guard=config.artifact_guard,
+    ))
+
+
+def _window_scores(detector: SSVEPDetector, data: np.ndarray, channels: List[str],
+                   window_n: int, step_n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Scores (n_predictions, n_freqs) and accepted mask for windows ending every step_n samples."""
+    if detector.config.streaming:
+        rows, accepted = [], []
+        n_freqs = len(detector.config.frequencies)
+        # First chunk fills the window; then one step of new samples per prediction
+        for end in range(window_n, data.shape[0] + 1, step_n):
+            start = 0 if end == window_n else end - step_n
+            _, _, scores = detector.detect_streaming(np.asarray(data[start:end]), channels)
+            accepted.append(bool(scores))
+            rows.append(list(scores.values()) if scores else [0.0] * n_freqs)
+        return np.asarray(rows, dtype=float).reshape(-1, n_freqs), np.asarray(accepted, dtype=bool)
+    windows = sliding_windows(np.asarray(data, dtype=np.float64), window_n, step_n)
+    predicted, _, scores = detector.detect_batch(windows, channels)
+    return scores, predicted >= 0
+
+
+def evaluate_session(path: Path, config: Optional[EvaluationConfig] = None) -> SessionResult:
+    """
+    Run one session through the detector and CommitPolicy as fast as possible.
+
+    A prediction is made every step_sec of recording time once a full window
+    is available; the simulated clock is the end of the window. Trials are
+    runs of equal labels, and each prediction is scored against the run
+    covering most of its window, so decisions that complete just after a
+    trial ends (window and dwell latency) still count for it. After a
+    trial's commit, selection pauses until the window moves on (as the UI
+    does while the agent acts). Commits on windows that are mostly
+    unlabeled (rest) are false commits. Selection time runs from trial onset.
+    """
+    config = config or EvaluationConfig()
+    t0 = time.perf_counter()
+    data, labels, sample_rate, channels = load_session(Path(path), config.channels)
+    detector = _detector(config, sample_rate)
+    window_n = int(config.window_sec * sample_rate)
+    step_n = max(1, int(round(config.step_sec * sample_rate)))
+    scores, accepted = _window_scores(detector, data, channels, window_n, step_n)
+
+    # Runs of equal labels: trials (label >= 0) and rest (-1)
+    segments = SegmentIndex.from_labels(labels)
+    starts, run_labels = segments.starts, segments.labels
+
+    policy = CommitPolicy(config.frequencies, replace(config.policy, step_sec=config.step_sec))
+    freqs = list(detector.config.frequencies)
+    answered = -1  # Run already selected (selection paused until the window moves on)
+    correct = false_commits = 0
+    selection_times: List[float] = []
+    for k in range(scores.shape[0]):
+        end = window_n + k * step_n
+        now = end / sample_rate
+        if not accepted[k]:
+            policy.reject()
+            continue
+        run = segments.dominant(end - window_n, end)
+        label = int(run_labels[run])
+        decision = policy.update(dict(zip(freqs, scores[k])), now, active=label < 0 or run != answered)
+        if decision is None:
+            continue
+        policy.commit(now)
+        if label < 0:
+            false_commits += 1
+            continue
+        answered = run
+        correct += int(decision[0] == label)
+        selection_times.append(float(now - starts[run] / sample_rate))
+
+    return SessionResult(
+        path=str(path),
+        duration_sec=segments.n_samples / sample_rate,
+        elapsed_sec=time.perf_counter() - t0,
+        n_classes=len(config.frequencies),
+        predictions=int(scores.shape[0]),
+        rejected=int(np.count_nonzero(~accepted)),
+        trials=len(segments.trials()),
+        selections=len(selection_times),
+        correct=correct,
+        false_commits=false_commits,
+        selection_times=selection_times,
+    )
+
+
+def evaluate_sessions(paths: Sequence[Path], config: Optional[EvaluationConfig] = None,
+                      workers: Optional[int] = None) -> List[SessionResult]:
+    """Evaluate sessions in parallel across a process pool (workers=1: in this process); results in input order."""
+    config = config or EvaluationConfig()
+    if workers == 1 or len(paths) <= 1:
+        return [evaluate_session(p, config) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(evaluate_session, paths, repeat(config)))
+
+
+def summarize(results: Sequence[SessionResult]) -> Dict[str, Any]:
+    """Pooled metrics over sessions (accuracy and selection time over all selections)."""
+    selections = sum(r.selections for r in results)
+    correct = sum(r.correct for r in results)
+    times = [t for r in results for t in r.selection_times]
+    accuracy = correct / selections if selections else 0.0
+    mean_sel = float(np.mean(times)) if times else 0.0
+    n_classes = results[0].n_classes if results else 0
+    return {
+        "sessions": len(results),
+        "trials": sum(r.trials for r in results),
+        "selections": selections,
+        "correct": correct,
+        "false_commits": sum(r.false_commits for r in results),
+        "accuracy": accuracy,
+        "mean_selection_sec": mean_sel,
+        "itr_bits_per_min": itr_bits_per_min(n_classes, accuracy, mean_sel),
+        "duration_sec": sum(r.duration_sec for r in results),
+    }
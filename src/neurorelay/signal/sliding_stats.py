@@ -0,0 +1,236 @@
+"""Running statistics over a sliding window for incremental CCA and power detection."""
+
+from typing import List
+
+import numpy as np
+
+
+class SlidingCovariance:
+    """
+    Running sums of X^T X, X^T Y and Y^T Y over a sliding window.
+
+    Y holds the sin/cos references of every target frequency evaluated at the
+    absolute sample index, so samples can be added and removed without
+    re-phasing; CCA is invariant to the reference phase. Per tick, CCA only needs
+    the small (channels + 2 * harmonics)-sized problems built from these sums.
+    """
+
+    def __init__(
+        self,
+        frequencies: List[float],
+        sample_rate: float,
+        harmonics: int,
+        n_channels: int,
+        refresh_every: int = 1024,
+    ):
+        self.frequencies = list(frequencies)
+        self.sample_rate = float(sample_rate)
+        self.harmonics = int(harmonics)
+        self.n_channels = int(n_channels)
+        self.refresh_every = int(refresh_every)
+        # Angular frequency of each reference pair, laid out per target: f1h1, f1h2, f2h1, ...
+        h = np.arange(1, self.harmonics + 1)
+        self._omega = 2 * np.pi * np.outer(self.frequencies, h).ravel() / self.sample_rate
+        self.reset()
+
+    @property
+    def n_refs(self) -> int:
+        return 2 * self.harmonics
+
+    def reset(self) -> None:
+        """Clear all sums; the next sample gets absolute index 0."""
+        c = self.n_channels
+        r = len(self.frequencies) * self.n_refs
+        self.start = 0  # absolute index of the oldest sample in the window
+        self.count = 0
+        self.sx = np.zeros(c)
+        self.sy = np.zeros(r)
+        self.sxx = np.zeros((c, c))
+        self.sxy = np.zeros((c, r))
+        self.syy = np.zeros((len(self.frequencies), self.n_refs, self.n_refs))
+        self._updates = 0
+
+    def references(self, start: int, n: int) -> np.ndarray:
+        """Sin/cos references for absolute sample indices [start, start + n)."""
+        arg = np.arange(start, start + n, dtype=np.float64)[:, None] * self._omega[None, :]
+        refs = np.empty((n, self._omega.shape[0], 2))
+        refs[..., 0] = np.sin(arg)
+        refs[..., 1] = np.cos(arg)
+        return refs.reshape(n, -1)  # per target: sin h1, cos h1, sin h2, cos h2, ...
+
+    def _accumulate(self, x: np.ndarray, start: int, sign: float) -> None:
+        y = self.references(start, x.shape[0])
+        yb = y.reshape(x.shape[0], len(self.frequencies), self.n_refs)
+        self.sx += sign * x.sum(axis=0)
+        self.sy += sign * y.sum(axis=0)
+        self.sxx += sign * (x.T @ x)
+        self.sxy += sign * (x.T @ y)
+        self.syy += sign * np.einsum('nfa,nfb->fab', yb, yb)
+
+    def add(self, x: np.ndarray) -> None:
+        """Append newest samples (n_new, n_channels)."""
+        if x.shape[0] == 0:
+            return
+        self._accumulate(np.asarray(x, dtype=np.float64), self.start + self.count, 1.0)
+        self.count += x.shape[0]
+        self._updates += 1
+
+    def remove(self, x: np.ndarray) -> None:
+        """Drop the oldest samples (n_old, n_channels), which must match what was added."""
+        if x.shape[0] == 0:
+            return
+        self._accumulate(np.asarray(x, dtype=np.float64), self.start, -1.0)
+        self.start += x.shape[0]
+        self.count -= x.shape[0]
+
+    def extend_back(self, x: np.ndarray) -> None:
+        """Prepend older samples (n_old, n_channels) that immediately precede the window."""
+        if x.shape[0] == 0:
+            return
+        self._accumulate(np.asarray(x, dtype=np.float64), self.start - x.shape[0], 1.0)
+        self.start -= x.shape[0]
+        self.count += x.shape[0]
+
+    def rebuild(self, window: np.ndarray, start: int) -> None:
+        """Recompute the sums from scratch for a window whose oldest sample has index start."""
+        self.reset()
+        self.start = int(start)
+        self.add(window)
+        self._updates = 0
+
+    @property
+    def needs_refresh(self) -> bool:
+        """True once enough add/remove updates have run that rounding drift should be flushed."""
+        return self._updates >= self.refresh_every
+
+    def correlations(self, rtol: float = 1e-6) -> np.ndarray:
+        """
+        Largest canonical correlation of the window with each target's references.
+
+        Returns:
+            Correlations (n_frequencies,)
+        """
+        n_freqs = len(self.frequencies)
+        if self.count < 2:
+            return np.zeros(n_freqs)
+
+        n = self.count
+        cxx = self.sxx - np.outer(self.sx, self.sx) / n
+        cxy = self.sxy - np.outer(self.sx, self.sy) / n
+        syb = self.sy.reshape(n_freqs, self.n_refs)
+        cyy = self.syy - np.einsum('fa,fb->fab', syb, syb) / n
+
+        wx = whitening_transform(cxx, rtol)  # (C, C)
+        wy = whitening_transform(cyy, rtol)  # (F, R, R)
+        m = (wx.T @ cxy).reshape(self.n_channels, n_freqs, self.n_refs)
+        m = np.moveaxis(m, 1, 0) @ wy  # (F, C, R)
+        rho = np.linalg.svd(m, compute_uv=False)[..., 0]
+        return np.clip(rho, 0.0, 1.0)
+
+    def scores(self) -> np.ndarray:
+        """Per-target detection scores (canonical correlations)."""
+        return self.correlations()
+
+
+class SlidingDFT:
+    """
+    Sliding DFT evaluated only at the target frequencies and their harmonics.
+
+    Keeps one complex accumulator per (target, harmonic, channel), phased by
+    absolute sample index; adding or removing a sample costs
+    O(targets x harmonics x channels). Power is phase-invariant, so no
+    re-rotation is needed as the window slides.
+    """
+
+    def __init__(
+        self,
+        frequencies: List[float],
+        sample_rate: float,
+        harmonics: int,
+        n_channels: int,
+        refresh_every: int = 1024,
+    ):
+        self.frequencies = list(frequencies)
+        self.sample_rate = float(sample_rate)
+        self.harmonics = int(harmonics)
+        self.n_channels = int(n_channels)
+        self.refresh_every = int(refresh_every)
+        h = np.arange(1, self.harmonics + 1)
+        self._omega = 2 * np.pi * np.outer(self.frequencies, h).ravel() / self.sample_rate
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the accumulators; the next sample gets absolute index 0."""
+        self.start = 0
+        self.count = 0
+        self.acc = np.zeros((self._omega.shape[0], self.n_channels), dtype=np.complex128)
+        self._updates = 0
+
+    def _accumulate(self, x: np.ndarray, start: int, sign: float) -> None:
+        idx = np.arange(start, start + x.shape[0], dtype=np.float64)
+        phasors = np.exp(-1j * idx[:, None] * self._omega[None, :])  # (n, F*H)
+        self.acc += sign * (phasors.T @ x)
+
+    def add(self, x: np.ndarray) -> None:
+        """Append newest samples (n_new, n_channels)."""
+        if x.shape[0] == 0:
+            return
+        self._accumulate(np.asarray(x, dtype=np.float64), self.start + self.count, 1.0)
+        self.count += x.shape[0]
+        self._updates += 1
+
+    def remove(self, x: np.ndarray) -> None:
+        """Drop the oldest samples (n_old, n_channels), which must match what was added."""
+        if x.shape[0] == 0:
+            return
+        self._accumulate(np.asarray(x, dtype=np.float64), self.start, -1.0)
+        self.start += x.shape[0]
+        self.count -= x.shape[0]
+
+    def extend_back(self, x: np.ndarray) -> None:
+        """Prepend older samples (n_old, n_channels) that immediately precede the window."""
+        if x.shape[0] == 0:
+            return
+        self._accumulate(np.asarray(x, dtype=np.float64), self.start - x.shape[0], 1.0)
+        self.start -= x.shape[0]
+        self.count += x.shape[0]
+
+    def rebuild(self, window: np.ndarray, start: int) -> None:
+        """Recompute the accumulators from scratch for a window starting at absolute index start."""
+        self.reset()
+        self.start = int(start)
+        self.add(window)
+        self._updates = 0
+
+    @property
+    def needs_refresh(self) -> bool:
+        """True once enough add/remove updates have run that rounding drift should be flushed."""
+        return self._updates >= self.refresh_every
+
+    def power(self) -> np.ndarray:
+        """
+        Channel-averaged power summed over harmonics for each target.
+
+        Returns:
+            Power (n_frequencies,)
+        """
+        p = np.mean(np.abs(self.acc) ** 2, axis=-1)
+        return p.reshape(len(self.frequencies), self.harmonics).sum(axis=-1)
+
+    def scores(self) -> np.ndarray:
+        """Per-target detection scores (harmonic power)."""
+        return self.power()
+
+
+def whitening_transform(cov: np.ndarray, rtol: float = 1e-6) -> np.ndarray:
+    """
+    Whitening transform V diag(1/sqrt(s)) of symmetric PSD matrices (..., d, d).
+
+    Directions whose singular value (sqrt of eigenvalue) is below rtol * max are
+    zeroed so redundant channels cannot produce spurious correlations.
+    """
+    evals, evecs = np.linalg.eigh(0.5 * (cov + np.swapaxes(cov, -1, -2)))
+    keep = evals > (rtol ** 2) * np.maximum(evals[..., -1:], 0.0)
+    scale = np.where(keep, 1.0 / np.sqrt(np.where(keep, evals, 1.0)), 0.0)
+    return evecs * scale[..., None, :]
+
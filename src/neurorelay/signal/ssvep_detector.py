@@ -2,10 +2,13 @@
 """SSVEP detector using Canonical Correlation Analysis (CCA)."""
 
 import numpy as np
-from typing import List, Dict, Tuple, Optional, Literal
+from typing import List, Dict, Tuple, Optional, Literal, Union
 from dataclasses import dataclass
-from scipy.signal import butter, filtfilt, iirnotch
-from scipy.stats import zscore
+from scipy.signal import butter, filtfilt, iirnotch, sosfilt, sosfilt_zi, sosfiltfilt, tf2sos
+
+from .artifact_guard import ArtifactGuard
+from .sliding_stats import SlidingCovariance, SlidingDFT, whitening_transform
+from .trca import TRCAModel
 
 
 @dataclass
@@ -18,7 +21,87 @@ class SSVEPConfig:
     bandpass_freq: Tuple[float, float] = (5.0, 40.0)  # Hz
     notch_freq: Optional[float] = None  # Hz (50 or 60)
     harmonics: int = 2  # Include up to 2nd harmonic
-    method: Literal["cca", "power"] = "cca"
+    method: Literal["cca", "power", "fbcca", "trca"] = "cca"
+    streaming: bool = False  # Causal filtering of new samples only (see detect_streaming)
+    window_lengths: Tuple[float, ...] = ()  # Nested windows (s) for detect_multiwindow; default: window_seconds
+    incremental: bool = True  # Streaming "cca"/"power" keep running window sums instead of refitting the window
+    fb_subbands: int = 3  # FBCCA sub-band count
+    fb_base_hz: Optional[float] = None  # Sub-band k starts at k * base (default: 0.9 * lowest target)
+    fb_weights: Tuple[float, float] = (1.25, 0.25)  # Sub-band weight w(k) = k**-a + b
+    trca_model: Optional[str] = None  # Path to a calibrated TRCA model (.npz) for method "trca"
+    artifact_guard: bool = False  # Reject windows failing amplitude/variance/flatline checks
+    artifact_max_abs: float = 100.0  # Peak |amplitude| per channel (stream units, usually uV)
+    artifact_max_std: float = 50.0  # Max per-channel std over the window
+    artifact_min_std: float = 0.1  # Min per-channel std (flat or disconnected channel)
+
+
+class StreamingFilter:
+    """
+    Causal SOS filter with per-channel state and a ring of the latest filtered window.
+    
+    ``sos`` is either a single cascade (n_sections, 6) or a bank of equally sized
+    cascades (n_bands, n_sections, 6); a bank yields windows (n_bands, n, n_channels).
+    """
+
+    def __init__(self, sos: Optional[np.ndarray], n_channels: int, window_samples: int):
+        self.sos = sos
+        self.n_channels = n_channels
+        self.window_samples = max(1, int(window_samples))
+        self.count = 0
+        self._bands: Tuple[int, ...] = (sos.shape[0],) if sos is not None and sos.ndim == 3 else ()
+        self._zi: Optional[np.ndarray] = None
+        # Double-length storage so the latest window is always one contiguous slice
+        self._ring = np.zeros(self._bands + (2 * self.window_samples, n_channels), dtype=np.float64)
+        self._end = 0
+
+    def reset(self) -> None:
+        """Drop filter state and buffered samples."""
+        self._zi = None
+        self._end = 0
+        self.count = 0
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Filter newly arrived samples (n_new, n_channels) and append them to the ring."""
+        if chunk.shape[0] == 0:
+            return np.empty(self._bands + (0, self.n_channels), dtype=np.float64)
+
+        if self.sos is None:
+            out = np.asarray(chunk, dtype=np.float64)
+        else:
+            if self._zi is None:
+                # Start in steady state for the first sample to avoid a step transient
+                first = np.asarray(chunk[0], dtype=np.float64)
+                zi = [sosfilt_zi(sos)[:, :, None] * first for sos in self.sos.reshape((-1,) + self.sos.shape[-2:])]
+                self._zi = np.stack(zi) if self._bands else zi[0]
+            if self._bands:
+                out = np.empty(self._bands + chunk.shape, dtype=np.float64)
+                for k in range(self._bands[0]):
+                    out[k], self._zi[k] = sosfilt(self.sos[k], chunk, axis=0, zi=self._zi[k])
+            else:
+                out, self._zi = sosfilt(self.sos, chunk, axis=0, zi=self._zi)
+
+        self._append(out)
+        return out
+
+    def _append(self, out: np.ndarray) -> None:
+        n = out.shape[-2]
+        w = self.window_samples
+        if n >= w:
+            self._ring[..., :w, :] = out[..., -w:, :]
+            self._end = w
+        else:
+            if self._end + n > self._ring.shape[-2]:
+                # Move the samples still inside the window back to the front
+                keep = min(self.count, w - n)
+                self._ring[..., :keep, :] = self._ring[..., self._end - keep:self._end, :]
+                self._end = keep
+            self._ring[..., self._end:self._end + n, :] = out
+            self._end += n
+        self.count = min(self.count + n, w)
+
+    def window(self) -> np.ndarray:
+        """Return the latest filtered window ([n_bands,] count, n_channels) as a view."""
+        return self._ring[..., self._end - self.count:self._end, :]
 
 
 class SSVEPDetector:
@@ -27,16 +110,51 @@ class SSVEPDetector:
     def __init__(self, config: SSVEPConfig):
         self.config = config
         self.references = {}
+        self._ref_bases: Dict[int, np.ndarray] = {}
+        self._phasors: Dict[int, np.ndarray] = {}
         self._prepare_references()
         
         # Prepare filters
         self.bandpass_filter = None
         self.notch_filter = None
+        self.stream_sos: Optional[np.ndarray] = None
+        self.subband_sos: Optional[np.ndarray] = None
+        self.subband_weights: Optional[np.ndarray] = None
+        self._stream: Optional[StreamingFilter] = None
+        self._stats: Optional[Union[SlidingCovariance, SlidingDFT]] = None
+        
+        # Artifact rejection (runs on filtered data before scoring)
+        self.guard = ArtifactGuard(config.artifact_max_abs, config.artifact_max_std, config.artifact_min_std)
+        self.last_rejection: Optional[str] = None
         self._prepare_filters()
+        
+        # Calibrated TRCA model (method "trca")
+        self.trca: Optional[TRCAModel] = None
+        self._trca_order: Optional[np.ndarray] = None
+        if self.config.trca_model:
+            self.set_trca_model(TRCAModel.load(self.config.trca_model))
+    
+    def set_trca_model(self, model: TRCAModel) -> None:
+        """
+        Attach a trained TRCA model; its classes are matched to the nearest target frequency.
+        
+        The model must have been trained at config.sample_rate. Input channels
+        are taken by name in the model's channel order (see _select_channels).
+        """
+        if not self.config.frequencies:
+            raise ValueError("No target frequencies configured")
+        if abs(float(model.sample_rate) - float(self.config.sample_rate)) > 1e-6:
+            raise ValueError(f"TRCA model was trained at {model.sample_rate:g} Hz but the detector runs at "
+                             f"{self.config.sample_rate:g} Hz; recalibrate at this rate")
+        model_freqs = np.asarray(model.frequencies)
+        self._trca_order = np.array([int(np.argmin(np.abs(model_freqs - f))) for f in self.config.frequencies])
+        self.trca = model
     
     def _prepare_references(self):
         """Pre-compute reference signals for each target frequency."""
         self.references = {}
+        self._ref_bases = {}
+        self._phasors = {}
         
         for freq in self.config.frequencies:
             # Create time vector
@@ -54,6 +172,9 @@ class SSVEPDetector:
     def _prepare_filters(self) -> None:
         """Prepare bandpass and notch filters for preprocessing."""
         nyquist = self.config.sample_rate / 2.0
+        self.bandpass_filter = None
+        self.notch_filter = None
+        sections = []
         
         # Bandpass filter
         if self.config.bandpass_freq:
@@ -62,6 +183,7 @@ class SSVEPDetector:
                 raise ValueError(f"Bandpass frequencies {self.config.bandpass_freq} exceed Nyquist frequency {nyquist}")
             b, a = butter(4, [low / nyquist, high / nyquist], btype='band')
             self.bandpass_filter = (b, a)
+            sections.append(butter(4, [low / nyquist, high / nyquist], btype='band', output='sos'))
         
         # Notch filter
         if self.config.notch_freq:
@@ -69,6 +191,44 @@ class SSVEPDetector:
                 raise ValueError(f"Notch frequency {self.config.notch_freq} exceeds Nyquist frequency {nyquist}")
             b, a = iirnotch(self.config.notch_freq, Q=30, fs=self.config.sample_rate)
             self.notch_filter = (b, a)
+            sections.append(tf2sos(b, a))
+        
+        # Cascaded SOS form of both filters for causal streaming
+        self.stream_sos = np.vstack(sections) if sections else None
+        self.reset_stream()
+        
+        self._prepare_subbands()
+    
+    def _prepare_subbands(self) -> None:
+        """Build the FBCCA sub-band bank (n_bands, n_sections, 6) and its weights."""
+        self.subband_sos = None
+        self.subband_weights = None
+        if not self.config.frequencies or self.config.fb_subbands < 1:
+            return
+        
+        nyquist = self.config.sample_rate / 2.0
+        base = self.config.fb_base_hz or 0.9 * min(self.config.frequencies)
+        high = self.config.bandpass_freq[1] if self.config.bandpass_freq else 0.9 * nyquist
+        
+        bank = []
+        for k in range(1, self.config.fb_subbands + 1):
+            low = k * base
+            if low >= high or high >= nyquist:
+                break
+            bank.append(butter(4, [low / nyquist, high / nyquist], btype='band', output='sos'))
+        if not bank:
+            return
+        
+        self.subband_sos = np.stack(bank)
+        a, b = self.config.fb_weights
+        self.subband_weights = np.arange(1, len(bank) + 1, dtype=float) ** -a + b
+    
+    def _subband_stream_sos(self) -> Optional[np.ndarray]:
+        """Sub-band bank with the notch prepended to every band, for causal streaming."""
+        if self.subband_sos is None or self.notch_filter is None:
+            return self.subband_sos
+        notch = tf2sos(*self.notch_filter)
+        return np.stack([np.vstack([notch, sos]) for sos in self.subband_sos])
     
     def min_padlen(self) -> int:
         """Calculate minimum samples needed for filtfilt operations to avoid padding errors."""
@@ -79,6 +239,9 @@ class SSVEPDetector:
         if self.notch_filter is not None:
             b, a = self.notch_filter
             lengths.append(3 * (max(len(a), len(b)) - 1))
+        if self.config.method == "fbcca" and self.subband_sos is not None:
+            # sosfiltfilt default padlen
+            lengths.append(3 * (2 * self.subband_sos.shape[1] + 1))
         return max(lengths) if lengths else 0
     
     def preprocess(self, data: np.ndarray) -> np.ndarray:
@@ -86,64 +249,323 @@ class SSVEPDetector:
         if data.size == 0:
             return data
         
-        # Apply filters along time axis (axis=0)
+        # Apply filters along time axis (axis=-2, so stacked windows also work)
         filtered = data.copy()
         
         # Bandpass
         if self.bandpass_filter is not None:
             b, a = self.bandpass_filter
-            filtered = filtfilt(b, a, filtered, axis=0)
+            filtered = filtfilt(b, a, filtered, axis=-2)
         
         # Notch
         if self.notch_filter is not None:
             b, a = self.notch_filter
-            filtered = filtfilt(b, a, filtered, axis=0)
+            filtered = filtfilt(b, a, filtered, axis=-2)
         
         return filtered
     
+    def filter_bank(self, data: np.ndarray) -> np.ndarray:
+        """
+        Split data into FBCCA sub-bands.
+        
+        The notch is applied once, then each zero-phase sub-band filter runs over
+        all channels in a single call.
+        
+        Args:
+            data: EEG data (..., n_samples, n_channels)
+            
+        Returns:
+            Sub-band data (..., n_bands, n_samples, n_channels)
+        """
+        if self.subband_sos is None:
+            raise ValueError("No valid FBCCA sub-bands for this configuration")
+        
+        notched = data
+        if self.notch_filter is not None:
+            b, a = self.notch_filter
+            notched = filtfilt(b, a, data, axis=-2)
+        
+        bands = np.empty(data.shape[:-2] + (self.subband_sos.shape[0],) + data.shape[-2:], dtype=np.float64)
+        for k, sos in enumerate(self.subband_sos):
+            bands[..., k, :, :] = sosfiltfilt(sos, notched, axis=-2)
+        return bands
+    
+    def _reference_basis(self, n_samples: int) -> np.ndarray:
+        """
+        Orthonormal bases of the centered references for all target frequencies.
+        
+        Computed once per window length with a batched QR and cached, since the
+        sin/cos references never change between ticks.
+        
+        Returns:
+            Array (n_samples, n_frequencies * n_refs) with one orthonormal block per frequency
+        """
+        basis = self._ref_bases.get(n_samples)
+        if basis is not None:
+            return basis
+        
+        refs = np.stack([self.references[f][:n_samples] for f in self.config.frequencies])
+        refs = refs - refs.mean(axis=1, keepdims=True)
+        q, _ = np.linalg.qr(refs)  # (n_frequencies, n_samples, n_refs)
+        basis = q.transpose(1, 0, 2).reshape(n_samples, -1)
+        
+        # Window length only varies while the buffer fills up; keep the cache small
+        if len(self._ref_bases) >= 8:
+            self._ref_bases.clear()
+        self._ref_bases[n_samples] = basis
+        return basis
+    
+    @staticmethod
+    def _whiten(data: np.ndarray, rtol: float = 1e-6) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Center EEG window(s) and compute a whitening transform from their covariance.
+        
+        Directions with singular values below rtol * max are zeroed so that
+        redundant channels cannot produce spurious correlations. ``centered @ w``
+        is an orthonormal basis of the window, without forming it explicitly.
+        
+        Returns:
+            (centered data (..., n_samples, n_channels), w (..., n_channels, n_channels))
+        """
+        centered = data - data.mean(axis=-2, keepdims=True)
+        cxx = np.swapaxes(centered, -1, -2) @ centered
+        return centered, whitening_transform(cxx, rtol)
+    
+    def compute_cca_all(self, data: np.ndarray) -> np.ndarray:
+        """
+        Canonical correlations of the window against every target frequency at once.
+        
+        The EEG side is whitened once and projected onto the cached reference
+        bases; the largest singular value of each (channels x refs) block is the
+        canonical correlation for that frequency.
+        
+        Args:
+            data: Filtered EEG window(s) (..., n_samples, n_channels)
+            
+        Returns:
+            Correlations (..., n_frequencies), in config.frequencies order
+        """
+        n_freqs = len(self.config.frequencies)
+        ref_len = min(self.references[f].shape[0] for f in self.config.frequencies) if n_freqs else 0
+        n = min(data.shape[-2], ref_len)
+        if n < 2 or n_freqs == 0:
+            return np.zeros(data.shape[:-2] + (n_freqs,))
+        
+        basis = self._reference_basis(n)
+        centered, w = self._whiten(data[..., :n, :])
+        m = np.swapaxes(w, -1, -2) @ (np.swapaxes(centered, -1, -2) @ basis)  # (..., n_channels, n_frequencies * n_refs)
+        m = m.reshape(m.shape[:-1] + (n_freqs, -1))
+        m = np.moveaxis(m, -2, -3)  # (..., n_frequencies, n_channels, n_refs)
+        rho = np.linalg.svd(m, compute_uv=False)[..., 0]
+        return np.clip(rho, 0.0, 1.0)
+    
     def compute_cca(self, data: np.ndarray, reference: np.ndarray) -> float:
         """Compute CCA between data and reference."""
-        if data.shape[0] != reference.shape[0]:
+        if data.shape[0] != reference.shape[0] or data.shape[0] < 2:
             return 0.0
         
-        # Center the data
-        data_centered = data - np.mean(data, axis=0, keepdims=True)
-        ref_centered = reference - np.mean(reference, axis=0, keepdims=True)
-        
-        # Compute covariance matrices
         try:
-            n = data_centered.shape[0]
-            eps = 1e-6
-            Cxx = (data_centered.T @ data_centered) / (n - 1) + eps * np.eye(data_centered.shape[1])
-            Cyy = (ref_centered.T @ ref_centered) / (n - 1) + eps * np.eye(ref_centered.shape[1])
-            Cxy = (data_centered.T @ ref_centered) / (n - 1)
-            Cxx_inv = np.linalg.pinv(Cxx)
-            Cyy_inv = np.linalg.pinv(Cyy)
-            M = Cxx_inv @ Cxy @ Cyy_inv @ Cxy.T
-            # Symmetrize for numerical stability
-            M = 0.5 * (M + M.T)
-            eigvals = np.linalg.eigvalsh(M)
-            rho2 = float(np.clip(np.max(eigvals).real, 0.0, 1.0))
-            return float(np.sqrt(rho2))
+            xc, wx = self._whiten(data)
+            yc, wy = self._whiten(reference)
+            rho = np.linalg.svd(wx.T @ (xc.T @ yc) @ wy, compute_uv=False)[0]
+            return float(np.clip(rho, 0.0, 1.0))
         except (np.linalg.LinAlgError, ValueError):
             return 0.0
     
     def compute_power_spectrum(self, data: np.ndarray, freq: float) -> float:
-        """Simple power spectrum approach at target frequency."""
+        """Power at the target frequency (single-bin DFT, no full FFT)."""
         if data.size == 0:
             return 0.0
         
-        # FFT approach
-        fft_data = np.fft.rfft(data, axis=0)
-        freqs = np.fft.rfftfreq(data.shape[0], 1/self.config.sample_rate)
-        
-        # Find closest frequency bin
-        freq_idx = np.argmin(np.abs(freqs - freq))
+        t = np.arange(data.shape[0]) / self.config.sample_rate
+        spectrum = np.exp(-2j * np.pi * freq * t) @ data
         
         # Average power across channels at target frequency
-        power = np.mean(np.abs(fft_data[freq_idx, :]) ** 2)
+        power = np.mean(np.abs(spectrum) ** 2)
         return float(power)
     
+    def _target_phasors(self, n_samples: int) -> np.ndarray:
+        """Cached DFT rows for every target frequency and harmonic (n_samples, n_frequencies * harmonics)."""
+        phasors = self._phasors.get(n_samples)
+        if phasors is None:
+            h = np.arange(1, self.config.harmonics + 1)
+            bins = np.outer(self.config.frequencies, h).ravel()
+            t = np.arange(n_samples) / self.config.sample_rate
+            phasors = np.exp(-2j * np.pi * t[:, None] * bins[None, :])
+            if len(self._phasors) >= 8:
+                self._phasors.clear()
+            self._phasors[n_samples] = phasors
+        return phasors
+    
+    def compute_power_all(self, data: np.ndarray) -> np.ndarray:
+        """
+        Power at every target frequency and its harmonics.
+        
+        Only the needed DFT bins are evaluated (one cached phasor matrix product,
+        equivalent to a Goertzel filter per bin) instead of a full FFT per target.
+        
+        Args:
+            data: Filtered EEG window(s) (..., n_samples, n_channels)
+            
+        Returns:
+            Channel-averaged power summed over harmonics (..., n_frequencies)
+        """
+        n_freqs = len(self.config.frequencies)
+        phasors = self._target_phasors(data.shape[-2])
+        spectrum = np.swapaxes(phasors, 0, 1) @ data  # (..., n_frequencies * harmonics, n_channels)
+        power = np.mean(np.abs(spectrum) ** 2, axis=-1)
+        return power.reshape(power.shape[:-1] + (n_freqs, self.config.harmonics)).sum(axis=-1)
+    
+    def _select_channels(self, data: np.ndarray, channel_names: Optional[List[str]]) -> np.ndarray:
+        """Pick the configured channels by name, falling back to all channels."""
+        channel_indices = self._channel_indices(channel_names, data.shape[-1])
+        return data if channel_indices is None else data[..., channel_indices]
+    
+    def _channel_indices(self, channel_names: Optional[List[str]], n_channels: int) -> Optional[List[int]]:
+        """Input columns _select_channels keeps (None: all of them, in input order)."""
+        if self.config.method == "trca" and self.trca is not None:
+            return self._trca_channels(channel_names, n_channels)
+        if self.config.channels and channel_names:
+            channel_indices = []
+            for ch_name in self.config.channels:
+                if ch_name in channel_names:
+                    channel_indices.append(channel_names.index(ch_name))
+            
+            if channel_indices:
+                return channel_indices
+            # Optional: warn once if no requested channels are found
+            # For now, silently fall back to using all channels
+        return None
+    
+    def _trca_channels(self, channel_names: Optional[List[str]], n_channels: int) -> Optional[List[int]]:
+        """Input columns in the order the TRCA model was trained on."""
+        expected = self.trca.filters.shape[1]
+        model_channels = self.trca.channels
+        if model_channels and channel_names:
+            missing = [c for c in model_channels if c not in channel_names]
+            if missing:
+                raise ValueError(f"TRCA model channel(s) {', '.join(missing)} not in the input ({', '.join(channel_names)})")
+            return [channel_names.index(c) for c in model_channels]
+        if n_channels != expected:
+            raise ValueError(f"TRCA model expects {expected} channels"
+                             f"{' (' + ', '.join(model_channels) + ')' if model_channels else ''}, got {n_channels}")
+        return None
+    
+    def _score_array(self, data_filtered: np.ndarray) -> np.ndarray:
+        """
+        Score preprocessed window(s) against every target frequency.
+        
+        Args:
+            data_filtered: Output of preprocess (..., n_samples, n_channels), or of
+                filter_bank (..., n_bands, n_samples, n_channels) for "fbcca"
+            
+        Returns:
+            Scores (..., n_frequencies), in config.frequencies order
+        """
+        if self.config.method == "cca":
+            # One batched CCA over all targets (references trimmed to the data length)
+            try:
+                return self.compute_cca_all(data_filtered)
+            except (np.linalg.LinAlgError, ValueError):
+                return np.zeros(data_filtered.shape[:-2] + (len(self.config.frequencies),))
+        elif self.config.method == "trca":
+            if self.trca is None:
+                raise ValueError("Method 'trca' requires a trained model (SSVEPConfig.trca_model)")
+            return self.trca.score(data_filtered)[..., self._trca_order]
+        elif self.config.method == "fbcca":
+            # Sub-bands sit on axis -3; weight squared correlations across them
+            try:
+                rho = self.compute_cca_all(data_filtered)  # (..., n_bands, n_frequencies)
+                return np.einsum('k,...kf->...f', self.subband_weights, rho ** 2)
+            except (np.linalg.LinAlgError, ValueError):
+                return np.zeros(data_filtered.shape[:-3] + (len(self.config.frequencies),))
+        else:
+            return self.compute_power_all(data_filtered)
+    
+    @staticmethod
+    def _confidences(score_values: np.ndarray) -> np.ndarray:
+        """Softmax of z-scored values along the last axis (uniform if all scores are equal)."""
+        std = np.std(score_values, axis=-1, keepdims=True)
+        flat = std <= 1e-6
+        z_scores = (score_values - np.mean(score_values, axis=-1, keepdims=True)) / np.where(flat, 1.0, std)
+        confidences = np.exp(z_scores) / np.sum(np.exp(z_scores), axis=-1, keepdims=True)
+        return np.where(flat, 1.0 / score_values.shape[-1], confidences)
+    
+    def _score(self, data_filtered: np.ndarray) -> Tuple[float, float, Dict[float, float]]:
+        """Score a preprocessed window and pick the best frequency."""
+        if not self.config.frequencies:
+            return 0.0, 0.0, {}
+        
+        return self._result(np.asarray(self._score_array(data_filtered), dtype=float))
+    
+    def _result(self, score_values: np.ndarray) -> Tuple[float, float, Dict[float, float]]:
+        """Turn per-frequency scores into (best_frequency, confidence, scores_dict)."""
+        scores = {freq: float(score) for freq, score in zip(self.config.frequencies, score_values)}
+        
+        # Find best frequency and its confidence (softmax of z-scored values)
+        best_idx = int(np.argmax(score_values))
+        confidence = float(self._confidences(score_values)[best_idx])
+        
+        return self.config.frequencies[best_idx], confidence, scores
+    
+    def detect_batch(
+        self,
+        windows: np.ndarray,
+        channel_names: Optional[List[str]] = None,
+        chunk_size: int = 512,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Detect SSVEP frequencies for many windows at once (offline evaluation).
+        
+        Filtering, scoring and confidences are vectorized over the batch; windows
+        are processed in chunks of chunk_size to bound memory.
+        
+        Args:
+            windows: Stacked EEG windows (n_windows, n_samples, n_channels)
+            channel_names: Optional channel names
+            chunk_size: Windows filtered and scored per vectorized step
+            
+        Returns:
+            (predicted_index, confidence, scores): arrays of shape (n_windows,),
+            (n_windows,) and (n_windows, n_frequencies); indices refer to
+            config.frequencies, and windows rejected by the artifact guard get
+            index -1, confidence 0 and zero scores
+        """
+        n_windows = windows.shape[0]
+        n_freqs = len(self.config.frequencies)
+        predicted = np.zeros(n_windows, dtype=np.int64)
+        confidence = np.zeros(n_windows, dtype=np.float64)
+        scores = np.zeros((n_windows, n_freqs), dtype=np.float64)
+        if n_windows == 0 or n_freqs == 0 or windows.shape[1] == 0:
+            return predicted, confidence, scores
+        
+        # Channel selection per chunk: indexing the whole (strided) batch would copy every window
+        channel_indices = self._channel_indices(channel_names, windows.shape[-1])
+        accepted = np.ones(n_windows, dtype=bool)
+        for start in range(0, n_windows, max(1, chunk_size)):
+            chunk = windows[start:start + chunk_size]
+            if channel_indices is not None:
+                chunk = chunk[..., channel_indices]
+            stop = start + chunk.shape[0]
+            if self.config.method == "fbcca":
+                filtered = self.filter_bank(chunk)
+            else:
+                filtered = self.preprocess(chunk)
+            if self.config.artifact_guard:
+                # Only clean windows are scored
+                ok = self.guard.evaluate(self._guard_view(filtered)) == 0
+                accepted[start:stop] = ok
+                if ok.any():
+                    scores[start:stop][ok] = self._score_array(filtered[ok])
+            else:
+                scores[start:stop] = self._score_array(filtered)
+        
+        predicted[:] = np.argmax(scores, axis=1)
+        confidence[:] = np.take_along_axis(self._confidences(scores), predicted[:, None], axis=1)[:, 0]
+        predicted[~accepted] = -1
+        confidence[~accepted] = 0.0
+        return predicted, confidence, scores
+    
     def detect(self, data: np.ndarray, channel_names: Optional[List[str]] = None) -> Tuple[float, float, Dict[float, float]]:
         """
         Detect SSVEP frequency from EEG data.
@@ -159,54 +581,170 @@ class SSVEPDetector:
             return 0.0, 0.0, {}
         
         # Select channels if specified
-        if self.config.channels and channel_names:
-            channel_indices = []
-            for ch_name in self.config.channels:
-                if ch_name in channel_names:
-                    channel_indices.append(channel_names.index(ch_name))
-            
-            if channel_indices:
-                data = data[:, channel_indices]
-            else:
-                # Optional: warn once if no requested channels are found
-                # For now, silently fall back to using all channels
-                pass
+        data = self._select_channels(data, channel_names)
         
         # Preprocess
-        data_filtered = self.preprocess(data)
+        if self.config.method == "fbcca":
+            data_filtered = self.filter_bank(data)
+        else:
+            data_filtered = self.preprocess(data)
         
-        # Compute scores for each frequency
-        scores = {}
+        # Skip scoring for artifact-contaminated windows
+        self.last_rejection = None
+        if self.config.artifact_guard:
+            self.last_rejection = self.guard.check(self._guard_view(data_filtered))
+            if self.last_rejection:
+                return 0.0, 0.0, {}
         
-        for freq in self.config.frequencies:
-            if self.config.method == "cca" and freq in self.references:
-                reference = self.references[freq]
-                # Trim reference to match data length
-                min_len = min(data_filtered.shape[0], reference.shape[0])
-                score = self.compute_cca(data_filtered[:min_len], reference[:min_len])
-            else:
-                # Fallback to power spectrum
-                score = self.compute_power_spectrum(data_filtered, freq)
+        return self._score(data_filtered)
+    
+    def detect_multiwindow(
+        self,
+        data: np.ndarray,
+        channel_names: Optional[List[str]] = None,
+        window_lengths: Optional[List[float]] = None,
+    ) -> Dict[float, Tuple[float, float, Dict[float, float]]]:
+        """
+        Score several nested window lengths that all end at the latest sample.
+        
+        The longest window is preprocessed once and shorter windows are its most
+        recent samples. For "cca" and "power" the window statistics are grown
+        backwards from the shortest window, so each sample is accumulated once
+        no matter how many lengths are scored.
+        The live bridge does not call this yet; callers choose which window's
+        result to act on.
+        
+        Args:
+            data: EEG data covering the longest window (n_samples, n_channels)
+            channel_names: Optional channel names
+            window_lengths: Window lengths in seconds (default: config.window_lengths,
+                or just config.window_seconds)
             
-            scores[freq] = score
+        Returns:
+            {window_seconds: (predicted_frequency, confidence, scores_dict)}; lengths
+            beyond the available data are clipped to it. Empty if the longest
+            window is rejected by the artifact guard.
+        """
+        lengths = sorted(window_lengths or self.config.window_lengths or (self.config.window_seconds,))
+        if len(self.config.frequencies) == 0 or data.shape[0] == 0:
+            return {}
         
-        if not scores:
-            return 0.0, 0.0, {}
+        data = self._select_channels(data, channel_names)
+        n_max = min(data.shape[0], int(round(lengths[-1] * self.config.sample_rate)))
+        data = data[-n_max:]
+        if self.config.method == "fbcca":
+            data_filtered = self.filter_bank(data)
+        else:
+            data_filtered = self.preprocess(data)
         
-        # Find best frequency
-        best_freq = max(scores.keys(), key=lambda f: scores[f])
+        self.last_rejection = None
+        if self.config.artifact_guard:
+            self.last_rejection = self.guard.check(self._guard_view(data_filtered))
+            if self.last_rejection:
+                return {}
         
-        # Compute confidence (softmax of z-scored values)
-        score_values = np.array(list(scores.values()))
-        if np.std(score_values) > 1e-6:
-            z_scores = zscore(score_values)
-            confidences = np.exp(z_scores) / np.sum(np.exp(z_scores))
-            best_idx = list(scores.keys()).index(best_freq)
-            confidence = float(confidences[best_idx])
+        sizes = [min(n_max, max(2, int(round(sec * self.config.sample_rate)))) for sec in lengths]
+        results = {}
+        engines = {"cca": SlidingCovariance, "power": SlidingDFT}
+        engine = engines.get(self.config.method)
+        if engine is not None:
+            stats = engine(self.config.frequencies, self.config.sample_rate,
+                           self.config.harmonics, data_filtered.shape[-1])
+            prev = 0
+            for sec, n in zip(lengths, sizes):
+                if prev == 0:
+                    stats.rebuild(data_filtered[n_max - n:], n_max - n)
+                else:
+                    stats.extend_back(data_filtered[n_max - n:n_max - prev])
+                prev = n
+                results[sec] = self._result(stats.scores())
         else:
-            confidence = 1.0 / len(scores)  # Uniform if all scores equal
+            for sec, n in zip(lengths, sizes):
+                results[sec] = self._score(data_filtered[..., n_max - n:, :])
+        return results
+    
+    def _guard_view(self, data_filtered: np.ndarray) -> np.ndarray:
+        """Data the artifact guard inspects: the widest sub-band for "fbcca", else the filtered window."""
+        if self.config.method == "fbcca":
+            return data_filtered[..., 0, :, :]
+        return data_filtered
+    
+    @property
+    def stream_samples(self) -> int:
+        """Number of filtered samples currently held by the streaming window."""
+        return self._stream.count if self._stream is not None else 0
+    
+    def reset_stream(self) -> None:
+        """Discard streaming filter state (e.g. after a gap or reconnect)."""
+        self._stream = None
+        self._stats = None
+        self.guard.reset()
+    
+    def detect_streaming(self, new_data: np.ndarray, channel_names: Optional[List[str]] = None) -> Tuple[float, float, Dict[float, float]]:
+        """
+        Detect SSVEP frequency from newly arrived samples only.
         
-        return best_freq, confidence, scores
+        New samples are filtered causally with per-channel SOS state and appended
+        to a ring holding the latest filtered window, so the filter cost per call
+        is proportional to the number of new samples rather than the window.
+        
+        Args:
+            new_data: EEG samples received since the previous call (n_new, n_channels)
+            channel_names: Optional channel names
+            
+        Returns:
+            (predicted_frequency, confidence, scores_dict) for the latest window;
+            (0.0, 0.0, {}) if the artifact guard rejects it (see last_rejection)
+        """
+        if len(self.config.frequencies) == 0:
+            return 0.0, 0.0, {}
+        
+        engines = {"cca": SlidingCovariance, "power": SlidingDFT}
+        engine = engines.get(self.config.method) if self.config.incremental else None
+        
+        if new_data.size > 0:
+            new_data = self._select_channels(new_data, channel_names)
+            if self._stream is None or self._stream.n_channels != new_data.shape[1]:
+                window_samples = int(self.config.window_seconds * self.config.sample_rate)
+                sos = self._subband_stream_sos() if self.config.method == "fbcca" else self.stream_sos
+                self._stream = StreamingFilter(sos, new_data.shape[1], window_samples)
+                self._stats = None
+                if engine is not None:
+                    self._stats = engine(self.config.frequencies, self.config.sample_rate,
+                                         self.config.harmonics, new_data.shape[1])
+            
+            # Samples about to fall out of the filtered window (copied before the ring moves)
+            n_old = self._stream.count + new_data.shape[0] - self._stream.window_samples
+            leaving = None
+            if self._stats is not None or self.config.artifact_guard:
+                leaving = self._stream.window()[..., :max(0, n_old), :].copy()
+            
+            filtered_new = self._stream.process(new_data)
+            
+            if self.config.artifact_guard:
+                if new_data.shape[0] >= self._stream.window_samples or self.guard.needs_refresh:
+                    self.guard.rebuild(self._guard_view(self._stream.window()))
+                else:
+                    self.guard.update(self._guard_view(filtered_new), self._guard_view(leaving))
+            
+            if self._stats is not None:
+                if new_data.shape[0] >= self._stream.window_samples or self._stats.needs_refresh:
+                    start = self._stats.start + self._stats.count + new_data.shape[0] - self._stream.count
+                    self._stats.rebuild(self._stream.window(), start)
+                else:
+                    self._stats.add(filtered_new)
+                    self._stats.remove(leaving)
+        
+        if self.stream_samples == 0:
+            return 0.0, 0.0, {}
+        
+        self.last_rejection = self.guard.status() if self.config.artifact_guard else None
+        if self.last_rejection:
+            return 0.0, 0.0, {}
+        
+        if self._stats is not None:
+            return self._result(self._stats.scores())
+        return self._score(self._stream.window())
     
     def update_config(self, **kwargs):
         """Update configuration parameters."""
@@ -219,8 +757,43 @@ class SSVEPDetector:
             self._prepare_references()
         
         # Regenerate filters if needed
-        if any(k in kwargs for k in ['sample_rate', 'bandpass', 'notch']):
+        if any(k in kwargs for k in ['sample_rate', 'bandpass', 'notch', 'bandpass_freq', 'notch_freq']):
             self._prepare_filters()
+        elif any(k in kwargs for k in ('frequencies', 'fb_subbands', 'fb_base_hz', 'fb_weights')):
+            self._prepare_subbands()
+        
+        if kwargs.get('trca_model'):
+            self.set_trca_model(TRCAModel.load(self.config.trca_model))
+        elif ('frequencies' in kwargs or 'sample_rate' in kwargs) and self.trca is not None:
+            self.set_trca_model(self.trca)
+        
+        if any(k.startswith('artifact_') for k in kwargs):
+            self.guard = ArtifactGuard(self.config.artifact_max_abs, self.config.artifact_max_std,
+                                       self.config.artifact_min_std)
+            self.reset_stream()
+        
+        # Streaming window length and filters follow the analysis settings
+        if any(k in kwargs for k in ('window_seconds', 'channels', 'method', 'fb_subbands', 'fb_base_hz',
+                                     'frequencies', 'harmonics', 'incremental')):
+            self.reset_stream()
+
+
+def sliding_windows(data: np.ndarray, window_samples: int, step_samples: int) -> np.ndarray:
+    """
+    Zero-copy stack of sliding windows over a recording, for detect_batch.
+    
+    Args:
+        data: Recording (n_samples, n_channels)
+        window_samples: Samples per window
+        step_samples: Hop between window starts
+        
+    Returns:
+        Read-only view (n_windows, window_samples, n_channels)
+    """
+    if data.shape[0] < window_samples:
+        return np.empty((0, window_samples, data.shape[1]), dtype=data.dtype)
+    view = np.lib.stride_tricks.sliding_window_view(data, window_samples, axis=0)
+    return view[::max(1, step_samples)].transpose(0, 2, 1)
 
 
 def generate_reference_signals(frequencies: List[float], sample_rate: float, duration: float, harmonics: int = 2) -> Dict[float, np.ndarray]:
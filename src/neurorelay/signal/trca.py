@@ -0,0 +1,216 @@
+"""Task-related component analysis (TRCA) for calibrated SSVEP detection."""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.linalg import eigh
+
+
+def trca_filters(trials: np.ndarray, reg: float = 1e-9) -> np.ndarray:
+    """
+    Compute TRCA spatial filters for one class.
+
+    Maximizes inter-trial covariance S relative to the pooled covariance Q by
+    solving the generalized eigenproblem S w = lambda Q w.
+
+    Args:
+        trials: Filtered trials of one class (n_trials, n_samples, n_channels)
+        reg: Ridge added to Q (relative to its trace)
+
+    Returns:
+        Eigenvectors as columns (n_channels, n_channels), best component first
+    """
+    x = trials - trials.mean(axis=1, keepdims=True)
+    total = x.sum(axis=0)
+    # sum_{i != j} X_i^T X_j = (sum X_i)^T (sum X_i) - sum X_i^T X_i
+    within = np.einsum('tnc,tnd->cd', x, x)
+    s = total.T @ total - within
+    q = within + reg * np.trace(within) * np.eye(within.shape[0])
+    _, vecs = eigh(0.5 * (s + s.T), q)
+    return vecs[:, ::-1]
+
+
+def align_trials(trials: np.ndarray, max_lag: int) -> np.ndarray:
+    """
+    Lag-align trials of one class to the first trial.
+
+    Trials cut from free-running flicker start at arbitrary stimulus phase, so
+    each trial is shifted by the lag in [0, max_lag) that best correlates its
+    channel mean with the first trial's. Output is cropped to a common length.
+
+    Args:
+        trials: Trials of one class (n_trials, n_samples, n_channels)
+        max_lag: Number of candidate lags (one stimulus period in samples)
+
+    Returns:
+        Aligned trials (n_trials, n_samples - max_lag + 1, n_channels)
+    """
+    n_trials, n_samples, _ = trials.shape
+    max_lag = int(np.clip(max_lag, 1, n_samples // 2))
+    length = n_samples - max_lag + 1
+
+    ref = trials[0, :length].mean(axis=1)
+    ref = ref - ref.mean()
+    aligned = np.empty((n_trials, length, trials.shape[2]), dtype=np.float64)
+    aligned[0] = trials[0, :length]
+    for i in range(1, n_trials):
+        lagged = sliding_window_view(trials[i].mean(axis=1), length)[:max_lag]
+        lagged = lagged - lagged.mean(axis=1, keepdims=True)
+        corr = lagged @ ref / (np.linalg.norm(lagged, axis=1) * np.linalg.norm(ref) + 1e-12)
+        lag = int(np.argmax(corr))
+        aligned[i] = trials[i, lag:lag + length]
+    return aligned
+
+
+@dataclass
+class TRCAModel:
+    """Trained TRCA spatial filters and class templates."""
+    frequencies: List[float]
+    sample_rate: float
+    filters: np.ndarray  # (n_classes, n_channels) best TRCA filter per class
+    templates: np.ndarray  # (n_classes, n_template_samples, n_channels) trial averages
+    channels: List[str] = field(default_factory=list)
+    ensemble: bool = True
+    _lag_cache: Dict[int, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @property
+    def max_lag(self) -> int:
+        """Lags searched at inference: one period of the lowest target frequency."""
+        return int(np.ceil(self.sample_rate / min(self.frequencies)))
+
+    def _lagged_templates(self, n_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Projected templates at every candidate lag, plus their centered norms.
+
+        The lagged windows are a strided view over the projected templates, so
+        they cost no memory beyond one projection per class.
+        """
+        cached = self._lag_cache.get(n_samples)
+        if cached is not None:
+            return cached
+
+        proj = np.einsum('fnc,kc->fnk', self.templates, self.filters)  # (F, T, K)
+        if not self.ensemble:
+            # Each class only uses its own filter
+            idx = np.arange(proj.shape[0])
+            proj = proj[idx, :, idx][:, :, None]
+        lags = max(1, min(proj.shape[1] - n_samples + 1, self.max_lag))
+        windows = sliding_window_view(proj, n_samples, axis=1)[:, :lags]  # (F, L, K, n)
+
+        sums = windows.sum(axis=-1)
+        sumsq = np.einsum('flkn,flkn->flk', windows, windows)
+        norms = np.sqrt(np.maximum(sumsq - sums ** 2 / n_samples, 0.0).sum(axis=-1))
+
+        if len(self._lag_cache) >= 8:
+            self._lag_cache.clear()
+        self._lag_cache[n_samples] = (windows, norms)
+        return windows, norms
+
+    def score(self, data: np.ndarray) -> np.ndarray:
+        """
+        Template correlation of filtered window(s) for every class.
+
+        Args:
+            data: Filtered EEG window(s) (..., n_samples, n_channels)
+
+        Returns:
+            Correlations (..., n_classes), maximized over stimulus phase lags
+        """
+        n = min(data.shape[-2], self.templates.shape[1])
+        x = data[..., -n:, :]
+        windows, norms = self._lagged_templates(n)
+
+        z = x @ self.filters.T  # (..., n, n_classes)
+        z = z - z.mean(axis=-2, keepdims=True)
+        # Centered z makes the template means drop out of the dot products
+        if self.ensemble:
+            dots = np.einsum('...nk,flkn->...fl', z, windows)
+            z_norm = np.sqrt(np.einsum('...nk,...nk->...', z, z))[..., None, None]
+        else:
+            dots = np.einsum('...nf,fln->...fl', z, windows[:, :, 0, :])
+            z_norm = np.sqrt(np.einsum('...nf,...nf->...f', z, z))[..., None]
+        corr = dots / (z_norm * norms + 1e-12)
+        return corr.max(axis=-1)
+
+    def save(self, path: Path) -> None:
+        """Persist the model as a compressed .npz file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            frequencies=np.asarray(self.frequencies, dtype=np.float64),
+            sample_rate=np.float64(self.sample_rate),
+            filters=self.filters,
+            templates=self.templates,
+            channels=np.asarray(self.channels, dtype=str),
+            ensemble=np.bool_(self.ensemble),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "TRCAModel":
+        """Load a model written by save()."""
+        with np.load(Path(path), allow_pickle=False) as f:
+            return cls(
+                frequencies=[float(x) for x in f["frequencies"]],
+                sample_rate=float(f["sample_rate"]),
+                filters=f["filters"],
+                templates=f["templates"],
+                channels=[str(c) for c in f["channels"]],
+                ensemble=bool(f["ensemble"]),
+            )
+
+
+def train_trca(
+    trials: np.ndarray,
+    labels: np.ndarray,
+    frequencies: List[float],
+    sample_rate: float,
+    channels: Optional[List[str]] = None,
+    ensemble: bool = True,
+    align: bool = True,
+) -> TRCAModel:
+    """
+    Train (ensemble) TRCA from labeled, preprocessed calibration trials.
+
+    Args:
+        trials: Filtered trials (n_trials, n_samples, n_channels)
+        labels: Class index per trial, indexing into frequencies
+        frequencies: Target frequencies (Hz), one per class
+        sample_rate: Sampling rate (Hz)
+        channels: Channel names of the trial data
+        ensemble: Use all class filters for every class (ensemble TRCA)
+        align: Lag-align trials within each class (for free-running flicker)
+
+    Returns:
+        Trained TRCAModel
+    """
+    trials = np.asarray(trials, dtype=np.float64)
+    labels = np.asarray(labels, dtype=int)
+    if trials.ndim != 3 or trials.shape[0] != labels.shape[0]:
+        raise ValueError("trials must be (n_trials, n_samples, n_channels) with one label per trial")
+
+    max_lag = int(np.ceil(sample_rate / min(frequencies))) if align else 1
+    filters = []
+    templates = []
+    for k in range(len(frequencies)):
+        cls_trials = trials[labels == k]
+        if cls_trials.shape[0] < 2:
+            raise ValueError(f"Need at least 2 trials for class {k} ({frequencies[k]} Hz), got {cls_trials.shape[0]}")
+        if align:
+            cls_trials = align_trials(cls_trials, max_lag)
+        filters.append(trca_filters(cls_trials)[:, 0])
+        templates.append(cls_trials.mean(axis=0))
+
+    # Classes may end up with slightly different lengths; keep the common prefix
+    length = min(t.shape[0] for t in templates)
+    return TRCAModel(
+        frequencies=[float(f) for f in frequencies],
+        sample_rate=float(sample_rate),
+        filters=np.stack(filters),
+        templates=np.stack([t[:length] for t in templates]),
+        channels=list(channels or []),
+        ensemble=ensemble,
+    )
@@ -0,0 +1,73 @@
+"""Ingest stage for LSLSource: channel projection and streaming anti-aliased decimation."""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import firwin
+
+
+def resolve_channels(available: Sequence[str], wanted: Optional[Sequence[str]]) -> List[int]:
+    """
+    Indices of the wanted channels in the stream (case-insensitive).
+
+    Missing names are skipped; if none are found (or none are wanted) every
+    channel is kept.
+    """
+    if not wanted:
+        return list(range(len(available)))
+    lookup = {name.lower(): i for i, name in enumerate(available)}
+    idx = [lookup[w.lower()] for w in wanted if w.lower() in lookup]
+    return idx or list(range(len(available)))
+
+
+class StreamDecimator:
+    """
+    Polyphase FIR decimation by an integer factor, chunk by chunk.
+
+    Only every factor-th output of the anti-alias low-pass is computed, and the
+    last numtaps - 1 input samples are carried between chunks, so the output
+    does not depend on how the input is chunked.
+    """
+
+    def __init__(self, factor: int, n_channels: int, sample_rate: float, taps_per_phase: int = 16):
+        self.factor = int(factor)
+        self.n_channels = int(n_channels)
+        self.sample_rate = float(sample_rate)
+        numtaps = taps_per_phase * self.factor + 1
+        # Pass band well inside the output Nyquist frequency
+        self.taps = firwin(numtaps, 0.8 / self.factor)[::-1].astype(np.float32)
+        # Linear-phase FIR: outputs describe the input this many seconds earlier
+        self.delay = (numtaps - 1) / 2.0 / self.sample_rate
+        self.reset()
+
+    @property
+    def output_rate(self) -> float:
+        return self.sample_rate / self.factor
+
+    def reset(self) -> None:
+        self._history = np.zeros((self.taps.shape[0] - 1, self.n_channels), dtype=np.float32)
+        self._phase = 0  # input samples to skip before the next output
+
+    def process(self, data: np.ndarray, timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decimate a chunk.
+
+        Args:
+            data: Input samples (n, n_channels)
+            timestamps: Their timestamps (n,)
+
+        Returns:
+            (decimated data, timestamps corrected for the filter delay)
+        """
+        n = data.shape[0]
+        if n == 0:
+            return np.empty((0, self.n_channels), dtype=np.float32), np.empty(0)
+        buf = np.concatenate((self._history, np.asarray(data, dtype=np.float32)))
+        # Output k ends at input sample phase + k * factor of this chunk
+        ends = np.arange(self._phase, n, self.factor)
+        windows = sliding_window_view(buf, self.taps.shape[0], axis=0)[ends]  # (m, C, numtaps)
+        out = windows @ self.taps
+        self._history = buf[-(self.taps.shape[0] - 1):]
+        self._phase = int(ends[-1] + self.factor - n) if ends.size else self._phase - n
+        return out, np.asarray(timestamps, dtype=np.float64)[ends] - self.delay
@@ -0,0 +1,148 @@
+"""Publish recorded sessions to LSL on an absolute schedule (drift-free, with speed multipliers)."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .source_replay import Pacer
+
+try:
+    import pylsl as lsl
+except ImportError:
+    lsl = None
+
+
+@dataclass
+class PublisherConfig:
+    """Configuration for ReplayPublisher."""
+    stream_name: str = "NeuroRelayReplay"
+    stream_type: str = "EEG"
+    source_id: str = "neurorelay-replay"
+    chunk_sec: float = 0.04  # Sub-second chunks, like an amplifier driver
+    speed: float = 1.0  # 1.0 real time, 10.0 ten times faster, 0 as fast as possible
+    loop: bool = False  # Start over at the end (timestamps keep increasing)
+
+
+def load_recording(path: Path, channels: Optional[Sequence[str]] = None):
+    """
+    Samples, sample rate and channel names from a session (.nrs), replay CSV or EDF file.
+
+    Session files are memory-mapped; the others are read into memory.
+    """
+    from .session_file import SessionFile, is_session_file
+    from .source_replay import channel_columns, load_csv
+
+    path = Path(path)
+    if is_session_file(path):
+        session = SessionFile(path)
+        idx = session.channel_index(channels)
+        data = session.data if idx is None else session.data[:, idx]
+        return data, session.sample_rate, list(channels or session.channels)
+    if path.suffix.lower() == ".edf":
+        import pyedflib
+
+        f = pyedflib.EdfReader(str(path))
+        try:
+            labels = f.getSignalLabels()
+            idx = [labels.index(c) for c in channels] if channels else list(range(f.signals_in_file))
+            n = min(f.getNSamples()[i] for i in idx)  # channels may differ in length
+            data = np.empty((n, len(idx)), dtype=np.float32)
+            for k, i in enumerate(idx):
+                data[:, k] = f.readSignal(i)[:n]
+            return data, float(f.getSampleFrequency(idx[0])), [labels[i] for i in idx]
+        finally:
+            f.close()
+    arr, header = load_csv(path, channels)
+    t = arr[:, 0]
+    sample_rate = round(1.0 / float(np.median(np.diff(t))), 3)
+    return arr[:, 1:-1].astype(np.float32), sample_rate, list(channels or channel_columns(header))
+
+
+class ReplayPublisher:
+    """
+    Pushes a recording to an LSL outlet as if it were being acquired.
+
+    Chunk k is pushed when its last sample is due, at start + end_k / (rate * speed)
+    on the monotonic clock, so time spent pushing never accumulates as drift.
+    Samples are stamped start_lsl + index / rate (recording time anchored at the
+    first push): at 1x the stamps track local_clock(); at other speeds their
+    spacing stays that of the recording.
+    """
+
+    def __init__(self, data: np.ndarray, sample_rate: float, channels: Sequence[str],
+                 config: Optional[PublisherConfig] = None):
+        if lsl is None:
+            raise ImportError("pylsl not available. Install with: uv sync -E stream")
+        if data.shape[0] == 0:
+            raise ValueError("Recording has no samples to publish")
+        self.data = data
+        self.sample_rate = float(sample_rate)
+        self.channels = list(channels)
+        self.config = config or PublisherConfig()
+        self.samples_pushed = 0
+        self.max_lag = 0.0  # Worst lateness of a push behind its schedule (s)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.outlet = lsl.StreamOutlet(self._stream_info())
+
+    @classmethod
+    def from_file(cls, path: Path, config: Optional[PublisherConfig] = None,
+                  channels: Optional[Sequence[str]] = None) -> "ReplayPublisher":
+        data, sample_rate, names = load_recording(path, channels)
+        return cls(data, sample_rate, names, config)
+
+    def _stream_info(self) -> "lsl.StreamInfo":
+        cfg = self.config
+        info = lsl.StreamInfo(cfg.stream_name, cfg.stream_type, len(self.channels),
+                              self.sample_rate, "float32", cfg.source_id)
+        chans = info.desc().append_child("channels")
+        for name in self.channels:
+            chans.append_child("channel").append_child_value("label", name)
+        return info
+
+    def run(self) -> int:
+        """Publish until the end of the recording (or stop()); returns samples pushed."""
+        cfg = self.config
+        n = self.data.shape[0]
+        step = max(1, int(round(cfg.chunk_sec * self.sample_rate)))
+        rate = self.sample_rate * cfg.speed if cfg.speed > 0 else None
+        pacer = Pacer()
+        start_lsl = lsl.local_clock()
+        index = 0  # samples pushed since the start, across loops
+        while not self._stop.is_set():
+            offset = index % n
+            k = min(step, n - offset)
+            if rate is not None:
+                self.max_lag = max(self.max_lag, pacer.wait_until((index + k) / rate))
+            chunk = np.ascontiguousarray(self.data[offset:offset + k], dtype=np.float32)
+            # One stamp for the newest sample; liblsl spaces the others at the nominal rate
+            self.outlet.push_chunk(chunk, start_lsl + (index + k - 1) / self.sample_rate)
+            index += k
+            self.samples_pushed = index
+            if offset + k >= n and not cfg.loop:
+                break
+        return self.samples_pushed
+
+    def start(self) -> None:
+        """Publish from a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until a background run finishes; True if it did."""
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
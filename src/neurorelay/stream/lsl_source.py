@@ -4,14 +4,25 @@
 import threading
 import time
 from collections import deque
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Optional, Tuple, List, Dict, Any, Callable
 from dataclasses import dataclass
 import numpy as np
 
+from .ingest import StreamDecimator, resolve_channels
+from .realtime import RealtimeConfig, RealtimeScope, format_report
+from .telemetry import AcquisitionTelemetry
+
 try:
     import pylsl as lsl
 except ImportError:
     lsl = None
+try:
+    from pylsl.util import LostError
+except ImportError:  # older pylsl (or none): fall back to the base class
+    LostError = RuntimeError
+
+# source_id of the last stream connected per (type, name), shared by LSLSource instances
+_SOURCE_CACHE: Dict[Tuple[str, Optional[str]], str] = {}
 
 
 @dataclass
@@ -22,19 +33,111 @@ class LSLConfig:
     timeout: float = 5.0
     buffer_seconds: float = 10.0
     max_chunk_size: int = 1024
+    mirrored_buffer: bool = True  # Contiguous latest-N windows (allows zero-copy reads)
+    shared_memory: bool = False  # Back the ring with shared memory (readable from other processes)
+    channels: Optional[List[str]] = None  # Keep only these channels at ingest (default: all)
+    target_sample_rate: Optional[float] = None  # Decimate at ingest to about this rate (integer factor)
+    telemetry_path: Optional[str] = None  # Append acquisition telemetry snapshots here (JSONL)
+    telemetry_interval: float = 5.0  # Seconds between snapshots / clock-offset refreshes
+    source_id: Optional[str] = None  # Connect only to this outlet
+    reconnect: bool = True  # Re-resolve and resume (same buffer) if the stream is lost
+    reconnect_min_delay: float = 0.1  # Backoff between resolve attempts, doubling up to the max
+    reconnect_max_delay: float = 2.0
+    reconnect_timeout: Optional[float] = None  # Give up after this long (default: until stop())
+    stall_timeout: float = 3.0  # No samples for this long from a regular-rate stream counts as lost
+    realtime: Optional[RealtimeConfig] = None  # Pin/prioritize the acquisition thread, control GC
 
 
 class RingBuffer:
-    """Thread-safe ring buffer for EEG data."""
+    """
+    Thread-safe ring buffer for EEG data.
+    
+    With mirrored=True every sample is stored twice, max_samples apart, so the
+    latest N samples are always one contiguous slice: view_latest returns them
+    without copying and get_latest copies them without stacking wrapped parts.
     
-    def __init__(self, max_samples: int, n_channels: int):
+    total counts every sample ever written; consumers can block on it with
+    wait_for_samples or register subscribe callbacks keyed on sample counts.
+    """
+    
+    def __init__(self, max_samples: int, n_channels: int, mirrored: bool = False):
         self.max_samples = max_samples
         self.n_channels = n_channels
-        self.buffer = np.zeros((max_samples, n_channels), dtype=np.float32)
-        self.timestamps = np.zeros(max_samples, dtype=np.float64)
+        self.mirrored = mirrored
+        size = 2 * max_samples if mirrored else max_samples
+        self.buffer = np.zeros((size, n_channels), dtype=np.float32)
+        self.timestamps = np.zeros(size, dtype=np.float64)
         self.head = 0
         self.count = 0
+        self.total = 0
         self.lock = threading.RLock()
+        self._cond = threading.Condition(self.lock)
+        self._subscribers: Dict[int, List[Any]] = {}  # token -> [callback, every, next_total]
+        self._next_token = 0
+    
+    def _published(self, n: int) -> List[Callable[[int], None]]:
+        """Account for n new samples; wake waiters and return the callbacks now due (lock held)."""
+        self.total += n
+        self._cond.notify_all()
+        due = []
+        for sub in self._subscribers.values():
+            callback, every, next_total = sub
+            if self.total >= next_total:
+                # One call per crossing, even if a large chunk spans several steps
+                sub[2] = next_total + every * ((self.total - next_total) // every + 1)
+                due.append(callback)
+        return due
+    
+    def _notify(self, due: List[Callable[[int], None]], total: int) -> None:
+        """Run subscriber callbacks outside the lock; a failing callback must not stop acquisition."""
+        for callback in due:
+            try:
+                callback(total)
+            except Exception as e:
+                print(f"RingBuffer subscriber error: {e}")
+    
+    def subscribe(self, callback: Callable[[int], None], every_n_samples: int) -> int:
+        """
+        Call callback(total) from the writer thread each time every_n_samples new samples arrive.
+        
+        Returns:
+            Token for unsubscribe()
+        """
+        with self.lock:
+            every = max(1, int(every_n_samples))
+            token = self._next_token
+            self._next_token += 1
+            self._subscribers[token] = [callback, every, self.total + every]
+            return token
+    
+    def unsubscribe(self, token: int) -> None:
+        """Remove a subscription (unknown tokens are ignored)."""
+        with self.lock:
+            self._subscribers.pop(token, None)
+    
+    def wait_for_samples(self, n_samples: int, timeout: Optional[float] = None, since: Optional[int] = None) -> bool:
+        """
+        Block until n_samples have arrived after sample count since (default: now).
+        
+        Passing the previous target as since keeps a fixed data-driven cadence
+        even when the caller is late.
+        
+        Returns:
+            True if the samples arrived, False on timeout
+        """
+        with self._cond:
+            target = (self.total if since is None else int(since)) + int(n_samples)
+            return self._cond.wait_for(lambda: self.total >= target, timeout)
+    
+    def _write(self, start: int, data: np.ndarray, timestamps: np.ndarray) -> None:
+        """Write rows at storage position start (no wrap), plus the mirror copy."""
+        n = data.shape[0]
+        self.buffer[start:start + n] = data
+        self.timestamps[start:start + n] = timestamps
+        if self.mirrored:
+            m = start + self.max_samples
+            self.buffer[m:m + n] = data
+            self.timestamps[m:m + n] = timestamps
     
     def append(self, data: np.ndarray, timestamps: np.ndarray):
         """Append new data to the ring buffer (vectorized)."""
@@ -42,37 +145,228 @@ class RingBuffer:
             n = int(data.shape[0])
             if n == 0:
                 return
-            head = self.head
+            n_new = n
             maxn = self.max_samples
+            if n > maxn:
+                # Only the newest max_samples can be kept
+                data = data[-maxn:]
+                timestamps = timestamps[-maxn:]
+                self.head = (self.head + n - maxn) % maxn
+                n = maxn
+            head = self.head
             remain = maxn - head
             if n <= remain:
-                self.buffer[head:head + n] = data
-                self.timestamps[head:head + n] = timestamps
+                self._write(head, data, timestamps)
             else:
-                first = remain
-                self.buffer[head:] = data[:first]
-                self.timestamps[head:] = timestamps[:first]
-                over = n - first
-                self.buffer[:over] = data[first:first + over]
-                self.timestamps[:over] = timestamps[first:first + over]
+                self._write(head, data[:remain], timestamps[:remain])
+                self._write(0, data[remain:], timestamps[remain:])
             self.head = (head + n) % maxn
             self.count = min(self.count + n, maxn)
+            due = self._published(n_new)
+            total = self.total
+        self._notify(due, total)
     
-    def get_latest(self, n_samples: int) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
-        """Get the latest n_samples from the buffer."""
+    def reserve(self, n_samples: int) -> np.ndarray:
+        """
+        Writable slice of storage for the next samples, to be filled in place.
+        
+        The slice never wraps, so it may be shorter than n_samples. Its rows
+        are hidden from readers until commit().
+        """
+        with self.lock:
+            n = int(min(n_samples, self.max_samples - self.head))
+            self.count = min(self.count, self.max_samples - n)
+            return self.buffer[self.head:self.head + n]
+    
+    def commit(self, n_samples: int, timestamps: np.ndarray) -> None:
+        """Publish the first n_samples rows written into the last reserve() slice."""
+        with self.lock:
+            head = self.head
+            n = int(n_samples)
+            self.timestamps[head:head + n] = timestamps[:n]
+            if self.mirrored:
+                m = head + self.max_samples
+                self.buffer[m:m + n] = self.buffer[head:head + n]
+                self.timestamps[m:m + n] = self.timestamps[head:head + n]
+            self.head = (head + n) % self.max_samples
+            self.count = min(self.count + n, self.max_samples)
+            due = self._published(n)
+            total = self.total
+        self._notify(due, total)
+    
+    def read_since(self, position: int, max_samples: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, int, int]:
+        """
+        Samples written after absolute sample index position (see RingReader).
+        
+        Args:
+            position: Absolute index of the first sample wanted (a count of samples written)
+            max_samples: Optional cap on the number of samples returned
+            
+        Returns:
+            (data, timestamps, next_position, lost): read-only views for mirrored
+            buffers (copies if a plain buffer wraps); lost counts samples that were
+            overwritten before they could be read
+        """
+        with self.lock:
+            oldest = self.total - self.count
+            lost = max(0, oldest - position)
+            position = max(position, oldest)
+            k = self.total - position
+            if max_samples is not None:
+                k = min(k, int(max_samples))
+            start = (self.head - (self.total - position)) % self.max_samples
+            if self.mirrored or start + k <= self.max_samples:
+                data = self.buffer[start:start + k]
+                ts = self.timestamps[start:start + k]
+            else:
+                first = self.max_samples - start
+                data = np.concatenate((self.buffer[start:], self.buffer[:k - first]))
+                ts = np.concatenate((self.timestamps[start:], self.timestamps[:k - first]))
+        data.flags.writeable = False
+        ts.flags.writeable = False
+        return data, ts, position + k, lost
+    
+    def reader(self, from_oldest: bool = False) -> "RingReader":
+        """New cursor starting at the next sample written (or at the oldest held sample)."""
+        with self.lock:
+            return RingReader(self, self.total - self.count if from_oldest else self.total)
+    
+    def view_latest(self, n_samples: int) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Read-only views of the latest n_samples (mirrored buffers only).
+        
+        The views alias the ring storage: they stay valid until the writer laps
+        them, i.e. for (max_samples - n_samples) further samples.
+        """
+        if not self.mirrored:
+            raise ValueError("view_latest requires a mirrored RingBuffer")
         with self.lock:
             if self.count == 0:
                 return None, None
             k = int(min(n_samples, self.count))
+            end = self.head + self.max_samples
+            data = self.buffer[end - k:end]
+            ts = self.timestamps[end - k:end]
+        data.flags.writeable = False
+        ts.flags.writeable = False
+        return data, ts
+    
+    def read_into(self, out: np.ndarray, timestamps_out: Optional[np.ndarray] = None) -> int:
+        """
+        Copy the latest samples into caller-provided arrays without allocating.
+        
+        Args:
+            out: Destination (n, n_channels); filled with the latest min(n, count) samples
+            timestamps_out: Optional destination for their timestamps (n,)
+            
+        Returns:
+            Number of rows written, aligned to the end of out
+        """
+        with self.lock:
+            k = int(min(out.shape[0], self.count))
+            if k == 0:
+                return 0
+            rows = slice(out.shape[0] - k, out.shape[0])
+            if self.mirrored:
+                end = self.head + self.max_samples
+                out[rows] = self.buffer[end - k:end]
+                if timestamps_out is not None:
+                    timestamps_out[rows] = self.timestamps[end - k:end]
+                return k
             start = (self.head - k) % self.max_samples
-            if start + k <= self.max_samples:
-                return (self.buffer[start:start + k].copy(),
-                        self.timestamps[start:start + k].copy())
-            else:
-                first = self.max_samples - start
-                data = np.vstack((self.buffer[start:], self.buffer[:k - first]))
-                ts = np.hstack((self.timestamps[start:], self.timestamps[:k - first]))
-                return data, ts
+            first = min(k, self.max_samples - start)
+            out[rows.start:rows.start + first] = self.buffer[start:start + first]
+            out[rows.start + first:rows.stop] = self.buffer[:k - first]
+            if timestamps_out is not None:
+                timestamps_out[rows.start:rows.start + first] = self.timestamps[start:start + first]
+                timestamps_out[rows.start + first:rows.stop] = self.timestamps[:k - first]
+            return k
+    
+    def _locate(self, times: np.ndarray, side: str = "left") -> np.ndarray:
+        """Offsets (0..count) of times among the held timestamps, by binary search (lock held)."""
+        start = (self.head - self.count) % self.max_samples
+        if self.mirrored or start + self.count <= self.max_samples:
+            base = start if not self.mirrored else self.head + self.max_samples - self.count
+            return np.searchsorted(self.timestamps[base:base + self.count], times, side)
+        # Wrapped plain buffer: two sorted runs, every stamp in the first <= every stamp in the second
+        return (np.searchsorted(self.timestamps[start:], times, side)
+                + np.searchsorted(self.timestamps[:self.head], times, side))
+    
+    def index_at(self, times, side: str = "left") -> np.ndarray:
+        """
+        Absolute sample indices (as used by read_since) of LSL timestamps.
+        
+        Each index is that of the first held sample stamped at or after the
+        time (side="left") or strictly after it (side="right"); times before
+        the oldest held sample map to the oldest index, after the newest to total.
+        """
+        with self.lock:
+            return self._locate(np.asarray(times, dtype=np.float64), side) + (self.total - self.count)
+    
+    def read_range(self, t_start: float, t_end: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Copies of the held samples with t_start <= timestamp < t_end."""
+        with self.lock:
+            i0, i1 = self._locate(np.array([t_start, t_end], dtype=np.float64)) + (self.total - self.count)
+            data, ts, _, _ = self.read_since(int(i0), int(max(0, i1 - i0)))
+            return data.copy(), ts.copy()
+    
+    def epochs(
+        self,
+        onsets,
+        n_samples: int,
+        offset: int = 0,
+        out: Optional[np.ndarray] = None,
+        timestamps_out: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extract stimulus-locked epochs in one vectorized gather.
+        
+        Epoch e starts offset samples after the first sample stamped at or
+        after onsets[e] (negative offset: pre-stimulus baseline).
+        
+        Args:
+            onsets: LSL timestamps of the events (n_epochs,)
+            n_samples: Samples per epoch
+            offset: Start of each epoch relative to its onset sample
+            out: Optional float32 destination (n_epochs, n_samples, n_channels)
+            timestamps_out: Optional destination for sample timestamps (n_epochs, n_samples)
+            
+        Returns:
+            (epochs, valid): epochs not (or no longer) fully in the buffer are
+            NaN and flagged False in valid
+        """
+        onsets = np.atleast_1d(np.asarray(onsets, dtype=np.float64))
+        shape = (onsets.shape[0], int(n_samples), self.n_channels)
+        if out is None:
+            out = np.empty(shape, dtype=np.float32)
+        elif out.shape != shape:
+            raise ValueError(f"out has shape {out.shape}, expected {shape}")
+        with self.lock:
+            first = self._locate(onsets) + int(offset)
+            valid = (first >= 0) & (first + shape[1] <= self.count)
+            rows = first[:, None] + np.arange(shape[1])
+            # Logical offset -> storage row (the first copy of a mirrored buffer is complete too)
+            rows = (rows + (self.head - self.count)) % self.max_samples
+            # mode="clip" is a no-op here (rows are in range) but lets take write out unbuffered
+            np.take(self.buffer, rows, axis=0, out=out, mode="clip")
+            if timestamps_out is not None:
+                np.take(self.timestamps, rows, axis=0, out=timestamps_out, mode="clip")
+        if not valid.all():
+            out[~valid] = np.nan
+            if timestamps_out is not None:
+                timestamps_out[~valid] = np.nan
+        return out, valid
+    
+    def get_latest(self, n_samples: int) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Get a copy of the latest n_samples from the buffer."""
+        with self.lock:
+            if self.count == 0:
+                return None, None
+            k = int(min(n_samples, self.count))
+            data = np.empty((k, self.n_channels), dtype=self.buffer.dtype)
+            ts = np.empty(k, dtype=self.timestamps.dtype)
+            self.read_into(data, ts)
+            return data, ts
     
     def get_latest_seconds(self, duration: float, sample_rate: float) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
         """Get the latest duration seconds of data."""
@@ -80,6 +374,46 @@ class RingBuffer:
         return self.get_latest(n_samples)
 
 
+class RingReader:
+    """
+    Independent read cursor over a RingBuffer.
+    
+    Each consumer (detector, scope, recorder, ...) keeps its own position and
+    reads exactly the samples written since its previous read. If it falls
+    more than the buffer length behind, the overwritten samples are skipped
+    and reported via the return value, overruns and lost_samples.
+    """
+    
+    def __init__(self, buffer: RingBuffer, position: int):
+        self.buffer = buffer
+        self.position = int(position)
+        self.overruns = 0
+        self.lost_samples = 0
+    
+    @property
+    def pending(self) -> int:
+        """Samples written since the last read (including any already overwritten)."""
+        return self.buffer.total - self.position
+    
+    def read(self, max_samples: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Everything written since the previous read (up to max_samples).
+        
+        Returns:
+            (data, timestamps, lost): views valid until the writer laps them, and
+            the number of samples lost to an overrun since the previous read
+        """
+        data, ts, self.position, lost = self.buffer.read_since(self.position, max_samples)
+        if lost:
+            self.overruns += 1
+            self.lost_samples += lost
+        return data, ts, lost
+    
+    def skip_to_latest(self) -> None:
+        """Discard everything pending."""
+        self.position = self.buffer.total
+
+
 class LSLSource:
     """LSL stream source with background thread and ring buffer."""
     
@@ -96,49 +430,41 @@ class LSLSource:
         self.sample_rate: Optional[float] = None
         self.n_channels: Optional[int] = None
         self.channel_names: List[str] = []
+        # Ingest stage: what the stream delivers vs. what is kept in the buffer
+        self.stream_sample_rate: Optional[float] = None
+        self.stream_channel_names: List[str] = []
+        self._channel_idx: Optional[List[int]] = None
+        self._decimator: Optional[StreamDecimator] = None
+        self.telemetry: Optional[AcquisitionTelemetry] = None
+        # Reconnects: first sample index after each gap and the gap length in seconds
+        self.state = "disconnected"
+        self.reconnects = 0
+        self.gaps: List[Tuple[int, float]] = []
+        # Which real-time settings took effect on the acquisition thread
+        self.realtime_report: Dict[str, Dict[str, Any]] = {}
     
     def connect(self) -> bool:
         """Connect to LSL stream."""
         print(f"Looking for LSL streams of type '{self.config.stream_type}'...")
         
-        # Find streams - use resolve_streams for newer pylsl versions
-        try:
-            streams = lsl.resolve_streams(wait_time=self.config.timeout)
-            # Filter by type
-            streams = [s for s in streams if s.type() == self.config.stream_type]
-        except (AttributeError, TypeError):
-            # Fallback for older pylsl versions
-            try:
-                streams = lsl.resolve_byprop('type', self.config.stream_type, timeout=self.config.timeout)
-            except AttributeError:
-                # Last fallback
-                streams = []
-        
-        if not streams:
+        info = self._resolve(self.config.timeout)
+        if info is None:
             print(f"No LSL streams found for type '{self.config.stream_type}'")
             return False
         
-        # Pick first stream (or by name if specified)
-        info = streams[0]
-        if self.config.stream_name:
-            for stream_info in streams:
-                if stream_info.name() == self.config.stream_name:
-                    info = stream_info
-                    break
-            else:
-                print(f"Stream '{self.config.stream_name}' not found, using first available")
-        
-        # Create inlet
-        self.inlet = lsl.StreamInlet(info, max_chunklen=self.config.max_chunk_size)
-        self.info = info
+        self._open_inlet(info)
         
         # Get stream info
         self.sample_rate = info.nominal_srate()
         self.n_channels = info.channel_count()
         
-        # Get channel names
+        # Get channel names (resolved infos carry no description; ask the inlet for the full one)
+        try:
+            full_info = self.inlet.info(timeout=self.config.timeout)
+        except Exception:
+            full_info = info
         self.channel_names = []
-        channels = info.desc().child("channels")
+        channels = full_info.desc().child("channels")
         if not channels.empty():
             ch = channels.child("channel")
             for _ in range(self.n_channels):
@@ -151,16 +477,155 @@ class LSLSource:
         else:
             self.channel_names = [f"Ch{i}" for i in range(self.n_channels)]
         
+        self._setup_ingest()
+        self.telemetry = AcquisitionTelemetry(self.stream_sample_rate)
+        
         # Initialize ring buffer
         max_samples = int(self.config.buffer_seconds * self.sample_rate)
-        self.buffer = RingBuffer(max_samples, self.n_channels)
+        self._close_buffer()
+        if self.config.shared_memory:
+            from .shared_ring import SharedRingBuffer
+            self.buffer = SharedRingBuffer(max_samples, self.n_channels)
+        else:
+            self.buffer = RingBuffer(max_samples, self.n_channels, mirrored=self.config.mirrored_buffer)
+        self.reconnects = 0
+        self.gaps = []
         
         print(f"Connected to LSL stream: {info.name()}")
-        print(f"  Sample rate: {self.sample_rate} Hz")
+        if self._decimator is not None:
+            print(f"  Sample rate: {self.stream_sample_rate} Hz, decimated to {self.sample_rate} Hz")
+        else:
+            print(f"  Sample rate: {self.sample_rate} Hz")
         print(f"  Channels: {self.n_channels} ({', '.join(self.channel_names[:5])}{'...' if len(self.channel_names) > 5 else ''})")
         
         return True
     
+    def _predicate(self, with_name: bool = True, source_id: Optional[str] = None) -> str:
+        """XPath predicate over stream infos, as used by resolve_bypred."""
+        terms = [f"type='{self.config.stream_type}'"]
+        if with_name and self.config.stream_name:
+            terms.append(f"name='{self.config.stream_name}'")
+        if source_id:
+            terms.append(f"source_id='{source_id}'")
+        return " and ".join(terms)
+    
+    def _resolve(self, timeout: float) -> Optional["lsl.StreamInfo"]:
+        """
+        Find the stream with targeted queries, returning as soon as one answers.
+        
+        Order: the configured source_id (only), else the source_id cached from
+        the last good connection (briefly), then type/name, then type alone.
+        """
+        key = (self.config.stream_type, self.config.stream_name)
+        if self.config.source_id:
+            queries = [(self._predicate(source_id=self.config.source_id), timeout)]
+        else:
+            queries = []
+            cached = _SOURCE_CACHE.get(key)
+            if cached:
+                queries.append((self._predicate(source_id=cached), min(timeout, 0.5)))
+            queries.append((self._predicate(), timeout))
+            if self.config.stream_name:
+                queries.append((self._predicate(with_name=False), min(timeout, 0.5)))
+        
+        for predicate, wait in queries:
+            try:
+                streams = lsl.resolve_bypred(predicate, 1, wait)
+            except AttributeError:
+                streams = self._resolve_by_scan(wait)
+            if streams:
+                info = streams[0]
+                if self.config.stream_name and info.name() != self.config.stream_name:
+                    print(f"Stream '{self.config.stream_name}' not found, using first available")
+                if info.source_id():
+                    _SOURCE_CACHE[key] = info.source_id()
+                return info
+        return None
+    
+    def _resolve_by_scan(self, timeout: float) -> List["lsl.StreamInfo"]:
+        """Fallback for pylsl versions without resolve_bypred: list everything, then filter."""
+        try:
+            streams = lsl.resolve_streams(wait_time=timeout)
+        except (AttributeError, TypeError):
+            streams = lsl.resolve_byprop('type', self.config.stream_type, timeout=timeout)
+        streams = [s for s in streams if s.type() == self.config.stream_type]
+        if self.config.source_id:
+            streams = [s for s in streams if s.source_id() == self.config.source_id]
+        named = [s for s in streams if s.name() == self.config.stream_name]
+        return named or streams
+    
+    def _open_inlet(self, info: "lsl.StreamInfo") -> None:
+        # recover=False: a lost stream raises, and _reconnect re-resolves it (possibly a restarted outlet)
+        self.inlet = lsl.StreamInlet(info, max_chunklen=self.config.max_chunk_size, recover=False)
+        self.info = info
+    
+    def _reconnect(self) -> bool:
+        """
+        Re-resolve the lost stream with bounded exponential backoff, keeping the buffer.
+        
+        Returns:
+            True once a compatible stream is open again; False if stopped or timed out
+        """
+        self.state = "reconnecting"
+        lost_at = time.monotonic()
+        print("LSL stream lost, reconnecting...")
+        try:
+            self.inlet.close_stream()
+        except Exception:
+            pass
+        delay = self.config.reconnect_min_delay
+        while self.running:
+            if self.config.reconnect_timeout is not None and time.monotonic() - lost_at > self.config.reconnect_timeout:
+                break
+            info = self._resolve(delay)
+            if info is not None:
+                if (info.channel_count() != len(self.stream_channel_names)
+                        or info.nominal_srate() != self.stream_sample_rate):
+                    print(f"Ignoring '{info.name()}': channel count or rate differs from the lost stream")
+                    time.sleep(delay)
+                else:
+                    self._open_inlet(info)
+                    if self._decimator is not None:
+                        self._decimator.reset()
+                    self.reconnects += 1
+                    self.gaps.append((self.buffer.total, time.monotonic() - lost_at))
+                    self.state = "streaming"
+                    print(f"Reconnected to LSL stream: {info.name()} after {time.monotonic() - lost_at:.2f} s")
+                    return True
+            delay = min(2 * delay, self.config.reconnect_max_delay)
+        self.state = "disconnected"
+        return False
+    
+    def _setup_ingest(self) -> None:
+        """Resolve the kept channels and the decimation factor once per connection."""
+        self.stream_sample_rate = self.sample_rate
+        self.stream_channel_names = list(self.channel_names)
+        
+        idx = resolve_channels(self.stream_channel_names, self.config.channels)
+        if self.config.channels:
+            missing = [c for c in self.config.channels if c.lower() not in {n.lower() for n in self.stream_channel_names}]
+            if missing:
+                print(f"Channels not in stream: {', '.join(missing)}")
+        self._channel_idx = None if idx == list(range(len(self.stream_channel_names))) else idx
+        self.channel_names = [self.stream_channel_names[i] for i in idx]
+        self.n_channels = len(idx)
+        
+        self._decimator = None
+        factor = 1
+        if self.config.target_sample_rate and self.stream_sample_rate and self.stream_sample_rate > 0:
+            factor = max(1, int(round(self.stream_sample_rate / self.config.target_sample_rate)))
+        if factor > 1:
+            self._decimator = StreamDecimator(factor, self.n_channels, self.stream_sample_rate)
+            self.sample_rate = self.stream_sample_rate / factor
+    
+    def _ingest(self, data: np.ndarray, timestamps: np.ndarray) -> None:
+        """Project channels, decimate and store a pulled chunk."""
+        if self._channel_idx is not None:
+            data = data[:, self._channel_idx]
+        if self._decimator is not None:
+            data, timestamps = self._decimator.process(data, timestamps)
+        self.buffer.append(data, timestamps)
+    
     def start(self) -> bool:
         """Start background acquisition thread."""
         if not self.inlet:
@@ -169,6 +634,7 @@ class LSLSource:
             return True
         
         self.running = True
+        self.state = "streaming"
         self.thread = threading.Thread(target=self._acquisition_loop, daemon=True)
         self.thread.start()
         print("LSL acquisition started")
@@ -178,36 +644,130 @@ class LSLSource:
         """Stop background acquisition."""
         if self.running:
             self.running = False
+            self.state = "disconnected"
             if self.thread:
                 self.thread.join(timeout=1.0)
             print("LSL acquisition stopped")
     
+    def close(self) -> None:
+        """Stop acquisition and release the buffer (frees shared memory)."""
+        self.stop()
+        self._close_buffer()
+    
+    def _close_buffer(self) -> None:
+        if self.buffer is not None and hasattr(self.buffer, "close"):
+            self.buffer.close()
+        self.buffer = None
+    
     def _acquisition_loop(self):
         """Background thread for data acquisition."""
         if not self.inlet or not self.buffer:
             return
         
+        # Rows being pulled into are hidden from readers, so keep them a small part of the ring
+        chunk = max(1, min(int(self.config.max_chunk_size), self.buffer.max_samples // 8))
+        # float32 streams are pulled by liblsl without list conversion: straight into the
+        # ring storage, or into a scratch array when channels are projected/decimated first
+        direct = self.info is not None and self.info.channel_format() == lsl.cf_float32
+        ingest = self._channel_idx is not None or self._decimator is not None
+        if ingest:
+            chunk = max(1, int(self.config.max_chunk_size))
+            if self._decimator is not None:
+                self._decimator.reset()
+        scratch = np.empty((chunk, len(self.stream_channel_names)), dtype=np.float32) if direct and ingest else None
+        
+        realtime = RealtimeScope(self.config.realtime) if self.config.realtime else None
+        if realtime is not None:
+            self.realtime_report = realtime.enter()
+            print("Acquisition real-time mode:\n" + format_report(self.realtime_report))
+        try:
+            self._pull_loop(chunk, direct, ingest, scratch, realtime)
+        finally:
+            if realtime is not None:
+                realtime.exit()
+    
+    def _pull_loop(self, chunk: int, direct: bool, ingest: bool, scratch: Optional[np.ndarray],
+                   realtime: Optional[RealtimeScope]) -> None:
+        telemetry = self.telemetry
+        next_report = last_data = time.monotonic()
+        stall = self.config.stall_timeout if self.stream_sample_rate else None
         while self.running:
             try:
-                # Pull chunk from LSL
-                data, timestamps = self.inlet.pull_chunk(timeout=0.1, max_samples=256)
+                if direct and not ingest:
+                    dest = self.buffer.reserve(chunk)
+                    _, timestamps = self.inlet.pull_chunk(timeout=0.1, max_samples=dest.shape[0], dest_obj=dest)
+                    if len(timestamps):
+                        timestamps = np.asarray(timestamps, dtype=np.float64)
+                        self.buffer.commit(len(timestamps), timestamps)
+                elif direct:
+                    _, timestamps = self.inlet.pull_chunk(timeout=0.1, max_samples=chunk, dest_obj=scratch)
+                    if len(timestamps):
+                        timestamps = np.asarray(timestamps, dtype=np.float64)
+                        self._ingest(scratch[:len(timestamps)], timestamps)
+                else:
+                    data, timestamps = self.inlet.pull_chunk(timeout=0.1, max_samples=chunk)
+                    if len(timestamps):
+                        timestamps = np.asarray(timestamps, dtype=np.float64)
+                        self._ingest(np.asarray(data, dtype=np.float32), timestamps)
                 
-                if data:
-                    data_array = np.array(data, dtype=np.float32)
-                    ts_array = np.array(timestamps, dtype=np.float64)
-                    self.buffer.append(data_array, ts_array)
+                now = time.monotonic()
+                if len(timestamps):
+                    telemetry.record_chunk(timestamps, now, lsl.local_clock())
+                    last_data = now
+                    if realtime is not None:
+                        realtime.safe_point()  # chunk is published; a GC pause here delays nobody
+                else:
+                    telemetry.record_empty()
+                    if stall is not None and now - last_data > stall:
+                        raise LostError(f"no samples for {stall:.1f} s")
+                if now >= next_report:
+                    next_report = now + self.config.telemetry_interval
+                    self._report_telemetry()
                 
+            except LostError as e:
+                telemetry.errors += 1
+                if not self.config.reconnect:
+                    print(f"LSL acquisition error: {e}")
+                    self.running = False
+                    break
+                if not self._reconnect():
+                    self.running = False
+                    break
+                last_data = time.monotonic()
             except Exception as e:
                 print(f"LSL acquisition error: {e}")
+                telemetry.errors += 1
                 self.running = False
                 break
     
-    def get_latest_data(self, duration: float) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], Optional[Dict[str, Any]]]:
-        """Get latest data from buffer."""
+    def _report_telemetry(self) -> None:
+        """Refresh the sender-to-local clock offset and write a snapshot if configured."""
+        try:
+            self.telemetry.clock_correction = self.inlet.time_correction(timeout=0.1)
+        except Exception:
+            pass  # keep the previous estimate
+        if self.config.telemetry_path:
+            try:
+                self.telemetry.write_snapshot(self.config.telemetry_path,
+                                              {'stream': self.info.name(), 'buffered': self.buffer.count})
+            except OSError as e:
+                print(f"Telemetry write failed: {e}")
+    
+    def get_latest_data(self, duration: float, copy: bool = True) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], Optional[Dict[str, Any]]]:
+        """
+        Get latest data from buffer.
+        
+        With copy=False and a mirrored buffer, data and timestamps are read-only
+        views into the ring (see RingBuffer.view_latest); use them before the
+        acquisition thread laps the buffer.
+        """
         if not self.buffer or not self.sample_rate:
             return None, None, None
         
-        data, timestamps = self.buffer.get_latest_seconds(duration, self.sample_rate)
+        if not copy and self.buffer.mirrored:
+            data, timestamps = self.buffer.view_latest(int(duration * self.sample_rate))
+        else:
+            data, timestamps = self.buffer.get_latest_seconds(duration, self.sample_rate)
         
         if data is None:
             return None, None, None
@@ -221,6 +781,58 @@ class LSLSource:
         
         return data, timestamps, metadata
     
+    def stream_time(self, local_time: float) -> float:
+        """Convert an LSL local_clock() time (e.g. a UI event) to the stream's timestamp clock."""
+        correction = self.telemetry.clock_correction if self.telemetry else 0.0
+        return local_time - correction
+    
+    def get_range(self, t_start: float, t_end: float) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Copies of the buffered samples stamped in [t_start, t_end) (stream time)."""
+        if not self.buffer:
+            return None, None
+        return self.buffer.read_range(t_start, t_end)
+    
+    def get_epochs(self, onsets, duration: float, pre: float = 0.0,
+                   out: Optional[np.ndarray] = None) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Stimulus-locked epochs of duration seconds, starting pre seconds before each onset.
+        
+        Onsets are in stream time (see stream_time); returns (epochs, valid) as
+        RingBuffer.epochs, shaped (n_epochs, samples, channels).
+        """
+        if not self.buffer or not self.sample_rate:
+            return None, None
+        return self.buffer.epochs(onsets, int(round(duration * self.sample_rate)),
+                                  offset=-int(round(pre * self.sample_rate)), out=out)
+    
+    @property
+    def samples_received(self) -> int:
+        """Total samples acquired since connect()."""
+        return self.buffer.total if self.buffer else 0
+    
+    def wait_for_samples(self, n_samples: int, timeout: Optional[float] = None, since: Optional[int] = None) -> bool:
+        """Block until n_samples new samples arrive (see RingBuffer.wait_for_samples)."""
+        if not self.buffer:
+            return False
+        return self.buffer.wait_for_samples(n_samples, timeout, since)
+    
+    def reader(self, from_oldest: bool = False) -> RingReader:
+        """Independent cursor over the acquired samples (see RingReader)."""
+        if not self.buffer:
+            raise RuntimeError("Connect before creating a reader")
+        return self.buffer.reader(from_oldest)
+    
+    def subscribe(self, callback: Callable[[int], None], every_n_samples: int) -> int:
+        """Call callback(total) from the acquisition thread every every_n_samples samples."""
+        if not self.buffer:
+            raise RuntimeError("Connect before subscribing to samples")
+        return self.buffer.subscribe(callback, every_n_samples)
+    
+    def unsubscribe(self, token: int) -> None:
+        """Remove a subscription made with subscribe()."""
+        if self.buffer:
+            self.buffer.unsubscribe(token)
+    
     def is_connected(self) -> bool:
         """Check if connected and running."""
         return self.running and self.inlet is not None and self.buffer is not None
@@ -235,5 +847,15 @@ class LSLSource:
             'type': self.info.type(),
             'sample_rate': self.sample_rate,
             'n_channels': self.n_channels,
-            'channel_names': self.channel_names
+            'channel_names': self.channel_names,
+            'stream_sample_rate': self.stream_sample_rate,
+            'stream_n_channels': len(self.stream_channel_names),
+            'decimation': self._decimator.factor if self._decimator else 1,
+            'shared_buffer': getattr(self.buffer, 'name', None),
+            'source_id': self.info.source_id(),
+            'state': self.state,
+            'reconnects': self.reconnects,
+            'gaps': list(self.gaps),
+            'realtime': self.realtime_report,
+            'telemetry': self.telemetry.snapshot() if self.telemetry else {}
         }
\ No newline at end of file
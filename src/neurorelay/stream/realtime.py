@@ -0,0 +1,153 @@
+"""Opt-in real-time settings for hot threads: CPU pinning, scheduling priority and GC control."""
+
+import gc
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# The cyclic GC is process-wide: the last scope to exit restores it
+_gc_lock = threading.Lock()
+_gc_holders = 0
+_gc_was_enabled = True
+
+
+@dataclass
+class RealtimeConfig:
+    """What to apply to a thread when it enters its hot loop (every field is optional)."""
+    cpus: Optional[List[int]] = None  # Pin the thread to these cores
+    rt_priority: Optional[int] = None  # SCHED_FIFO priority 1-99 (needs CAP_SYS_NICE)
+    nice: Optional[int] = None  # Thread niceness, e.g. -10 (used if rt_priority is unset or denied)
+    gc: Optional[str] = None  # "freeze": move existing objects out of GC; "disable": also stop automatic GC
+    gc_interval: float = 1.0  # With gc="disable": collect young generations this often, at safe points
+
+
+def _result(applied: bool, detail: str) -> Dict[str, Any]:
+    return {"applied": applied, "detail": detail}
+
+
+class RealtimeScope:
+    """
+    Applies a RealtimeConfig to the calling thread and undoes it on exit.
+
+    enter() and exit() must run on the thread being tuned. Each setting is
+    best effort; enter() returns whether each one took effect, and why not.
+    With gc="disable", call safe_point() where a pause is harmless (e.g.
+    right after a chunk or prediction is handed off).
+    """
+
+    def __init__(self, config: RealtimeConfig):
+        self.config = config
+        self.report: Dict[str, Dict[str, Any]] = {}
+        self._previous: Dict[str, Any] = {}
+        self._gc_held = False
+        self._next_collect = 0.0
+
+    def enter(self) -> Dict[str, Dict[str, Any]]:
+        cfg = self.config
+        self.report = {}
+        if cfg.cpus:
+            self.report["affinity"] = self._set_affinity(cfg.cpus)
+        if cfg.rt_priority:
+            self.report["scheduler"] = self._set_fifo(cfg.rt_priority)
+        if cfg.nice is not None and not self.report.get("scheduler", {}).get("applied"):
+            self.report["nice"] = self._set_nice(cfg.nice)
+        if cfg.gc:
+            self.report["gc"] = self._hold_gc(cfg.gc)
+        return self.report
+
+    def _set_affinity(self, cpus: List[int]) -> Dict[str, Any]:
+        if not hasattr(os, "sched_setaffinity"):
+            return _result(False, "CPU affinity not supported on this platform")
+        try:
+            self._previous["affinity"] = os.sched_getaffinity(0)
+            os.sched_setaffinity(0, cpus)  # 0: the calling thread
+            return _result(True, f"pinned to CPUs {sorted(os.sched_getaffinity(0))}")
+        except OSError as e:
+            return _result(False, f"affinity {cpus} refused: {e}")
+
+    def _set_fifo(self, priority: int) -> Dict[str, Any]:
+        if not hasattr(os, "sched_setscheduler"):
+            return _result(False, "SCHED_FIFO not supported on this platform")
+        try:
+            previous = (os.sched_getscheduler(0), os.sched_getparam(0))
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+            self._previous["scheduler"] = previous
+            return _result(True, f"SCHED_FIFO priority {priority}")
+        except OSError as e:
+            return _result(False, f"SCHED_FIFO refused: {e}")
+
+    def _set_nice(self, nice: int) -> Dict[str, Any]:
+        if not hasattr(os, "setpriority"):
+            return _result(False, "niceness not supported on this platform")
+        # On Linux PRIO_PROCESS with a thread id changes only that thread
+        tid = threading.get_native_id()
+        try:
+            previous = os.getpriority(os.PRIO_PROCESS, tid)
+            os.setpriority(os.PRIO_PROCESS, tid, nice)
+            self._previous["nice"] = previous
+            return _result(True, f"nice {os.getpriority(os.PRIO_PROCESS, tid)}")
+        except OSError as e:
+            return _result(False, f"nice {nice} refused: {e}")
+
+    def _hold_gc(self, mode: str) -> Dict[str, Any]:
+        global _gc_holders, _gc_was_enabled
+        if mode not in ("freeze", "disable"):
+            return _result(False, f"unknown gc mode '{mode}'")
+        with _gc_lock:
+            if _gc_holders == 0:
+                _gc_was_enabled = gc.isenabled()
+            _gc_holders += 1
+            gc.freeze()
+            if mode == "disable":
+                gc.disable()
+        self._gc_held = True
+        self._next_collect = time.monotonic() + self.config.gc_interval
+        if mode == "disable":
+            return _result(True, f"automatic GC off; young generations collected every {self.config.gc_interval:g} s")
+        return _result(True, f"{gc.get_freeze_count()} objects frozen")
+
+    def safe_point(self) -> None:
+        """Controlled collection point for gc="disable" (cheap when nothing is due)."""
+        if self.config.gc != "disable" or not self._gc_held:
+            return
+        now = time.monotonic()
+        if now >= self._next_collect:
+            self._next_collect = now + self.config.gc_interval
+            gc.collect(1)
+
+    def exit(self) -> None:
+        """Restore the thread's settings and release the GC hold."""
+        global _gc_holders
+        if "affinity" in self._previous:
+            try:
+                os.sched_setaffinity(0, self._previous["affinity"])
+            except OSError:
+                pass
+        if "scheduler" in self._previous:
+            policy, param = self._previous["scheduler"]
+            try:
+                os.sched_setscheduler(0, policy, param)
+            except OSError:
+                pass
+        if "nice" in self._previous:
+            try:
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self._previous["nice"])
+            except OSError:
+                pass  # raising priority back may need privileges we no longer have
+        self._previous.clear()
+        if self._gc_held:
+            with _gc_lock:
+                _gc_holders -= 1
+                if _gc_holders == 0:
+                    gc.unfreeze()
+                    if _gc_was_enabled:
+                        gc.enable()
+            self._gc_held = False
+
+
+def format_report(report: Dict[str, Dict[str, Any]]) -> str:
+    """One line per setting, for logs."""
+    return "\n".join(f"  {name}: {'ok' if r['applied'] else 'not applied'} ({r['detail']})"
+                     for name, r in report.items())
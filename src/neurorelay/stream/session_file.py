@@ -0,0 +1,208 @@
+"""Compact binary session format: a JSON header, then float32 samples, float64 timestamps and int16 labels."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Generator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .source_replay import (
+    LABEL_MAP, ReplayChunk, ReplayConfig, SegmentIndex, channel_columns, chunk_pacer, read_csv_blocks,
+)
+
+MAGIC = b"NRSESS01"
+SUFFIX = ".nrs"
+_HEADER_ALIGN = 4096  # samples start on a page boundary
+_DATA_DTYPE = np.dtype("<f4")
+_TS_DTYPE = np.dtype("<f8")
+_LABEL_DTYPE = np.dtype("<i2")
+
+# File layout:
+#   MAGIC | uint32 JSON length | JSON header | zero padding to _HEADER_ALIGN
+#   samples (n, n_channels) float32 | pad to 8 | timestamps (n,) float64 | labels (n,) int16
+# The JSON header holds sample_rate, channels, label_map, n_samples and the block offsets.
+
+
+def _layout(header_bytes: int, n_samples: int, n_channels: int) -> Dict[str, int]:
+    data = header_bytes
+    timestamps = data + n_samples * n_channels * _DATA_DTYPE.itemsize
+    timestamps += -timestamps % _TS_DTYPE.itemsize
+    labels = timestamps + n_samples * _TS_DTYPE.itemsize
+    return {"data": data, "timestamps": timestamps, "labels": labels}
+
+
+def _header_size(meta: dict) -> int:
+    # Room for the final n_samples/offsets whatever their size
+    probe = dict(meta, n_samples=2**62, offsets={"data": 2**62, "timestamps": 2**62, "labels": 2**62})
+    used = len(MAGIC) + 4 + len(json.dumps(probe).encode("utf-8"))
+    return used + (-used % _HEADER_ALIGN)
+
+
+def _write_header(f, meta: dict, size: int) -> None:
+    payload = json.dumps(meta).encode("utf-8")
+    f.seek(0)
+    f.write(MAGIC + struct.pack("<I", len(payload)) + payload)
+    f.write(b"\0" * (size - len(MAGIC) - 4 - len(payload)))
+
+
+class SessionWriter:
+    """
+    Appends blocks of samples to a session file with constant memory.
+
+    Samples go straight to their final place; timestamps and labels are
+    spooled to temporary files and appended by close(), which also writes
+    the final header.
+    """
+
+    def __init__(self, path: Path, sample_rate: float, channels: Sequence[str],
+                 label_map: Optional[Dict[str, int]] = None):
+        self.path = Path(path)
+        self.meta = {
+            "version": 1,
+            "sample_rate": float(sample_rate),
+            "channels": list(channels),
+            "label_map": dict(LABEL_MAP if label_map is None else label_map),
+        }
+        self.n_samples = 0
+        self._header_bytes = _header_size(self.meta)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self.path.open("wb")
+        self._f.write(b"\0" * self._header_bytes)
+        self._ts = tempfile.TemporaryFile()
+        self._labels = tempfile.TemporaryFile()
+
+    def write(self, data: np.ndarray, timestamps: np.ndarray, labels: Optional[np.ndarray] = None) -> None:
+        """Append (n, n_channels) samples with their timestamps and label indices (-1: none)."""
+        n = data.shape[0]
+        if data.ndim != 2 or data.shape[1] != len(self.meta["channels"]):
+            raise ValueError(f"Expected (n, {len(self.meta['channels'])}) samples, got {data.shape}")
+        self._f.write(np.ascontiguousarray(data, dtype=_DATA_DTYPE).tobytes())
+        self._ts.write(np.asarray(timestamps, dtype=_TS_DTYPE).tobytes())
+        lab = np.full(n, -1) if labels is None else labels
+        self._labels.write(np.asarray(lab, dtype=_LABEL_DTYPE).tobytes())
+        self.n_samples += n
+
+    def close(self) -> None:
+        offsets = _layout(self._header_bytes, self.n_samples, len(self.meta["channels"]))
+        self._f.write(b"\0" * (offsets["timestamps"] - self._f.tell()))
+        for spool in (self._ts, self._labels):
+            spool.seek(0)
+            shutil.copyfileobj(spool, self._f)
+            spool.close()
+        _write_header(self._f, dict(self.meta, n_samples=self.n_samples, offsets=offsets), self._header_bytes)
+        self._f.close()
+
+    def __enter__(self) -> "SessionWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SessionFile:
+    """
+    Read-only memory map of a session file.
+
+    data (n, n_channels), timestamps (n,) and labels (n,) are np.memmap views;
+    nothing is parsed or copied until it is used.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a NeuroRelay session file")
+            (length,) = struct.unpack("<I", f.read(4))
+            self.meta = json.loads(f.read(length).decode("utf-8"))
+        self.sample_rate: float = self.meta["sample_rate"]
+        self.channels: List[str] = self.meta["channels"]
+        self.label_map: Dict[str, int] = self.meta["label_map"]
+        n, offsets = self.meta["n_samples"], self.meta["offsets"]
+        self.data = np.memmap(self.path, _DATA_DTYPE, "r", offsets["data"], (n, len(self.channels)))
+        self.timestamps = np.memmap(self.path, _TS_DTYPE, "r", offsets["timestamps"], (n,))
+        self.labels = np.memmap(self.path, _LABEL_DTYPE, "r", offsets["labels"], (n,))
+
+    def __len__(self) -> int:
+        return self.meta["n_samples"]
+
+    def segments(self) -> SegmentIndex:
+        """Label segments of the whole session (one vectorized pass over the mapped labels)."""
+        return SegmentIndex.from_labels(self.labels)
+
+    def channel_index(self, channels: Optional[Sequence[str]]) -> Optional[List[int]]:
+        """Column indices of channels, or None when they are all columns in file order."""
+        if not channels or list(channels) == self.channels:
+            return None
+        missing = [c for c in channels if c not in self.channels]
+        if missing:
+            raise ValueError(f"{self.path}: no channel(s) {', '.join(missing)}")
+        return [self.channels.index(c) for c in channels]
+
+
+def is_session_file(path: Path) -> bool:
+    """True if path starts with the session magic bytes."""
+    try:
+        with Path(path).open("rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def csv_to_session(
+    csv_path: Path,
+    out_path: Path,
+    sample_rate: Optional[float] = None,
+    channels: Optional[Sequence[str]] = None,
+) -> Path:
+    """
+    Convert a replay CSV (t,<channels...>,label) block by block.
+
+    The sample rate defaults to one estimated from the t column of the first block.
+    """
+    writer = None
+    for t, data, labels in read_csv_blocks(csv_path, channels):
+        if writer is None:
+            if sample_rate is None:
+                steps = np.diff(t)
+                if not steps.size or not np.isfinite(steps).all():
+                    raise ValueError("Cannot estimate the sample rate; pass sample_rate")
+                sample_rate = round(1.0 / float(np.median(steps)), 3)
+            with Path(csv_path).open("r") as f:
+                header = [name.strip() for name in f.readline().strip().split(",")]
+            names = list(channels) if channels else channel_columns(header)
+            writer = SessionWriter(out_path, sample_rate, names)
+        writer.write(data, t, labels)
+    if writer is None:
+        raise ValueError(f"{csv_path} has no samples")
+    writer.close()
+    return Path(out_path)
+
+
+def replay_session_chunks(path: Path, cfg: ReplayConfig) -> Generator[Union[np.ndarray, ReplayChunk], None, None]:
+    """
+    Like replay_chunks, from a memory-mapped session file.
+
+    Chunks are read-only views of the file when cfg.channels are all channels
+    in file order (otherwise small per-chunk column copies); with
+    cfg.with_labels, ReplayChunk timestamps and labels are views too.
+    Chunks are sized from the sample rate in the file header, not
+    cfg.sample_rate_hz, so each one spans chunk_sec of recording.
+    """
+    session = SessionFile(path)
+    chunk_n = max(1, int(session.sample_rate * cfg.chunk_sec))
+    idx = session.channel_index(cfg.channels)
+    pace = chunk_pacer(cfg)
+    for start in range(0, len(session), chunk_n):
+        stop = start + chunk_n
+        x = session.data[start:stop]
+        pace()
+        x = x if idx is None else x[:, idx]
+        if cfg.with_labels:
+            yield ReplayChunk(x, session.timestamps[start:stop], session.labels[start:stop], start)
+        else:
+            yield x
@@ -0,0 +1,214 @@
+"""RingBuffer backed by shared memory, for reading EEG windows from another process."""
+
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .lsl_source import RingBuffer
+
+# Header slots (int64): sequence number, layout, then the RingBuffer positions
+_SEQ, _MAX_SAMPLES, _N_CHANNELS, _HEAD, _COUNT, _TOTAL = range(6)
+_HEADER_BYTES = 64
+
+
+class SharedRingBuffer(RingBuffer):
+    """
+    Mirrored RingBuffer whose storage and positions live in shared memory.
+
+    One process writes (append/reserve/commit, e.g. LSLSource); others attach
+    by name and read. Writers bump a sequence number to odd before touching
+    the header and back to even after, and readers retry until they see the
+    same even number before and after a read (a seqlock), so no lock is shared
+    between processes and EEG arrays are never pickled. Because storage is
+    mirrored, the latest window is never being written while it is read unless
+    the writer laps the whole buffer.
+
+    subscribe/wait_for_samples only see writes made from the same process;
+    other processes poll total.
+    """
+
+    def __init__(self, max_samples: int, n_channels: int, name: Optional[str] = None, create: bool = True):
+        data_bytes = 2 * max_samples * n_channels * np.dtype(np.float32).itemsize
+        ts_bytes = 2 * max_samples * np.dtype(np.float64).itemsize
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                                  size=_HEADER_BYTES + data_bytes + ts_bytes)
+        else:
+            self.shm = _attach(name)
+        self._owner = create
+        self._header = np.ndarray((_HEADER_BYTES // 8,), dtype=np.int64, buffer=self.shm.buf)
+
+        # Same state as RingBuffer.__init__, except positions and storage are shared
+        self.max_samples = max_samples
+        self.n_channels = n_channels
+        self.mirrored = True
+        self.lock = threading.RLock()
+        self._cond = threading.Condition(self.lock)
+        self._subscribers = {}
+        self._next_token = 0
+        self.buffer = np.ndarray((2 * max_samples, n_channels), dtype=np.float32,
+                                 buffer=self.shm.buf, offset=_HEADER_BYTES)
+        self.timestamps = np.ndarray((2 * max_samples,), dtype=np.float64,
+                                     buffer=self.shm.buf, offset=_HEADER_BYTES + data_bytes)
+        if create:
+            self._header[:] = 0
+            self._header[_MAX_SAMPLES] = max_samples
+            self._header[_N_CHANNELS] = n_channels
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedRingBuffer":
+        """Open an existing shared ring buffer created by another process."""
+        shm = _attach(name)
+        header = np.ndarray((2,), dtype=np.int64, buffer=shm.buf, offset=_MAX_SAMPLES * 8)
+        max_samples, n_channels = int(header[0]), int(header[1])
+        del header
+        shm.close()
+        return cls(max_samples, n_channels, name=name, create=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    # RingBuffer positions are stored in the shared header
+    head = property(lambda self: int(self._header[_HEAD]),
+                    lambda self, v: self._header.__setitem__(_HEAD, v))
+    count = property(lambda self: int(self._header[_COUNT]),
+                     lambda self, v: self._header.__setitem__(_COUNT, v))
+    total = property(lambda self: int(self._header[_TOTAL]),
+                     lambda self, v: self._header.__setitem__(_TOTAL, v))
+
+    def _begin_write(self) -> None:
+        self._header[_SEQ] += 1
+
+    def _end_write(self) -> None:
+        self._header[_SEQ] += 1
+
+    def _published(self, n: int):
+        # Last step of append/commit: release readers only once total matches head/count
+        due = super()._published(n)
+        self._end_write()
+        return due
+
+    # Single writer: the sequence number needs no cross-process lock
+    def append(self, data: np.ndarray, timestamps: np.ndarray):
+        if data.shape[0] == 0:
+            return
+        self._begin_write()
+        super().append(data, timestamps)
+
+    def reserve(self, n_samples: int) -> np.ndarray:
+        self._begin_write()
+        try:
+            return super().reserve(n_samples)
+        finally:
+            self._end_write()
+
+    def commit(self, n_samples: int, timestamps: np.ndarray) -> None:
+        self._begin_write()
+        super().commit(n_samples, timestamps)
+
+    def _stable_seq(self) -> int:
+        while True:
+            seq = int(self._header[_SEQ])
+            if seq % 2 == 0:
+                return seq
+            time.sleep(0)
+
+    def read_into(self, out: np.ndarray, timestamps_out: Optional[np.ndarray] = None) -> int:
+        while True:
+            seq = self._stable_seq()
+            k = super().read_into(out, timestamps_out)
+            if int(self._header[_SEQ]) == seq:
+                return k
+
+    def read_since(self, position: int, max_samples: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, int, int]:
+        while True:
+            seq = self._stable_seq()
+            result = super().read_since(position, max_samples)
+            if int(self._header[_SEQ]) == seq:
+                return result
+
+    def index_at(self, times, side: str = "left") -> np.ndarray:
+        while True:
+            seq = self._stable_seq()
+            idx = super().index_at(times, side)
+            if int(self._header[_SEQ]) == seq:
+                return idx
+
+    def read_range(self, t_start: float, t_end: float) -> Tuple[np.ndarray, np.ndarray]:
+        while True:
+            seq = self._stable_seq()
+            result = super().read_range(t_start, t_end)
+            if int(self._header[_SEQ]) == seq:
+                return result
+
+    def epochs(self, onsets, n_samples: int, offset: int = 0, out: Optional[np.ndarray] = None,
+               timestamps_out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        while True:
+            seq = self._stable_seq()
+            result = super().epochs(onsets, n_samples, offset, out, timestamps_out)
+            if int(self._header[_SEQ]) == seq:
+                return result
+
+    def positions(self) -> Tuple[int, int, int]:
+        """(head, count, total) from one consistent snapshot of the header."""
+        while True:
+            seq = self._stable_seq()
+            snapshot = (self.head, self.count, self.total)
+            if int(self._header[_SEQ]) == seq:
+                return snapshot
+
+    def view_latest(self, n_samples: int) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Read-only views of the latest n_samples, consistent at the time of the call.
+
+        Use view_latest_with_total to check the views with is_intact after processing.
+        """
+        data, ts, _ = self.view_latest_with_total(n_samples)
+        return data, ts
+
+    def view_latest_with_total(self, n_samples: int) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], int]:
+        """
+        view_latest plus the sample total the views end at, read under the same seqlock.
+
+        Pass that total to is_intact(total, n) after processing to check the
+        writer has not lapped the views meanwhile.
+        """
+        while True:
+            seq = self._stable_seq()
+            data, ts = super().view_latest(n_samples)
+            total = self.total
+            if int(self._header[_SEQ]) == seq:
+                return data, ts, total
+
+    def is_intact(self, total_at_read: int, n_samples: int) -> bool:
+        """True if a window of n_samples read at sample count total_at_read has not been overwritten."""
+        return self.total - total_at_read <= self.max_samples - n_samples
+
+    def close(self) -> None:
+        """Detach from the shared memory; the creating process also frees it."""
+        self._header = None
+        self.buffer = None
+        self.timestamps = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # views handed out earlier still map it; released with them
+        if self._owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open shared memory without letting this process's resource tracker free it on exit."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
@@ -1,73 +1,263 @@
 #src/neurorelay/stream/source_replay.py
 from __future__ import annotations
 
+import itertools
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Generator, List, Tuple
+from typing import Generator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
+LABEL_MAP = {"SUMMARIZE": 0, "TODOS": 1, "DEADLINES": 2, "EMAIL": 3}
+BLOCK_ROWS = 8192  # rows parsed per np.loadtxt call
+
 
 @dataclass
 class ReplayConfig:
     sample_rate_hz: float = 250.0
     chunk_sec: float = 1.0
-    realtime: bool = True            # pace with time.sleep(chunk_sec)
+    realtime: bool = True            # pace at one chunk per chunk_sec (see Pacer)
     channels: List[str] | None = None
+    speed: float = 1.0               # pacing multiplier when realtime (10.0: ten times faster)
+    with_labels: bool = False        # yield ReplayChunk (data, t, labels, start) instead of bare arrays
 
     def __post_init__(self):
         if self.channels is None:
             self.channels = ["O1", "Oz", "O2"]
 
 
-def load_csv(path: Path) -> Tuple[np.ndarray, List[str]]:
+class ReplayChunk(NamedTuple):
+    """A replayed chunk with its ground truth."""
+    data: np.ndarray    # (n, n_channels)
+    t: np.ndarray       # (n,) recording timestamps (NaN if the source has none)
+    labels: np.ndarray  # (n,) label indices (see LABEL_MAP), -1 for unlabeled samples
+    start: int          # index of the first sample in the recording
+
+
+class SegmentIndex:
+    """
+    Runs of equal labels as half-open sample ranges [start, stop), built in one pass.
+
+    extend() takes labels chunk by chunk (e.g. ReplayChunk.labels as they are
+    replayed); only the chunk's label transitions are visited in Python, and
+    a run continuing across chunks stays one segment.
+    """
+
+    def __init__(self):
+        self._starts: List[int] = []
+        self._labels: List[int] = []
+        self._arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self.n_samples = 0
+
+    @classmethod
+    def from_labels(cls, labels: np.ndarray) -> "SegmentIndex":
+        index = cls()
+        index.extend(labels)
+        return index
+
+    def extend(self, labels: np.ndarray) -> None:
+        labels = np.asarray(labels)
+        n = labels.shape[0]
+        if n == 0:
+            return
+        starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+        if self._labels and self._labels[-1] == labels[0]:
+            starts = starts[1:]  # continues the previous run
+        self._starts.extend((starts + self.n_samples).tolist())
+        self._labels.extend(labels[starts].astype(int).tolist())
+        self.n_samples += n
+        self._arrays = None
+
+    def _as_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._arrays is None:
+            starts = np.asarray(self._starts, dtype=np.int64)
+            stops = np.r_[starts[1:], self.n_samples].astype(np.int64)
+            self._arrays = (starts, stops, np.asarray(self._labels, dtype=int))
+        return self._arrays
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self._as_arrays()[0]
+
+    @property
+    def stops(self) -> np.ndarray:
+        return self._as_arrays()[1]
+
+    @property
+    def labels(self) -> np.ndarray:
+        return self._as_arrays()[2]
+
+    def trials(self) -> List[Tuple[int, int, int]]:
+        """(start, stop, label) of every labeled segment."""
+        return [(a, b, lab) for a, b, lab in zip(self.starts.tolist(), self.stops.tolist(), self._labels)
+                if lab >= 0]
+
+    def segment_at(self, index: int) -> int:
+        """Segment holding sample index."""
+        return int(np.searchsorted(self.starts, index, side="right")) - 1
+
+    def dominant(self, start: int, stop: int) -> int:
+        """Segment overlapping samples [start, stop) the most (e.g. a detector window)."""
+        starts, stops, _ = self._as_arrays()
+        i0 = int(np.searchsorted(stops, start, side="right"))
+        i1 = max(i0 + 1, int(np.searchsorted(starts, stop, side="left")))
+        overlap = np.minimum(stops[i0:i1], stop) - np.maximum(starts[i0:i1], start)
+        return i0 + int(np.argmax(overlap))
+
+
+class Pacer:
+    """
+    Sleeps until absolute offsets from its first call on the monotonic clock.
+
+    Time spent between calls (pushing, consumer processing) shortens the next
+    sleep instead of accumulating as drift.
     """
-    Expect CSV with header: t,O1,Oz,O2,label
-    Returns array of shape (n, 5): columns [t, O1, Oz, O2, label_index]
+
+    def __init__(self):
+        self.start: Optional[float] = None
+
+    def wait_until(self, elapsed: float) -> float:
+        """Sleep until elapsed seconds after the first call; returns how late we already were."""
+        now = time.monotonic()
+        if self.start is None:
+            self.start = now
+        delay = self.start + elapsed - now
+        if delay > 0:
+            time.sleep(delay)
+            return 0.0
+        return -delay
+
+
+def channel_columns(header: Sequence[str]) -> List[str]:
+    """Every column of a replay CSV header except t and label."""
+    return [name for name in header if name not in ("t", "label")]
+
+
+def read_csv_blocks(
+    path: Path,
+    channels: Optional[Sequence[str]] = None,
+    block_rows: int = BLOCK_ROWS,
+) -> Generator[Tuple[np.ndarray, np.ndarray, np.ndarray], None, None]:
     """
-    import csv
+    Parse a replay CSV (header: t,<channels...>[,label]) block by block.
 
-    with path.open("r", newline="") as f:
-        reader = csv.reader(f)
-        header = next(reader)
+    Each block of rows is parsed by np.loadtxt straight into arrays and its
+    labels are mapped to indices in bulk, so memory stays constant however
+    long the file is.
+
+    Args:
+        path: CSV file
+        channels: Channel columns to read, in this order (default: all but t/label)
+        block_rows: Rows per block (every block but the last has exactly this many)
+
+    Yields:
+        (t (n,), data (n, n_channels), label_idx (n,) with -1 for unlabeled rows)
+    """
+    with Path(path).open("r", newline="") as f:
+        header = [name.strip() for name in f.readline().strip().split(",")]
         cols = {name: i for i, name in enumerate(header)}
-        rows: list[tuple[float, float, float, float, float]] = []
-        label_map = {"SUMMARIZE": 0, "TODOS": 1, "DEADLINES": 2, "EMAIL": 3}
-        for r in reader:
-            t = float(r[cols["t"]])
-            o1 = float(r[cols["O1"]])
-            oz = float(r[cols["Oz"]])
-            o2 = float(r[cols["O2"]])
-            label = r[cols.get("label", -1)] if "label" in cols else ""
-            lab_idx = float(label_map.get(label, -1))
-            rows.append((t, o1, oz, o2, lab_idx))
-    arr = np.asarray(rows, dtype=float)
+        channels = list(channels) if channels else channel_columns(header)
+        missing = [c for c in channels if c not in cols]
+        if missing:
+            raise ValueError(f"{path}: no column(s) {', '.join(missing)} in header {header}")
+        usecols = [cols[c] for c in channels]
+        t_col = cols.get("t")
+        label_col = cols.get("label")
+        if t_col is not None:
+            usecols = [t_col] + usecols
+
+        while True:
+            lines = list(itertools.islice(f, block_rows))
+            if not lines:
+                return
+            values = np.loadtxt(lines, delimiter=",", usecols=usecols, dtype=float, ndmin=2)
+            if values.shape[0] == 0:
+                continue  # only blank lines
+            if t_col is not None:
+                t, data = values[:, 0], values[:, 1:]
+            else:
+                t, data = np.full(values.shape[0], np.nan), values
+            if label_col is None:
+                labels = np.full(values.shape[0], -1, dtype=int)
+            else:
+                names = np.loadtxt(lines, delimiter=",", usecols=[label_col], dtype=str, ndmin=1)
+                labels = _label_indices(names)
+            yield t, data, labels
+
+
+def _label_indices(names: np.ndarray) -> np.ndarray:
+    """Map label strings to indices once per run of equal labels (labels come in blocks)."""
+    starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]])
+    codes = np.array([LABEL_MAP.get(str(names[i]), -1) for i in starts], dtype=int)
+    return np.repeat(codes, np.diff(np.r_[starts, names.shape[0]]))
+
+
+def load_csv(path: Path, channels: Optional[Sequence[str]] = None) -> Tuple[np.ndarray, List[str]]:
+    """
+    Expect CSV with header: t,<channels...>,label (e.g. t,O1,Oz,O2,label)
+    Returns array of shape (n, n_channels + 2): columns [t, <channels...>, label_index]
+    and the CSV header (channel_columns(header) names the default channels)
+    """
+    with Path(path).open("r", newline="") as f:
+        header = [name.strip() for name in f.readline().strip().split(",")]
+    blocks = [np.column_stack((t, data, labels))
+              for t, data, labels in read_csv_blocks(path, channels)]
+    n_cols = len(channels or channel_columns(header)) + 2
+    arr = np.concatenate(blocks) if blocks else np.empty((0, n_cols))
     return arr, header
 
 
-def replay_chunks(path: Path, cfg: ReplayConfig) -> Generator[np.ndarray, None, None]:
+def replay_chunks(path: Path, cfg: ReplayConfig) -> Generator[Union[np.ndarray, ReplayChunk], None, None]:
     """
     Stream CSV in chunks of cfg.chunk_sec without loading everything into memory.
-    CSV header: t,O1,Oz,O2,label
+    CSV header: t,<channels...>,label; yields (n, len(cfg.channels)) arrays, or
+    ReplayChunk with the t column and label indices when cfg.with_labels.
+    Binary session files (see session_file) are memory-mapped instead of parsed.
     """
-    import csv
-    import time
+    from .session_file import is_session_file, replay_session_chunks
+
+    if is_session_file(path):
+        yield from replay_session_chunks(path, cfg)
+        return
 
     sr = cfg.sample_rate_hz
     chunk_n = max(1, int(sr * cfg.chunk_sec))
-    buf = []
-
-    with path.open("r", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            buf.append([float(row["O1"]), float(row["Oz"]), float(row["O2"])])
-            if len(buf) >= chunk_n:
-                x = np.asarray(buf, dtype=float)
-                yield x
-                buf.clear()
-                if cfg.realtime and cfg.chunk_sec > 0:
-                    time.sleep(cfg.chunk_sec)  # pace at ~real-time
-
-        if buf:
-            x = np.asarray(buf, dtype=float)
-            yield x
+    # Whole chunks per parsed block; a partial tail (blank lines, end of file) carries over
+    block_rows = chunk_n * max(1, BLOCK_ROWS // chunk_n)
+    carry = None
+    offset = 0
+    pace = chunk_pacer(cfg)
+
+    for block in read_csv_blocks(path, cfg.channels, block_rows):
+        if carry is not None:
+            block = tuple(np.concatenate((c, b)) for c, b in zip(carry, block))
+        t, data, labels = block
+        n_full = data.shape[0] - data.shape[0] % chunk_n
+        for start in range(0, n_full, chunk_n):
+            pace()
+            stop = start + chunk_n
+            if cfg.with_labels:
+                yield ReplayChunk(data[start:stop], t[start:stop], labels[start:stop], offset + start)
+            else:
+                yield data[start:stop]
+        offset += n_full
+        carry = tuple(x[n_full:] for x in block) if n_full < data.shape[0] else None
+
+    if carry is not None:
+        pace()
+        t, data, labels = carry
+        yield ReplayChunk(data, t, labels, offset) if cfg.with_labels else data
+
+
+def chunk_pacer(cfg: ReplayConfig):
+    """Callable to run before each yielded chunk: chunk k is released at k * chunk_sec / speed."""
+    if not (cfg.realtime and cfg.chunk_sec > 0 and cfg.speed > 0):
+        return lambda: None
+    pacer = Pacer()
+    period = cfg.chunk_sec / cfg.speed
+    count = itertools.count()
+    return lambda: pacer.wait_until(next(count) * period)
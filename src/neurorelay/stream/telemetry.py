@@ -0,0 +1,150 @@
+"""Acquisition telemetry for LSLSource: throughput, chunking, gaps, jitter and latency."""
+
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+# Histogram bin edges; values beyond the last edge land in the last bin
+CHUNK_EDGES = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+MS_EDGES = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+
+class RollingStat:
+    """Recent values of one quantity, summarized on demand (single writer, no locks)."""
+
+    def __init__(self, edges: Sequence[float], maxlen: int = 1024):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.values: deque = deque(maxlen=maxlen)
+
+    def add(self, value: float) -> None:
+        self.values.append(float(value))
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean, p50/p95/max and histogram of the recent values."""
+        while True:
+            try:
+                arr = np.array(self.values, dtype=np.float64)
+                break
+            except RuntimeError:  # deque mutated by the writer during the copy
+                continue
+        if arr.size == 0:
+            return {"n": 0}
+        hist, _ = np.histogram(np.clip(arr, self.edges[0], self.edges[-1]), bins=self.edges)
+        return {
+            "n": int(arr.size),
+            "mean": float(arr.mean()),
+            "p50": float(np.percentile(arr, 50)),
+            "p95": float(np.percentile(arr, 95)),
+            "max": float(arr.max()),
+            "hist": hist.tolist(),
+            "edges": self.edges.tolist(),
+        }
+
+
+class AcquisitionTelemetry:
+    """
+    Counters and rolling histograms updated by the acquisition thread.
+
+    Throughput problems show up as a low samples/sec or sample gaps (the
+    amplifier or network drops data); latency problems as growing
+    inter-chunk gaps or LSL-to-local clock offset with full throughput.
+    Only the acquisition thread writes; readers take snapshots.
+    """
+
+    def __init__(self, nominal_rate: Optional[float], rate_window_sec: float = 5.0):
+        self.nominal_rate = float(nominal_rate) if nominal_rate else None
+        self.rate_window_sec = float(rate_window_sec)
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.time()
+        self.samples = 0
+        self.chunks = 0
+        self.empty_pulls = 0
+        self.sample_gaps = 0
+        self.samples_missing = 0
+        self.errors = 0
+        self.clock_correction = 0.0
+        self.chunk_sizes = RollingStat(CHUNK_EDGES)
+        self.inter_chunk_ms = RollingStat(MS_EDGES)
+        self.latency_ms = RollingStat(MS_EDGES)
+        self._arrivals: deque = deque()  # (arrival time, n_samples) within rate_window_sec
+        self._last_arrival: Optional[float] = None
+        self._last_timestamp: Optional[float] = None
+
+    def record_chunk(self, timestamps: np.ndarray, arrival: float, local_now: float) -> None:
+        """
+        Account for one pulled chunk.
+
+        Args:
+            timestamps: LSL timestamps of the chunk's samples (stream rate)
+            arrival: time.monotonic() when the pull returned
+            local_now: LSL local_clock() at the same moment
+        """
+        n = int(timestamps.shape[0])
+        self.samples += n
+        self.chunks += 1
+        self.chunk_sizes.add(n)
+        if self._last_arrival is not None:
+            self.inter_chunk_ms.add(1000.0 * (arrival - self._last_arrival))
+        self._last_arrival = arrival
+
+        self._arrivals.append((arrival, n))
+        while self._arrivals and arrival - self._arrivals[0][0] > self.rate_window_sec:
+            self._arrivals.popleft()
+
+        # Sample gaps: spacing well beyond the nominal period, including across chunks
+        if self.nominal_rate:
+            period = 1.0 / self.nominal_rate
+            prev = self._last_timestamp if self._last_timestamp is not None else timestamps[0]
+            steps = np.diff(timestamps, prepend=prev)
+            gaps = steps > 1.5 * period
+            if np.any(gaps):
+                self.sample_gaps += int(np.count_nonzero(gaps))
+                self.samples_missing += int(np.sum(np.round(steps[gaps] / period) - 1))
+        self._last_timestamp = float(timestamps[-1])
+
+        # Age of the newest sample on arrival, in the local clock
+        self.latency_ms.add(1000.0 * (local_now - (self._last_timestamp + self.clock_correction)))
+
+    def record_empty(self) -> None:
+        self.empty_pulls += 1
+
+    @property
+    def rate_hz(self) -> float:
+        """Samples per second over the recent window."""
+        arrivals = list(self._arrivals)
+        if len(arrivals) < 2:
+            return 0.0
+        span = arrivals[-1][0] - arrivals[0][0]
+        return sum(n for _, n in arrivals[1:]) / span if span > 0 else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All counters and histogram summaries as a JSON-serializable dict."""
+        return {
+            "uptime_sec": time.time() - self.started,
+            "samples": self.samples,
+            "chunks": self.chunks,
+            "empty_pulls": self.empty_pulls,
+            "errors": self.errors,
+            "rate_hz": self.rate_hz,
+            "nominal_rate_hz": self.nominal_rate,
+            "sample_gaps": self.sample_gaps,
+            "samples_missing": self.samples_missing,
+            "clock_correction_sec": self.clock_correction,
+            "chunk_size": self.chunk_sizes.summary(),
+            "inter_chunk_ms": self.inter_chunk_ms.summary(),
+            "latency_ms": self.latency_ms.summary(),
+        }
+
+    def write_snapshot(self, path: Path, extra: Optional[Dict[str, Any]] = None) -> None:
+        """Append one snapshot as a JSON line."""
+        record = {"ts": time.time(), **(extra or {}), **self.snapshot()}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
@@ -9,7 +9,6 @@ import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Tuple, Optional
-import numpy as np
 
 from PySide6.QtCore import Qt, QElapsedTimer, QTimer, QRectF, QSize, QThread, Signal, QObject
 from PySide6.QtGui import QColor, QPainter, QPen, QFont, QPaintEvent, QPalette
@@ -29,6 +28,7 @@ from PySide6.QtWidgets import (
 
 # NEW imports for Phase 4
 from ..bus.brainbus import AgentProcess
+from ..signal.commit_policy import CommitPolicy, CommitPolicyConfig
 try:
     from ..agent.tools_local import LocalLLM  # reuse the same LM Studio wrapper if agent extra is installed
 except ImportError:
@@ -42,8 +42,11 @@ class UiConfig:
     window_sec: float
     dwell_sec: float
     tau: float
+    step_sec: float = 0.25  # Live prediction step (new data per prediction)
     flicker_mode: str = "sinusoidal"
     intensity: float = 0.85
+    dynamic_stopping: bool = False
+    stop_error_rate: float = 0.05
 
     @staticmethod
     def from_json(path: Path) -> "UiConfig":
@@ -54,8 +57,11 @@ class UiConfig:
             window_sec=float(cfg.get("window_sec", 3.0)),
             dwell_sec=float(cfg.get("dwell_sec", 1.2)),
             tau=float(cfg.get("tau", 0.65)),
+            step_sec=float(cfg.get("step_sec") or 0.25),
             flicker_mode=str(cfg.get("flicker_mode", "sinusoidal")),
             intensity=float(cfg.get("ui_intensity", 0.85)),
+            dynamic_stopping=bool(cfg.get("dynamic_stopping", False)),
+            stop_error_rate=float(cfg.get("stop_error_rate", 0.05)),
         )
 
 
@@ -270,7 +276,7 @@ class NeuroRelayWindow(QMainWindow):
         lsl_type: str = "EEG",
         lsl_name: Optional[str] = None,
         lsl_timeout: float = 5.0,
-        prediction_rate_hz: float = 4.0,
+        prediction_rate_hz: Optional[float] = None,
     ) -> None:
         super().__init__()
         title = "NeuroRelay — SSVEP 4-Option (Live)" if live else "NeuroRelay — SSVEP 4-Option (Simulation)"
@@ -284,7 +290,7 @@ class NeuroRelayWindow(QMainWindow):
         self.lsl_type = lsl_type
         self.lsl_name = lsl_name
         self.lsl_timeout = float(lsl_timeout)
-        self.prediction_rate_hz = float(prediction_rate_hz)
+        self.prediction_rate_hz = float(prediction_rate_hz) if prediction_rate_hz else None
 
         assert len(cfg.freqs_hz) == 4, "Expect 4 frequencies for 4 tiles"
         
@@ -448,16 +454,16 @@ class NeuroRelayWindow(QMainWindow):
         # Live predictor state (Phase 3)
         self.live_predictor = None
         self._last_prediction_ts = 0.0
-        self._display_conf = [0.0, 0.0, 0.0, 0.0]
-        self._current_top_idx: Optional[int] = None
-        self._stable_idx: Optional[int] = None
-        self._stable_count = 0
-        self._dwell_winner_idx: Optional[int] = None
-        self._dwell_start_ts: Optional[float] = None
-        self._last_commit_ts: float = 0.0
-        self._commit_cooldown_sec: float = 0.75  # ~3 prediction ticks @ 4 Hz
-        self._last_commit_ts: float = 0.0
-        self._commit_cooldown_sec: float = 0.75  # ~3 prediction ticks @ 4 Hz
+        self._link_state = ""
+        # Stability/margin/tau/dwell (and optional dynamic stopping) commit rule
+        self._policy = CommitPolicy(self.cfg.freqs_hz, CommitPolicyConfig(
+            tau=self.cfg.tau,
+            dwell_sec=self.cfg.dwell_sec,
+            # Stability is counted in predictions: one per step_sec, or at the fixed --prediction-rate
+            step_sec=1.0 / self.prediction_rate_hz if self.prediction_rate_hz else self.cfg.step_sec,
+            dynamic_stopping=self.cfg.dynamic_stopping,
+            stop_error_rate=self.cfg.stop_error_rate,
+        ))
 
         # Active document (if any) to show in center panel subtitle
         self._active_doc: Optional[Path] = self._pick_active_document()
@@ -568,16 +574,17 @@ class NeuroRelayWindow(QMainWindow):
             self._update_link_lamp(now)
 
             # Compute dwell progress continuously between prediction callbacks
+            policy = self._policy
             dwell_prog = 0.0
-            if self._dwell_start_ts is not None and self.state == "evaluate" and not self.is_paused:
-                dwell_prog = min(1.0, max(0.0, (now - self._dwell_start_ts) / max(1e-3, self.cfg.dwell_sec)))
+            if self.state == "evaluate" and not self.is_paused:
+                dwell_prog = policy.dwell_progress(now)
 
-            top_idx = self._current_top_idx if self._current_top_idx is not None else 0
+            top_idx = policy.top_idx if policy.top_idx is not None else 0
             # Push feedback & repaint
             for i, tile in enumerate(self.tiles):
                 tile.set_feedback(
-                    self._display_conf[i],
-                    dwell_prog if (self._dwell_winner_idx == i) else 0.0,
+                    policy.confidences[i],
+                    dwell_prog if (policy.dwell_idx == i) else 0.0,
                     i == top_idx,
                 )
                 if not self.is_paused:
@@ -638,13 +645,27 @@ class NeuroRelayWindow(QMainWindow):
         channels = raw_cfg.get("channels", None)
         band = tuple(raw_cfg.get("bandpass_hz", [5, 40]))
         notch = raw_cfg.get("notch_hz", None)
+        streaming = bool(raw_cfg.get("streaming_filter", False))
+        method = str(raw_cfg.get("decoder", "CCA")).lower()
+        trca_model = raw_cfg.get("trca_model", None)
+        artifact_guard = bool(raw_cfg.get("artifact_guard", False))
+        detector_process = bool(raw_cfg.get("detector_process", False))
+        realtime = raw_cfg.get("realtime") or {}  # {"acquisition": {...}, "decoding": {...}}
+        if method not in ("cca", "fbcca", "power", "trca") or (method == "trca" and not trca_model):
+            method = "cca"
 
         try:
             from ..bridge.qt_live_bridge import LivePredictor
             from ..stream.lsl_source import LSLConfig
             from ..signal.ssvep_detector import SSVEPConfig
+            from ..stream.realtime import RealtimeConfig
+            from ..signal.trca import TRCAModel
+
+            # Updated from LSL on connect (a TRCA model is checked against the stream rate then)
+            sample_rate = TRCAModel.load(trca_model).sample_rate if method == "trca" else 250.0
         except Exception as e:
-            self._status(f"Live init error: {e}. Install extras with: uv sync -E ui -E stream")
+            hint = ". Install extras with: uv sync -E ui -E stream" if isinstance(e, ImportError) else ""
+            self._status(f"Live init error: {e}{hint}")
             return
 
         lsl_cfg = LSLConfig(
@@ -652,21 +673,34 @@ class NeuroRelayWindow(QMainWindow):
             stream_name=self.lsl_name,
             timeout=self.lsl_timeout,
             buffer_seconds=self.cfg.window_sec + 2.0,
+            channels=channels,
+            target_sample_rate=raw_cfg.get("ingest_rate_hz", None),
+            telemetry_path=raw_cfg.get("telemetry_path", None),
+            realtime=RealtimeConfig(**realtime["acquisition"]) if realtime.get("acquisition") else None,
         )
         ssvep_cfg = SSVEPConfig(
             frequencies=self.cfg.freqs_hz,
-            sample_rate=250.0,  # updated from LSL on connect
+            sample_rate=sample_rate,
             window_seconds=self.cfg.window_sec,
             channels=channels,
             bandpass_freq=(float(band[0]), float(band[1])),
             notch_freq=float(notch) if (notch is not None) else None,
             harmonics=2,
-            method="cca",
+            method=method,
+            streaming=streaming,
+            trca_model=trca_model if method == "trca" else None,
+            artifact_guard=artifact_guard,
         )
-        self.live_predictor = LivePredictor(lsl_cfg, ssvep_cfg)
-        self.live_predictor.update_prediction_rate(self.prediction_rate_hz)
+        # Predict once per step_sec of new data unless a fixed --prediction-rate was given
+        self.live_predictor = LivePredictor(lsl_cfg, ssvep_cfg,
+                                            step_seconds=self.cfg.step_sec,
+                                            worker_process=detector_process,
+                                            realtime=RealtimeConfig(**realtime["decoding"]) if realtime.get("decoding") else None)
+        if self.prediction_rate_hz:
+            self.live_predictor.update_prediction_rate(self.prediction_rate_hz)
         self.live_predictor.prediction.connect(self._on_live_prediction)  # type: ignore
         self.live_predictor.status_changed.connect(self._status)  # type: ignore
+        self.live_predictor.rejected.connect(self._on_live_rejection)  # type: ignore
         self.live_predictor.data_received.connect(lambda n: None)  # type: ignore
 
         if self.live_predictor.start():
@@ -696,63 +730,48 @@ class NeuroRelayWindow(QMainWindow):
         self.link_dot.setStyleSheet(f"background:{color}; border-radius:7px; border:1px solid #222;")
         # Keep human-readable text short; status bar shows details
         self.link_label.setText(f"Live: {txt}")
+        if txt != self._link_state:
+            self._link_state = txt
+            if txt != "connected" and self.live_predictor is not None:
+                self._show_link_telemetry(txt)
+
+    def _show_link_telemetry(self, txt: str) -> None:
+        """Say which stage is behind when the lamp leaves green."""
+        status = self.live_predictor.get_status()
+        tel = status.get("telemetry") or {}
+        if not tel:
+            return
+        latency = tel.get("latency_ms", {}).get("p50")
+        parts = [f"{tel.get('rate_hz', 0.0):.0f}/{tel.get('nominal_rate_hz') or 0:.0f} Hz in"]
+        if latency is not None:
+            parts.append(f"latency {latency:.0f} ms")
+        parts.append(f"{tel.get('sample_gaps', 0)} gaps")
+        parts.append(f"backlog {status.get('reader_backlog', 0)}")
+        try:
+            self.statusBar().showMessage(f"Live {txt}: " + ", ".join(parts), 5000)
+        except Exception:
+            pass
 
     def _on_live_prediction(self, frequency: float, confidence: float, scores: dict) -> None:
-        """Handle live predictions: stability, dwell, commit."""
+        """Handle live predictions: stability, dwell, commit (see CommitPolicy)."""
         now = time.monotonic()
         self._last_prediction_ts = now
-
-        # Map scores to tile order (nearest frequency matching for robustness)
-        tile_scores = []
-        freqs = list(scores.keys())
-        for f in self.cfg.freqs_hz:
-            j = int(np.argmin([abs(f - g) for g in freqs]))
-            tile_scores.append(float(scores[freqs[j]]))
-
-        # Normalize to confidences (softmax over z-scores)
-        vals = np.asarray(tile_scores, dtype=float)
-        if np.std(vals) > 1e-6:
-            z = (vals - np.mean(vals)) / max(1e-9, float(np.std(vals)))
-            ex = np.exp(z - np.max(z))
-            confs = ex / np.sum(ex)
-        else:
-            confs = np.ones_like(vals) / max(1, len(vals))
-
-        self._display_conf = [float(c) for c in confs.tolist()]
-        top_idx = int(np.argmax(confs))
-        top_conf = float(confs[top_idx])
-        second_conf = float(np.partition(confs, -2)[-2]) if len(confs) >= 2 else 0.0
-        self._current_top_idx = top_idx
-
-        # Stability (winner unchanged across last 3 predictions)
-        if self._stable_idx == top_idx:
-            self._stable_count += 1
-        else:
-            self._stable_idx = top_idx
-            self._stable_count = 1
-
-        stable_enough = self._stable_count >= 3  # ~0.75 s @ 4 Hz
-        clear_margin = (top_conf - second_conf) >= 0.05
-        threshold_ok = top_conf >= self.cfg.tau
-
-        can_dwell = stable_enough and clear_margin and threshold_ok
-
-        if self.state == "evaluate" and not self.is_paused and can_dwell:
-            if self._dwell_winner_idx != top_idx:
-                self._dwell_winner_idx = top_idx
-                self._dwell_start_ts = now
-            # Check commit (with cooldown to prevent immediate repeat commits)
-            if (self._dwell_start_ts is not None
-                and (now - self._dwell_start_ts) >= self.cfg.dwell_sec
-                and (now - self._last_commit_ts) >= self._commit_cooldown_sec):
-                self._commit_selection(top_idx, top_conf)
-        else:
-            # Reset dwell when evidence is insufficient or paused/idle
-            self._dwell_start_ts = None
-            self._dwell_winner_idx = None
+        active = self.state == "evaluate" and not self.is_paused
+        decision = self._policy.update(scores, now, active=active)
+        if decision is not None:
+            self._commit_selection(*decision)
+
+    def _on_live_rejection(self, reason: str) -> None:
+        """Artifact-contaminated window: no evidence this tick, so restart stability and dwell."""
+        self._last_prediction_ts = time.monotonic()
+        self._policy.reject()
+        try:
+            self.statusBar().showMessage(f"Artifact rejected ({reason})", 1000)
+        except Exception:
+            pass
 
     def _commit_selection(self, idx: int, conf: float) -> None:
-        self._last_commit_ts = time.monotonic()
+        self._policy.commit(time.monotonic())
         label = self.LABELS[idx]
         # Prepare context
         try:
@@ -784,9 +803,6 @@ class NeuroRelayWindow(QMainWindow):
 
         self.agent_label.setText(f"agent: {label.lower()} • pending…  (conf={conf:.2f})")
         self._status(f"Committed: {label} (conf={conf:.2f})")
-        # Reset dwell for next selection
-        self._dwell_start_ts = None
-        self._dwell_winner_idx = None
 
     def _on_agent_message(self, obj: dict) -> None:
         typ = obj.get("type", "")
@@ -960,7 +976,8 @@ def main(argv: List[str] | None = None) -> int:
     parser.add_argument("--lsl-type", default="EEG", help="LSL stream type (default: EEG)")
     parser.add_argument("--lsl-name", default=None, help="LSL stream name (optional)")
     parser.add_argument("--lsl-timeout", type=float, default=5.0, help="LSL discovery timeout (s)")
-    parser.add_argument("--prediction-rate", type=float, default=4.0, help="Live prediction rate (Hz)")
+    parser.add_argument("--prediction-rate", type=float, default=None,
+                        help="Fixed live prediction rate (Hz); default: once per config step_sec of new data")
     args = parser.parse_args(argv)
 
     config_path = Path(args.config)
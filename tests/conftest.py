@@ -0,0 +1,13 @@
+"""Shared test fixtures."""
+
+import pytest
+
+from neurorelay.scripts.synthetic_ssvep import make_session
+
+
+@pytest.fixture(scope="session")
+def demo_csv(tmp_path_factory):
+    """Synthetic replay CSV (t,O1,Oz,O2,label), generated once per test run."""
+    path = tmp_path_factory.mktemp("replay") / "demo.csv"
+    make_session(path, seed=1)
+    return path
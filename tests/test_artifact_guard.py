@@ -0,0 +1,99 @@
+"""Tests for artifact rejection ahead of SSVEP scoring."""
+
+import numpy as np
+import pytest
+
+from neurorelay.signal.artifact_guard import REASONS, ArtifactGuard
+from neurorelay.signal.ssvep_detector import SSVEPConfig, SSVEPDetector
+
+SR = 250.0
+
+
+def _ssvep(freq, n_samples, rng, amplitude=5.0, noise=2.0):
+    t = np.arange(n_samples) / SR
+    s = amplitude * np.sin(2 * np.pi * freq * t)
+    return np.outer(s, [1.0, 1.2, 0.9]) + noise * rng.standard_normal((n_samples, 3))
+
+
+def test_evaluate_reason_codes():
+    guard = ArtifactGuard(max_abs=100.0, max_std=50.0, min_std=0.1)
+    rng = np.random.default_rng(0)
+    clean = 5.0 * rng.standard_normal((500, 3))
+    blink = clean.copy()
+    blink[200:210, 0] += 300.0
+    noisy = clean.copy()
+    noisy[:, 1] = 60.0 * np.sign(np.sin(np.arange(500) / 3.0))  # high variance, bounded peak
+    flat = clean.copy()
+    flat[:, 2] = 0.0
+
+    codes = guard.evaluate(np.stack([clean, blink, noisy, flat]))
+    assert [REASONS[c] for c in codes] == ["", "amplitude", "variance", "flatline"]
+    assert guard.check(clean) is None
+    assert guard.check(blink) == "amplitude"
+
+
+def test_incremental_status_matches_window_check():
+    """Tracking a sliding window chunk by chunk should agree with checking it whole."""
+    rng = np.random.default_rng(1)
+    data = 5.0 * rng.standard_normal((3000, 3))
+    data[1200:1220, 1] += 250.0
+    guard = ArtifactGuard(max_abs=100.0, max_std=50.0, min_std=0.1)
+    window = 500
+
+    for end in range(25, data.shape[0] + 1, 25):
+        start = max(0, end - window)
+        leaving = data[max(0, end - 25 - window):start]
+        guard.update(data[end - 25:end], leaving)
+        assert guard.count == end - start
+        assert guard.status() == guard.check(data[start:end])
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_detector_skips_rejected_windows(streaming):
+    rng = np.random.default_rng(2)
+    config = SSVEPConfig(
+        frequencies=[8.57, 10.0, 12.0, 15.0],
+        sample_rate=SR,
+        window_seconds=2.0,
+        streaming=streaming,
+        artifact_guard=True
+    )
+    detector = SSVEPDetector(config)
+    clean = _ssvep(12.0, 1000, rng)
+    blink = clean.copy()
+    blink[600:620] += 400.0
+
+    if streaming:
+        detect = detector.detect_streaming
+        for chunk in np.array_split(clean[:500], 4):
+            freq, _, scores = detect(chunk)
+        assert freq == 12.0 and detector.last_rejection is None
+        freq, confidence, scores = detect(blink[500:625])
+        assert (freq, confidence, scores) == (0.0, 0.0, {})
+        assert detector.last_rejection == "amplitude"
+        # Rejected until the blink has left the 2 s window
+        freq, _, scores = detect(blink[625:875])
+        assert scores == {} and detector.last_rejection == "amplitude"
+        for chunk in np.array_split(_ssvep(12.0, 500, rng), 4):
+            freq, _, scores = detect(chunk)
+        assert freq == 12.0 and detector.last_rejection is None
+    else:
+        freq, confidence, scores = detector.detect(blink[500:])
+        assert (freq, confidence, scores) == (0.0, 0.0, {})
+        assert detector.last_rejection == "amplitude"
+        freq, _, scores = detector.detect(clean[500:])
+        assert freq == 12.0 and detector.last_rejection is None
+
+
+def test_detect_batch_marks_rejected_windows():
+    rng = np.random.default_rng(3)
+    config = SSVEPConfig(frequencies=[8.57, 10.0, 12.0, 15.0], sample_rate=SR,
+                         window_seconds=2.0, artifact_guard=True)
+    detector = SSVEPDetector(config)
+    windows = np.stack([_ssvep(f, 500, rng) for f in (10.0, 12.0, 15.0)])
+    windows[1, 100:110] += 400.0
+
+    predicted, confidence, scores = detector.detect_batch(windows)
+    assert predicted.tolist() == [1, -1, 3]
+    assert confidence[1] == 0.0
+    assert np.all(scores[1] == 0.0)
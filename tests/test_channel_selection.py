@@ -79,6 +79,11 @@ def test_live_bridge_integration():
         
         print("✓ LivePredictor correctly configured with channel selection")
         
+        # The detector process needs a shared-memory ring, on a copy of the caller's config
+        worker_predictor = LivePredictor(lsl_config, ssvep_config, worker_process=True)
+        assert worker_predictor.lsl_source.config.shared_memory is True
+        assert lsl_config.shared_memory is False
+        
         # Note: We can't test the actual _predict method without a real LSL stream,
         # but we can verify the configuration is set up correctly for channel selection
         
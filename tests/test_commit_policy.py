@@ -0,0 +1,66 @@
+"""Tests for the shared stability/margin/tau/dwell commit rule."""
+
+from neurorelay.signal.commit_policy import CommitPolicy, CommitPolicyConfig
+
+FREQS = [8.57, 10.0, 12.0, 15.0]
+
+
+def _scores(target):
+    return {f: (1.0 if i == target else 0.1) for i, f in enumerate(FREQS)}
+
+
+def _run(policy, scores, times, active=True):
+    for now in times:
+        decision = policy.update(scores, now, active=active)
+        if decision is not None:
+            return now, decision
+    return None, None
+
+
+def test_commits_after_stability_and_dwell():
+    policy = CommitPolicy(FREQS, CommitPolicyConfig(tau=0.65, dwell_sec=1.0))
+    times = [0.25 * k for k in range(20)]
+    now, decision = _run(policy, _scores(2), times)
+    # Stable from the 3rd prediction (t=0.5), then 1 s of dwell
+    assert now == 1.5 and decision[0] == 2 and decision[1] >= 0.65
+    assert policy.dwell_idx == 2 and policy.dwell_progress(1.0) == 0.5
+
+    policy.commit(now)
+    assert policy.dwell_start is None and policy.stable_count == 0
+    # Cooldown, then stability and dwell have to build up again
+    assert _run(policy, _scores(2), [1.75, 2.0, 2.25])[0] is None
+    assert _run(policy, _scores(2), [2.5 + 0.25 * k for k in range(10)])[0] == 3.25
+
+
+def test_stability_is_held_for_stable_sec_at_any_step():
+    assert CommitPolicyConfig().stable_predictions == 3
+    config = CommitPolicyConfig(dwell_sec=1.0, step_sec=0.5)
+    assert config.stable_predictions == 2
+    now, decision = _run(CommitPolicy(FREQS, config), _scores(1), [0.5 * k for k in range(10)])
+    # Stable from the 2nd prediction (t=0.5, ~0.75 s rounded up to whole steps), then 1 s of dwell
+    assert now == 1.5 and decision[0] == 1
+
+
+def test_inactive_weak_or_rejected_never_commits():
+    times = [0.25 * k for k in range(40)]
+    policy = CommitPolicy(FREQS)
+    assert _run(policy, _scores(1), times, active=False) == (None, None)
+    assert policy.confidences[1] > 0.65 and policy.top_idx == 1
+
+    # Two close contenders: confidence below tau
+    contested = {**_scores(1), FREQS[2]: 0.9}
+    assert _run(CommitPolicy(FREQS), contested, times) == (None, None)
+
+    policy = CommitPolicy(FREQS, CommitPolicyConfig(dwell_sec=1.0))
+    for now in times[:5]:
+        policy.update(_scores(3), now)
+    policy.reject()
+    assert policy.confidences == [0.0] * 4 and policy.dwell_start is None
+    assert policy.update(_scores(3), times[5]) is None
+
+
+def test_dynamic_stopping_commits_early():
+    times = [0.25 * k for k in range(20)]
+    plain, _ = _run(CommitPolicy(FREQS), _scores(0), times)
+    early, decision = _run(CommitPolicy(FREQS, CommitPolicyConfig(dynamic_stopping=True)), _scores(0), times)
+    assert decision[0] == 0 and early < plain
@@ -0,0 +1,50 @@
+"""Tests for block-wise CSV parsing in stream.source_replay."""
+
+import numpy as np
+import pytest
+
+from neurorelay.stream.source_replay import ReplayConfig, load_csv, read_csv_blocks, replay_chunks
+
+
+def _write_csv(path, n=1000):
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(n, 5))
+    labels = np.array(["SUMMARIZE", "", "EMAIL", "TODOS", "REST"])[np.arange(n) // 100 % 5]
+    with path.open("w") as f:
+        f.write("t,Fz,O1,Oz,O2,Pz,label\n")
+        for i in range(n):
+            if i == 500:
+                f.write("\n")  # stray blank line mid-file
+            f.write(f"{i / 250.0:.6f}," + ",".join(f"{v:.6f}" for v in data[i]) + f",{labels[i]}\n")
+    expected = np.select([labels == "SUMMARIZE", labels == "TODOS", labels == "EMAIL"], [0, 1, 3], -1)
+    return np.round(data, 6), expected
+
+
+def test_load_csv_reads_any_channels_and_maps_labels(tmp_path):
+    path = tmp_path / "session.csv"
+    data, labels = _write_csv(path)
+
+    arr, header = load_csv(path)
+    assert header == ["t", "Fz", "O1", "Oz", "O2", "Pz", "label"]
+    assert arr.shape == (1000, 7)
+    np.testing.assert_allclose(arr[:, 0], np.arange(1000) / 250.0, atol=1e-6)
+    np.testing.assert_allclose(arr[:, 1:-1], data)
+    np.testing.assert_array_equal(arr[:, -1], labels)
+
+    arr, _ = load_csv(path, channels=["Oz", "O1"])
+    np.testing.assert_allclose(arr[:, 1:3], data[:, [2, 1]])
+    with pytest.raises(ValueError):
+        load_csv(path, channels=["Cz"])
+
+
+def test_blocks_and_replay_chunks_cover_the_file_in_order(tmp_path):
+    path = tmp_path / "session.csv"
+    data, _ = _write_csv(path)
+
+    blocks = list(read_csv_blocks(path, ["O2"], block_rows=128))
+    assert np.concatenate([b[1] for b in blocks]).shape == (1000, 1)
+
+    cfg = ReplayConfig(sample_rate_hz=250.0, chunk_sec=0.3, realtime=False, channels=["Fz", "Pz"])
+    chunks = list(replay_chunks(path, cfg))
+    assert [c.shape[0] for c in chunks] == [75] * 13 + [25]  # blank line does not shorten a chunk
+    np.testing.assert_allclose(np.concatenate(chunks), data[:, [0, 4]])
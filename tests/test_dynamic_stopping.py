@@ -0,0 +1,71 @@
+"""Tests for the dynamic stopping decision rule."""
+
+import numpy as np
+from neurorelay.signal.dynamic_stopping import DynamicStopping, DynamicStoppingConfig
+
+
+def _updates_to_decision(stopper, rng, target, snr, limit=50):
+    stopper.reset()
+    for n in range(1, limit + 1):
+        scores = 0.5 * rng.standard_normal(4)
+        scores[target] += snr
+        stopper.update(scores)
+        if stopper.decision is not None:
+            return n, stopper.decision
+    return limit, None
+
+
+def test_clear_signal_stops_early_and_correctly():
+    rng = np.random.default_rng(0)
+    stopper = DynamicStopping(4)
+    results = [_updates_to_decision(stopper, rng, target=2, snr=1.0) for _ in range(100)]
+    assert all(decision == 2 for _, decision in results)
+    assert np.mean([n for n, _ in results]) < 10
+
+    # Weaker evidence takes longer
+    weak = [_updates_to_decision(stopper, rng, target=2, snr=0.5)[0] for _ in range(100)]
+    assert np.mean(weak) > np.mean([n for n, _ in results])
+
+
+def test_noise_rarely_commits():
+    rng = np.random.default_rng(1)
+    stopper = DynamicStopping(4, DynamicStoppingConfig(error_rate=0.05))
+    commits = 0
+    for _ in range(2000):
+        stopper.update(rng.standard_normal(4))
+        if stopper.decision is not None:
+            commits += 1
+            stopper.reset()
+    assert commits / 2000 < 0.01
+
+
+def test_min_updates_and_flat_scores():
+    stopper = DynamicStopping(4, DynamicStoppingConfig(error_rate=0.3, min_updates=3))
+    for _ in range(2):
+        stopper.update([0.1, 0.9, 0.1, 0.1])
+    assert stopper.decision is None
+    stopper.update([0.1, 0.9, 0.1, 0.1])
+    assert stopper.decision == 1
+
+    stopper.reset()
+    stopper.update([0.3, 0.3, 0.3, 0.3])
+    np.testing.assert_allclose(stopper.posterior, 0.25)
+
+
+def test_repeated_near_tie_never_commits():
+    # Overlapping windows repeat almost the same scores: z-scores alone would
+    # turn a 0.001 lead into a confident decision within a few updates
+    stopper = DynamicStopping(4, DynamicStoppingConfig(error_rate=0.05))
+    for _ in range(100):
+        stopper.update([0.301, 0.300, 0.300, 0.300])
+        assert stopper.decision is None
+    assert np.max(stopper.posterior) < 0.5
+
+    # Correlated drift around a common level (AR(1) per target)
+    rng = np.random.default_rng(2)
+    stopper.reset()
+    level = np.zeros(4)
+    for _ in range(2000):
+        level = 0.95 * level + 0.002 * rng.standard_normal(4)
+        stopper.update(0.3 + level)
+        assert stopper.decision is None
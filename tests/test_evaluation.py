@@ -0,0 +1,72 @@
+"""Tests for the closed-loop offline evaluation harness."""
+
+import math
+
+import numpy as np
+import pytest
+
+from neurorelay.scripts.synthetic_ssvep import make_session
+from neurorelay.signal.evaluation import (
+    EvaluationConfig, evaluate_session, evaluate_sessions, itr_bits_per_min, load_session, summarize,
+)
+from neurorelay.stream.session_file import csv_to_session
+
+
+@pytest.fixture(scope="module")
+def sessions(tmp_path_factory):
+    root = tmp_path_factory.mktemp("sessions")
+    paths = []
+    for seed in range(3):
+        path = root / f"s{seed}.csv"
+        make_session(path, seed=seed, noise_sigma=0.6)
+        paths.append(path)
+    paths[2] = csv_to_session(paths[2], root / "s2.nrs")
+    return paths
+
+
+def test_itr_matches_wolpaw():
+    assert itr_bits_per_min(4, 1.0, 2.0) == pytest.approx(60.0)  # 2 bits every 2 s
+    p = 0.9
+    bits = 2 + p * math.log2(p) + (1 - p) * math.log2((1 - p) / 3)
+    assert itr_bits_per_min(4, p, 3.0) == pytest.approx(bits * 20)
+    assert itr_bits_per_min(4, 0.25, 1.0) == 0.0 and itr_bits_per_min(4, 1.0, 0.0) == 0.0
+
+
+def test_session_selects_every_trial(sessions):
+    result = evaluate_session(sessions[0])
+    assert result.trials == 8 and result.selections == 8
+    assert result.accuracy == 1.0 and result.false_commits == 0
+    # Window fill, stability and dwell come before the first commit of a trial
+    assert all(2.5 < t < 6.0 for t in result.selection_times)
+    assert result.itr_bits_per_min > 15 and result.speedup > 10
+    assert result.predictions == (10000 - 750) // round(0.25 * 250) + 1  # same step rounding as LivePredictor
+
+
+def test_wrong_labels_are_scored(sessions, tmp_path):
+    data, labels, _, _ = load_session(sessions[0])
+    # Shift every target label by one class: every selection becomes an error
+    shifted = np.where(labels >= 0, (labels + 1) % 4, -1)
+    names = ["SUMMARIZE", "TODOS", "DEADLINES", "EMAIL"]
+    path = tmp_path / "shifted.csv"
+    with path.open("w") as f:
+        f.write("t,O1,Oz,O2,label\n")
+        for i in range(data.shape[0]):
+            label = names[shifted[i]] if shifted[i] >= 0 else ""
+            f.write(f"{i / 250.0:.6f},{data[i, 0]:.6f},{data[i, 1]:.6f},{data[i, 2]:.6f},{label}\n")
+    result = evaluate_session(path)
+    assert result.selections == 8 and result.correct == 0 and result.itr_bits_per_min == 0.0
+
+
+def test_streaming_decoder_and_pool_match_serial(sessions):
+    config = EvaluationConfig(streaming=True)
+    serial = evaluate_sessions(sessions, config, workers=1)
+    pooled = evaluate_sessions(sessions, config, workers=2)
+    assert [r.path for r in pooled] == [str(p) for p in sessions]
+    for a, b in zip(serial, pooled):
+        assert (a.selections, a.correct, a.false_commits) == (b.selections, b.correct, b.false_commits)
+        assert a.selection_times == b.selection_times
+
+    summary = summarize(serial)
+    assert summary["sessions"] == 3 and summary["trials"] == 24
+    assert summary["accuracy"] == 1.0 and summary["false_commits"] == 0
+    assert summary["duration_sec"] == pytest.approx(120.0)
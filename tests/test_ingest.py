@@ -0,0 +1,34 @@
+"""Tests for the LSL ingest stage (channel projection and decimation)."""
+
+import numpy as np
+from scipy.signal import welch
+from neurorelay.stream.ingest import StreamDecimator, resolve_channels
+
+
+def test_resolve_channels():
+    available = ["Fz", "O1", "Oz", "O2"]
+    assert resolve_channels(available, ["o2", "O1", "P7"]) == [3, 1]
+    assert resolve_channels(available, None) == [0, 1, 2, 3]
+    assert resolve_channels(available, ["P7"]) == [0, 1, 2, 3]
+
+
+def test_decimator_is_chunk_invariant_and_anti_aliased():
+    sr = 1000.0
+    t = np.arange(8000) / sr
+    x = np.column_stack([np.sin(2 * np.pi * 12.0 * t), np.sin(2 * np.pi * 180.0 * t)]).astype(np.float32)
+
+    whole, ts_whole = StreamDecimator(4, 2, sr).process(x, t)
+    dec = StreamDecimator(4, 2, sr)
+    parts = [dec.process(x[a:b], t[a:b]) for a, b in zip([0, 3, 10, 517, 2001], [3, 10, 517, 2001, 8000])]
+    np.testing.assert_allclose(np.concatenate([p[0] for p in parts]), whole, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(np.concatenate([p[1] for p in parts]), ts_whole)
+
+    assert whole.shape == (2000, 2) and dec.output_rate == 250.0
+    settled = whole[100:]
+    freqs, psd = welch(settled[:, 0], fs=250.0, nperseg=500)
+    assert abs(freqs[np.argmax(psd)] - 12.0) < 0.5
+    # 180 Hz would alias to 70 Hz without the low-pass
+    assert np.std(settled[:, 1]) < 0.01
+    # Timestamps are shifted back by the filter's group delay
+    np.testing.assert_allclose(ts_whole[1] - ts_whole[0], 0.004)
+    assert ts_whole[0] == -dec.delay
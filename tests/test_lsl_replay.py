@@ -0,0 +1,67 @@
+"""Tests for drift-free replay pacing and the LSL replay publisher."""
+
+import time
+import uuid
+
+import numpy as np
+import pytest
+
+from neurorelay.stream.source_replay import Pacer, ReplayConfig, replay_chunks
+
+
+def test_consumer_time_does_not_accumulate_as_drift(tmp_path):
+    path = tmp_path / "s.csv"
+    with path.open("w") as f:
+        f.write("t,O1,Oz,O2,label\n")
+        f.writelines(f"{i / 250.0:.6f},0,0,0,\n" for i in range(250))
+    cfg = ReplayConfig(sample_rate_hz=250.0, chunk_sec=0.04, realtime=True, speed=0.4)
+    start = time.monotonic()
+    released = []
+    for _ in replay_chunks(path, cfg):
+        released.append(time.monotonic() - start)
+        time.sleep(0.06)  # slow consumer: most of each 0.1 s period
+    # Chunk k is released at k * 0.1 s, not k * (0.1 + 0.06) s
+    np.testing.assert_allclose(released, np.arange(25) * 0.1, atol=0.03)
+
+
+def test_pacer_reports_lateness():
+    pacer = Pacer()
+    assert pacer.wait_until(0.0) == 0.0
+    time.sleep(0.05)
+    assert pacer.wait_until(0.01) >= 0.03
+
+
+def test_publisher_streams_recording_with_exact_spacing():
+    pytest.importorskip("pylsl")
+    from neurorelay.stream.lsl_replay import PublisherConfig, ReplayPublisher
+    from neurorelay.stream.lsl_source import LSLConfig, LSLSource
+
+    stream_type = f"EEGTEST-{uuid.uuid4().hex[:8]}"
+    data = np.arange(500 * 2, dtype=np.float32).reshape(500, 2)
+    publisher = ReplayPublisher(data, 500.0, ["O1", "O2"],
+                                PublisherConfig(stream_type=stream_type, source_id=stream_type,
+                                                chunk_sec=0.02, speed=2.0))
+    source = LSLSource(LSLConfig(stream_type=stream_type, timeout=2.0, buffer_seconds=2.0))
+    assert source.connect() and source.channel_names == ["O1", "O2"]
+    assert source.start()
+    try:
+        time.sleep(0.3)
+        start = time.monotonic()
+        assert publisher.run() == 500
+        assert abs(time.monotonic() - start - 0.5) < 0.1  # 1 s of data at 2x
+        deadline = time.time() + 2.0
+        while time.time() < deadline and source.samples_received < 500:
+            time.sleep(0.02)
+        window, stamps, _ = source.get_latest_data(1.0)
+        np.testing.assert_array_equal(window, data)
+        np.testing.assert_allclose(np.diff(stamps), 1 / 500.0, atol=1e-6)
+    finally:
+        source.close()
+
+
+def test_publisher_rejects_empty_recording():
+    pytest.importorskip("pylsl")
+    from neurorelay.stream.lsl_replay import ReplayPublisher
+
+    with pytest.raises(ValueError, match="no samples"):
+        ReplayPublisher(np.empty((0, 2), dtype=np.float32), 250.0, ["O1", "O2"])
@@ -0,0 +1,130 @@
+"""Loopback tests for LSLSource acquisition against a local LSL outlet."""
+
+import time
+import uuid
+
+import numpy as np
+import pytest
+
+from neurorelay.stream.lsl_source import LSLConfig, LSLSource
+from neurorelay.stream.realtime import RealtimeConfig
+
+lsl = pytest.importorskip("pylsl")
+
+
+@pytest.mark.parametrize("channel_format, dtype", [("float32", np.float32), ("double64", np.float64)])
+def test_acquisition_fills_ring_buffer(channel_format, dtype):
+    """float32 streams are pulled in place; other formats go through conversion."""
+    stream_type = f"EEGTEST-{uuid.uuid4().hex[:8]}"
+    info = lsl.StreamInfo("loopback", stream_type, 4, 500, channel_format, stream_type)
+    outlet = lsl.StreamOutlet(info)
+    source = LSLSource(LSLConfig(stream_type=stream_type, timeout=2.0, buffer_seconds=2.0, max_chunk_size=64,
+                                 realtime=RealtimeConfig(gc="disable", gc_interval=0.1)))
+    assert source.connect()
+    assert source.start()
+    try:
+        time.sleep(0.5)
+        data = np.arange(1200 * 4, dtype=dtype).reshape(1200, 4)
+        stamps = 1000.0 + np.arange(1200) / 500.0
+        for start in range(0, 1200, 100):
+            outlet.push_chunk(data[start:start + 100], stamps[start:start + 100])
+            time.sleep(0.01)
+
+        deadline = time.time() + 3.0
+        while time.time() < deadline:
+            _, timestamps, _ = source.get_latest_data(1.0)
+            if timestamps is not None and timestamps[-1] >= stamps[-1] - 1e-6:
+                break
+            time.sleep(0.05)
+
+        window, timestamps, meta = source.get_latest_data(1.0)
+        assert meta["n_samples"] == 500
+        np.testing.assert_array_equal(window, data[-500:].astype(np.float32))
+        # Timestamps come back clock-corrected; spacing is preserved
+        np.testing.assert_allclose(np.diff(timestamps), 1 / 500.0, atol=1e-6)
+
+        telemetry = source.get_info()["telemetry"]
+        assert telemetry["samples"] == 1200 and telemetry["sample_gaps"] == 0
+        assert telemetry["chunk_size"]["max"] <= 64
+        assert source.get_info()["realtime"]["gc"]["applied"]
+    finally:
+        source.stop()
+
+
+def test_ingest_projects_channels_and_decimates():
+    """A 1 kHz, 8-channel stream should be stored as 3 channels at 250 Hz."""
+    stream_type = f"EEGTEST-{uuid.uuid4().hex[:8]}"
+    info = lsl.StreamInfo("highdensity", stream_type, 8, 1000, "float32", stream_type)
+    names = ["Fz", "Cz", "Pz", "O1", "Oz", "O2", "P3", "P4"]
+    chans = info.desc().append_child("channels")
+    for name in names:
+        chans.append_child("channel").append_child_value("label", name)
+    outlet = lsl.StreamOutlet(info)
+    source = LSLSource(LSLConfig(stream_type=stream_type, timeout=2.0, buffer_seconds=4.0,
+                                 channels=["O2", "Oz", "O1"], target_sample_rate=250.0))
+    assert source.connect()
+    assert source.channel_names == ["O2", "Oz", "O1"]
+    assert source.sample_rate == 250.0 and source.get_info()["decimation"] == 4
+    assert source.start()
+    try:
+        time.sleep(0.5)
+        t = np.arange(3000) / 1000.0
+        data = np.zeros((3000, 8), dtype=np.float32)
+        data[:, 3] = np.sin(2 * np.pi * 12.0 * t)  # O1: in band
+        data[:, 5] = np.sin(2 * np.pi * 180.0 * t)  # O2: would alias to 70 Hz
+        for start in range(0, 3000, 200):
+            outlet.push_chunk(data[start:start + 200], 1000.0 + t[start:start + 200])
+            time.sleep(0.01)
+
+        deadline = time.time() + 3.0
+        while time.time() < deadline and source.samples_received < 740:
+            time.sleep(0.05)
+        window, timestamps, _ = source.get_latest_data(2.0)
+        assert window.shape == (500, 3)
+        np.testing.assert_allclose(np.diff(timestamps), 1 / 250.0, atol=1e-6)
+        assert np.std(window[:, 0]) < 0.01  # O2: anti-aliased away
+        assert np.std(window[:, 1]) == 0.0  # Oz: silent
+        assert abs(np.std(window[:, 2]) - np.sqrt(0.5)) < 0.02  # O1: 12 Hz passes
+    finally:
+        source.close()
+
+
+def test_reconnects_to_restarted_outlet_and_marks_gap():
+    stream_type = f"EEGTEST-{uuid.uuid4().hex[:8]}"
+    source_id = f"amp-{stream_type}"
+
+    def make_outlet():
+        return lsl.StreamOutlet(lsl.StreamInfo("amp", stream_type, 2, 250, "float32", source_id))
+
+    outlet = make_outlet()
+    source = LSLSource(LSLConfig(stream_type=stream_type, timeout=2.0, buffer_seconds=4.0,
+                                 reconnect_min_delay=0.05, stall_timeout=1.0))
+    assert source.connect()
+    assert source.get_info()["source_id"] == source_id
+    assert source.start()
+    try:
+        time.sleep(0.3)
+        outlet.push_chunk(np.ones((100, 2), dtype=np.float32), 100.0 + np.arange(100) / 250.0)
+        deadline = time.time() + 3.0
+        while time.time() < deadline and source.samples_received < 100:
+            time.sleep(0.02)
+        del outlet  # amplifier drops off the network
+
+        time.sleep(0.3)
+        outlet = make_outlet()
+        deadline = time.time() + 5.0
+        while time.time() < deadline and source.reconnects == 0:
+            outlet.push_chunk(np.full((10, 2), 2.0, dtype=np.float32))
+            time.sleep(0.05)
+        assert source.reconnects == 1 and source.state == "streaming"
+        assert source.gaps[0][0] == 100 and source.gaps[0][1] > 0.2
+
+        outlet.push_chunk(np.full((50, 2), 2.0, dtype=np.float32))
+        deadline = time.time() + 3.0
+        while time.time() < deadline and source.samples_received < 150:
+            time.sleep(0.02)
+        window, _, _ = source.get_latest_data(4.0)
+        np.testing.assert_array_equal(window[:100], 1.0)  # buffer kept across the reconnect
+        assert (window[100:] == 2.0).all() and window.shape[0] >= 150
+    finally:
+        source.close()
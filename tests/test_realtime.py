@@ -0,0 +1,56 @@
+"""Tests for the opt-in real-time thread settings."""
+
+import gc
+import os
+import threading
+
+import pytest
+
+from neurorelay.stream.realtime import RealtimeConfig, RealtimeScope
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="CPU affinity is Linux-only")
+def test_affinity_applies_to_the_calling_thread_only():
+    cpu = min(os.sched_getaffinity(0))
+    before = os.sched_getaffinity(0)
+    seen = {}
+
+    def hot_loop():
+        scope = RealtimeScope(RealtimeConfig(cpus=[cpu]))
+        seen["report"] = scope.enter()
+        seen["inside"] = os.sched_getaffinity(0)
+        scope.exit()
+        seen["after"] = os.sched_getaffinity(0)
+
+    thread = threading.Thread(target=hot_loop)
+    thread.start()
+    thread.join()
+    assert seen["report"]["affinity"]["applied"] and seen["inside"] == {cpu}
+    assert seen["after"] == before and os.sched_getaffinity(0) == before
+
+
+def test_every_requested_setting_is_reported():
+    scope = RealtimeScope(RealtimeConfig(rt_priority=5, nice=0, gc="bogus"))
+    report = scope.enter()
+    try:
+        # Priority may or may not be permitted here, but the outcome is always stated
+        assert set(report) <= {"scheduler", "nice", "gc"} and "scheduler" in report
+        assert all(isinstance(r["applied"], bool) and r["detail"] for r in report.values())
+        assert report["gc"]["applied"] is False
+        if not report["scheduler"]["applied"]:
+            assert "nice" in report  # falls back to niceness
+    finally:
+        scope.exit()
+
+
+def test_gc_disabled_until_last_scope_exits():
+    assert gc.isenabled()
+    first = RealtimeScope(RealtimeConfig(gc="disable", gc_interval=0.0))
+    second = RealtimeScope(RealtimeConfig(gc="freeze"))
+    assert first.enter()["gc"]["applied"] and second.enter()["gc"]["applied"]
+    assert not gc.isenabled() and gc.get_freeze_count() > 0
+    first.safe_point()  # collects young generations while automatic GC is off
+    first.exit()
+    assert not gc.isenabled()
+    second.exit()
+    assert gc.isenabled() and gc.get_freeze_count() == 0
@@ -1,23 +1,61 @@
 import numpy as np
-from pathlib import Path
 from neurorelay.stream.source_replay import ReplayConfig, replay_chunks
 
 
-def test_replay_yields_chunks():
+def test_replay_yields_chunks(demo_csv):
     """Test that replay_chunks yields numpy arrays with expected shape."""
     cfg = ReplayConfig(sample_rate_hz=250.0, chunk_sec=0.2, realtime=False)
-    chunks = list(replay_chunks(Path("data/demo.csv"), cfg))
+    chunks = list(replay_chunks(demo_csv, cfg))
     assert len(chunks) > 0
     assert all(isinstance(c, np.ndarray) and c.shape[1] == 3 for c in chunks)
 
 
-def test_replay_config_realtime_false():
+def test_replay_config_realtime_false(demo_csv):
     """Test that realtime=False doesn't sleep between chunks."""
     import time
     cfg = ReplayConfig(sample_rate_hz=250.0, chunk_sec=1.0, realtime=False)
     start = time.time()
-    chunks = list(replay_chunks(Path("data/demo.csv"), cfg))
+    chunks = list(replay_chunks(demo_csv, cfg))
     elapsed = time.time() - start
     # Should complete much faster than real-time when realtime=False
     expected_realtime = len(chunks) * cfg.chunk_sec
-    assert elapsed < expected_realtime * 0.1  # Should be <10% of real-time
\ No newline at end of file
+    assert elapsed < expected_realtime * 0.1  # Should be <10% of real-time
+
+def test_replay_with_labels_carries_ground_truth(demo_csv):
+    """Structured chunks carry t and label indices aligned with the data."""
+    from neurorelay.stream.source_replay import ReplayChunk, SegmentIndex, load_csv
+
+    arr, _ = load_csv(demo_csv)
+    # 75-sample chunks do not divide the parse block, so chunks straddle blocks
+    cfg = ReplayConfig(sample_rate_hz=250.0, chunk_sec=0.3, realtime=False, with_labels=True)
+    index = SegmentIndex()
+    chunks = []
+    for chunk in replay_chunks(demo_csv, cfg):
+        assert isinstance(chunk, ReplayChunk)
+        index.extend(chunk.labels)
+        chunks.append(chunk)
+    assert [c.start for c in chunks] == list(range(0, arr.shape[0], 75))
+    np.testing.assert_array_equal(np.concatenate([c.data for c in chunks]), arr[:, 1:4])
+    np.testing.assert_array_equal(np.concatenate([c.t for c in chunks]), arr[:, 0])
+    np.testing.assert_array_equal(np.concatenate([c.labels for c in chunks]), arr[:, -1])
+
+    # Built chunk by chunk == built from the whole label column
+    full = SegmentIndex.from_labels(arr[:, -1].astype(int))
+    np.testing.assert_array_equal(index.starts, full.starts)
+    np.testing.assert_array_equal(index.labels, full.labels)
+    assert index.n_samples == arr.shape[0] and len(index) == len(full)
+
+
+def test_segment_index_runs_and_lookup():
+    from neurorelay.stream.source_replay import SegmentIndex
+
+    labels = np.array([-1, -1, 2, 2, 2, 2, -1, 0, 0, 0])
+    index = SegmentIndex()
+    for part in (labels[:3], labels[3:4], labels[4:8], labels[8:]):
+        index.extend(part)
+    np.testing.assert_array_equal(index.starts, [0, 2, 6, 7])
+    np.testing.assert_array_equal(index.stops, [2, 6, 7, 10])
+    np.testing.assert_array_equal(index.labels, [-1, 2, -1, 0])
+    assert index.trials() == [(2, 6, 2), (7, 10, 0)]
+    assert [index.segment_at(i) for i in (0, 2, 5, 6, 9)] == [0, 1, 1, 2, 3]
+    assert index.dominant(0, 5) == 1 and index.dominant(5, 10) == 3 and index.dominant(6, 7) == 2
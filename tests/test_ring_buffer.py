@@ -0,0 +1,171 @@
+"""Tests for the LSL ring buffer."""
+
+import numpy as np
+import pytest
+from neurorelay.stream.lsl_source import RingBuffer
+
+
+def _feed(buf, n_total, chunk, n_channels=3):
+    data = np.arange(n_total * n_channels, dtype=np.float32).reshape(n_total, n_channels)
+    ts = np.arange(n_total, dtype=np.float64)
+    for start in range(0, n_total, chunk):
+        buf.append(data[start:start + chunk], ts[start:start + chunk])
+    return data, ts
+
+
+@pytest.mark.parametrize("mirrored", [False, True])
+@pytest.mark.parametrize("chunk", [1, 7, 64, 250])
+def test_latest_reads_across_wraps(mirrored, chunk):
+    buf = RingBuffer(100, 3, mirrored=mirrored)
+    data, ts = _feed(buf, 537, chunk)
+
+    latest, latest_ts = buf.get_latest(40)
+    np.testing.assert_array_equal(latest, data[-40:])
+    np.testing.assert_array_equal(latest_ts, ts[-40:])
+
+    # More than stored returns what is held
+    assert buf.get_latest(500)[0].shape == (100, 3)
+
+    out = np.full((120, 3), -1.0, dtype=np.float32)
+    ts_out = np.zeros(120)
+    assert buf.read_into(out, ts_out) == 100
+    np.testing.assert_array_equal(out[20:], data[-100:])
+    np.testing.assert_array_equal(ts_out[20:], ts[-100:])
+    assert np.all(out[:20] == -1.0)
+
+
+def test_mirrored_view_is_contiguous_and_read_only():
+    buf = RingBuffer(100, 3, mirrored=True)
+    data, _ = _feed(buf, 173, 17)
+
+    view, ts_view = buf.view_latest(90)
+    np.testing.assert_array_equal(view, data[-90:])
+    assert view.base is not None and view.flags.c_contiguous
+    assert not view.flags.writeable and not ts_view.flags.writeable
+    assert np.shares_memory(view, buf.buffer)
+
+    with pytest.raises(ValueError):
+        RingBuffer(100, 3).view_latest(10)
+
+
+@pytest.mark.parametrize("mirrored", [False, True])
+def test_reserve_commit_writes_in_place(mirrored):
+    buf = RingBuffer(100, 3, mirrored=mirrored)
+    data, ts = _feed(buf, 90, 30)
+
+    dest = buf.reserve(25)
+    assert dest.shape == (10, 3)  # never wraps
+    assert buf.get_latest(100)[0].shape[0] == 90
+    dest[:] = 1.0
+    buf.commit(10, np.full(10, 90.0))
+
+    dest = buf.reserve(25)
+    assert dest.shape == (25, 3)
+    assert np.shares_memory(dest, buf.buffer)
+    # Rows being written are hidden from readers
+    assert buf.get_latest(100)[0].shape[0] == 75
+    dest[:5] = 2.0
+    buf.commit(5, np.full(5, 91.0))
+
+    latest, latest_ts = buf.get_latest(15)
+    np.testing.assert_array_equal(latest[:10], 1.0)
+    np.testing.assert_array_equal(latest[10:], 2.0)
+    np.testing.assert_array_equal(latest_ts[-5:], 91.0)
+    oldest = buf.get_latest(100)[0]
+    assert oldest.shape[0] == 80
+    np.testing.assert_array_equal(oldest[:5], data[25:30])
+
+
+def test_subscribe_fires_once_per_step_of_samples():
+    buf = RingBuffer(100, 3)
+    calls = []
+    token = buf.subscribe(calls.append, 10)
+    _feed(buf, 35, 4)
+    assert calls == [12, 20, 32]
+    # A chunk spanning several steps triggers a single call
+    buf.append(np.zeros((25, 3), dtype=np.float32), np.zeros(25))
+    assert calls == [12, 20, 32, 60]
+    buf.unsubscribe(token)
+    buf.append(np.zeros((20, 3), dtype=np.float32), np.zeros(20))
+    assert calls == [12, 20, 32, 60]
+
+
+def test_wait_for_samples_wakes_on_append():
+    import threading
+    import time
+
+    buf = RingBuffer(100, 3)
+    assert not buf.wait_for_samples(5, timeout=0.01)
+
+    def writer():
+        for _ in range(5):
+            time.sleep(0.01)
+            buf.append(np.zeros((2, 3), dtype=np.float32), np.zeros(2))
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    assert buf.wait_for_samples(8, timeout=2.0, since=0)
+    thread.join()
+    assert buf.total == 10
+    # Already satisfied targets return immediately
+    assert buf.wait_for_samples(4, timeout=0.0, since=6)
+
+
+@pytest.mark.parametrize("mirrored", [False, True])
+def test_readers_track_their_own_position(mirrored):
+    buf = RingBuffer(100, 3, mirrored=mirrored)
+    fast = buf.reader()
+    slow = buf.reader()
+    data = np.arange(300 * 3, dtype=np.float32).reshape(300, 3)
+    ts = np.arange(300, dtype=np.float64)
+
+    buf.append(data[:30], ts[:30])
+    chunk, chunk_ts, lost = fast.read()
+    np.testing.assert_array_equal(chunk, data[:30])
+    assert lost == 0 and fast.pending == 0
+    assert not chunk.flags.writeable
+
+    # Reads are capped and resume where they stopped, across the wrap
+    buf.append(data[30:95], ts[30:95])
+    buf.append(data[95:130], ts[95:130])
+    first, _, _ = fast.read(max_samples=50)
+    second, second_ts, _ = fast.read()
+    np.testing.assert_array_equal(np.concatenate([first, second]), data[30:130])
+    np.testing.assert_array_equal(second_ts, ts[80:130])
+
+    # The slow reader fell more than a buffer behind: oldest samples are gone
+    chunk, _, lost = slow.read()
+    assert lost == 30 and slow.overruns == 1 and slow.lost_samples == 30
+    np.testing.assert_array_equal(chunk, data[30:130])
+
+    late = buf.reader(from_oldest=True)
+    assert late.pending == 100
+    late.skip_to_latest()
+    assert late.read()[0].shape == (0, 3)
+
+
+@pytest.mark.parametrize("mirrored", [False, True])
+def test_time_range_and_epochs_follow_timestamps(mirrored):
+    buf = RingBuffer(100, 2, mirrored=mirrored)
+    data = np.arange(250 * 2, dtype=np.float32).reshape(250, 2)
+    ts = 10.0 + np.arange(250) * 0.01  # 100 Hz; samples 150..249 stay held, wrapped
+    for start in range(0, 250, 35):
+        buf.append(data[start:start + 35], ts[start:start + 35])
+
+    assert buf.index_at(ts[160]) == 160 and buf.index_at(ts[160], side="right") == 161
+    assert buf.index_at(0.0) == 150 and buf.index_at(99.0) == 250
+    chunk, chunk_ts = buf.read_range(ts[170] - 0.001, ts[200] - 0.001)
+    np.testing.assert_array_equal(chunk, data[170:200])
+    np.testing.assert_array_equal(chunk_ts, ts[170:200])
+
+    # Onsets between samples lock to the next sample; 2 pre-stimulus samples
+    onsets = np.array([ts[155] - 0.004, ts[190], ts[245], ts[151]])
+    out = np.empty((4, 10, 2), dtype=np.float32)
+    stamps = np.empty((4, 10))
+    epochs, valid = buf.epochs(onsets, 10, offset=-2, out=out, timestamps_out=stamps)
+    assert epochs is out
+    np.testing.assert_array_equal(valid, [True, True, False, False])  # runs past newest / before oldest
+    np.testing.assert_array_equal(epochs[0], data[153:163])
+    np.testing.assert_array_equal(epochs[1], data[188:198])
+    np.testing.assert_array_equal(stamps[1], ts[188:198])
+    assert np.isnan(epochs[2:]).all()
@@ -0,0 +1,61 @@
+"""Tests for the binary session format and memory-mapped replay."""
+
+import numpy as np
+import pytest
+
+from neurorelay.stream.session_file import SessionFile, SessionWriter, csv_to_session, is_session_file
+from neurorelay.stream.source_replay import ReplayConfig, load_csv, replay_chunks
+
+
+def test_csv_conversion_round_trips(demo_csv, tmp_path):
+    out = csv_to_session(demo_csv, tmp_path / "demo.nrs")
+    arr, _ = load_csv(demo_csv)
+    session = SessionFile(out)
+
+    assert is_session_file(out) and not is_session_file(demo_csv)
+    assert session.sample_rate == 250.0 and session.channels == ["O1", "Oz", "O2"]
+    assert session.label_map["EMAIL"] == 3 and len(session) == arr.shape[0]
+    np.testing.assert_array_equal(session.data, arr[:, 1:4].astype(np.float32))
+    np.testing.assert_array_equal(session.timestamps, arr[:, 0])
+    np.testing.assert_array_equal(session.labels, arr[:, -1])
+    assert out.stat().st_size < demo_csv.stat().st_size / 2
+
+
+def test_replay_chunks_are_views_of_the_mapped_file(tmp_path):
+    rng = np.random.default_rng(1)
+    data = rng.normal(size=(1000, 4)).astype(np.float32)
+    path = tmp_path / "s.nrs"
+    with SessionWriter(path, 250.0, ["O1", "Oz", "O2", "Pz"]) as writer:
+        for start in range(0, 1000, 300):
+            writer.write(data[start:start + 300], np.arange(start, min(start + 300, 1000)) / 250.0)
+
+    cfg = ReplayConfig(sample_rate_hz=250.0, chunk_sec=0.4, realtime=False, channels=["O1", "Oz", "O2", "Pz"])
+    chunks = list(replay_chunks(path, cfg))
+    assert [c.shape[0] for c in chunks] == [100] * 10
+    assert isinstance(chunks[0], np.memmap) and not chunks[0].flags.writeable
+    np.testing.assert_array_equal(np.concatenate(chunks), data)
+    assert (SessionFile(path).labels == -1).all()
+
+    labeled = list(replay_chunks(path, ReplayConfig(sample_rate_hz=250.0, chunk_sec=0.4, realtime=False,
+                                                    channels=["O1", "Oz", "O2", "Pz"], with_labels=True)))
+    assert [c.start for c in labeled] == list(range(0, 1000, 100))
+    assert isinstance(labeled[3].t, np.memmap) and labeled[3].t[0] == 300 / 250.0
+    assert (labeled[0].labels == -1).all() and len(SessionFile(path).segments()) == 1
+
+    # Default replay channels (O1/Oz/O2) are a column subset
+    chunks = list(replay_chunks(path, ReplayConfig(chunk_sec=1.0, realtime=False)))
+    np.testing.assert_array_equal(np.concatenate(chunks), data[:, :3])
+
+
+def test_replay_chunks_use_the_session_sample_rate(tmp_path):
+    path = tmp_path / "s500.nrs"
+    data = np.zeros((1000, 3), dtype=np.float32)
+    with SessionWriter(path, 500.0, ["O1", "Oz", "O2"]) as writer:
+        writer.write(data, np.arange(1000) / 500.0)
+
+    # cfg.sample_rate_hz keeps its 250 Hz default; the header rate wins
+    cfg = ReplayConfig(chunk_sec=0.2, realtime=False, with_labels=True)
+    chunks = list(replay_chunks(path, cfg))
+    assert [c.data.shape[0] for c in chunks] == [100] * 10
+    for c in chunks:
+        assert c.t[-1] - c.t[0] + 1 / 500.0 == pytest.approx(cfg.chunk_sec)
@@ -0,0 +1,118 @@
+"""Tests for the shared-memory ring buffer and the detector worker process."""
+
+import sys
+import threading
+import time
+
+import numpy as np
+
+from neurorelay.bridge.detector_worker import DetectorWorker
+from neurorelay.signal.ssvep_detector import SSVEPConfig
+from neurorelay.stream.shared_ring import SharedRingBuffer
+
+
+def test_attached_reader_sees_writer_state():
+    ring = SharedRingBuffer(100, 3)
+    try:
+        reader = SharedRingBuffer.attach(ring.name)
+        assert (reader.max_samples, reader.n_channels) == (100, 3)
+        assert reader.total == 0 and reader.get_latest(10) == (None, None)
+
+        data = np.arange(157 * 3, dtype=np.float32).reshape(157, 3)
+        for start in range(0, 157, 13):
+            ring.append(data[start:start + 13], np.arange(start, min(start + 13, 157), dtype=np.float64))
+
+        assert reader.total == 157 and reader.count == 100
+        view, ts = reader.view_latest(60)
+        np.testing.assert_array_equal(view, data[-60:])
+        np.testing.assert_array_equal(ts, np.arange(97, 157))
+        assert reader.is_intact(157, 60)
+        cursor = reader.reader(from_oldest=True)
+        chunk, _, lost = cursor.read()
+        np.testing.assert_array_equal(chunk, data[-100:])
+        assert lost == 0
+        epochs, valid = reader.epochs([80.0, 150.0], 10)
+        assert valid.tolist() == [True, False]
+        np.testing.assert_array_equal(epochs[0], data[80:90])
+
+        # In-place writes (reserve/commit) are published the same way
+        dest = ring.reserve(5)
+        dest[:] = -1.0
+        ring.commit(5, np.full(5, 157.0))
+        np.testing.assert_array_equal(reader.get_latest(5)[0], -1.0)
+        assert reader.total == 162
+        assert not reader.is_intact(100, 60)
+        assert cursor.read()[0].shape == (5, 3)
+        del view, ts, chunk
+        reader.close()
+    finally:
+        ring.close()
+
+
+def test_concurrent_reader_never_sees_torn_positions():
+    """head, count and total must only ever be observed together, as the writer left them."""
+    max_samples, chunk = 64, 7
+    ring = SharedRingBuffer(max_samples, 2)
+    reader = SharedRingBuffer.attach(ring.name)  # Own lock: only the seqlock orders it against the writer
+    done = threading.Event()
+    errors = []
+
+    def write():
+        n = 0
+        while not done.is_set():
+            ring.append(np.zeros((chunk, 2), dtype=np.float32), np.arange(n, n + chunk, dtype=np.float64))
+            n += chunk
+
+    def read():
+        while not done.is_set() and not errors:
+            head, count, total = reader.positions()
+            if head != total % max_samples or count != min(total, max_samples):
+                errors.append(("positions", head, count, total))
+            _, ts, total = reader.view_latest_with_total(10)
+            last = ts[-1] if ts is not None else total - 1
+            # Views: only meaningful while the writer (one chunk may be in flight) has not lapped them
+            if last != total - 1 and reader.is_intact(total, 10 + chunk):
+                errors.append(("view_latest_with_total", last, total))
+
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    threads = [threading.Thread(target=write), threading.Thread(target=read)]
+    try:
+        for t in threads:
+            t.start()
+        time.sleep(0.5)
+    finally:
+        done.set()
+        for t in threads:
+            t.join()
+        sys.setswitchinterval(switch)
+        reader.close()
+        ring.close()
+    assert not errors, errors[:5]
+
+
+def test_detector_worker_scores_shared_windows():
+    """A detector in another process should read windows straight from shared memory."""
+    sample_rate = 250.0
+    config = SSVEPConfig(frequencies=[8.57, 10.0, 12.0, 15.0], sample_rate=sample_rate, window_seconds=1.0)
+    ring = SharedRingBuffer(int(4 * sample_rate), 3)
+    worker = DetectorWorker(config)
+    try:
+        worker.start(ring.name, None, step_samples=125)
+        results = []
+        n = 0
+        deadline = time.time() + 60.0
+        while len(results) < 3 and time.time() < deadline:
+            t = np.arange(n, n + 25) / sample_rate
+            chunk = np.column_stack([np.sin(2 * np.pi * 12.0 * t)] * 3) + 0.3 * np.random.randn(25, 3)
+            ring.append(chunk.astype(np.float32), t)
+            n += 25
+            time.sleep(0.01)
+            results.extend(worker.poll())
+        assert len(results) >= 3
+        freq, confidence, scores, rejection, total = results[-1]
+        assert freq == 12.0 and rejection is None and total <= n
+        assert set(scores) == set(config.frequencies)
+    finally:
+        worker.stop()
+        ring.close()
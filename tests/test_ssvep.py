@@ -2,7 +2,9 @@
 
 import numpy as np
 import pytest
-from neurorelay.signal.ssvep_detector import SSVEPDetector, SSVEPConfig, generate_reference_signals
+from neurorelay.signal.ssvep_detector import (
+    SSVEPDetector, SSVEPConfig, StreamingFilter, generate_reference_signals, sliding_windows
+)
 
 
 def test_ssvep_config():
@@ -201,5 +203,256 @@ def test_12hz_synthetic_detection():
         assert target_score > max_other * 1.2, "Target frequency should be clearly dominant"
 
 
+
+def test_streaming_filter_matches_batch_sosfilt():
+    """Chunked causal filtering should equal one causal pass over the whole signal."""
+    config = SSVEPConfig(frequencies=[10.0], sample_rate=250.0, window_seconds=1.0, notch_freq=50.0)
+    detector = SSVEPDetector(config)
+    
+    data = np.random.randn(1000, 3)
+    stream = StreamingFilter(detector.stream_sos, 3, 250)
+    chunks = [stream.process(chunk) for chunk in np.array_split(data, 37)]
+    streamed = np.concatenate(chunks)
+    
+    # Reference: same steady-state initialization, single call
+    ref_stream = StreamingFilter(detector.stream_sos, 3, 250)
+    expected = ref_stream.process(data)
+    
+    np.testing.assert_allclose(streamed, expected, atol=1e-10)
+    assert stream.count == 250
+    np.testing.assert_allclose(stream.window(), expected[-250:], atol=1e-10)
+
+
+def test_streaming_detection():
+    """Streaming mode should detect the target frequency from small chunks."""
+    target_freq = 12.0
+    sample_rate = 250.0
+    config = SSVEPConfig(
+        frequencies=[8.0, 10.0, target_freq, 15.0],
+        sample_rate=sample_rate,
+        window_seconds=2.0,
+        streaming=True
+    )
+    detector = SSVEPDetector(config)
+    
+    n_samples = int(4.0 * sample_rate)
+    t = np.arange(n_samples) / sample_rate
+    signal = np.sin(2 * np.pi * target_freq * t)
+    data = np.column_stack([signal + 0.2 * np.random.randn(n_samples) for _ in range(3)])
+    
+    step = int(0.25 * sample_rate)
+    for start in range(0, n_samples, step):
+        freq, confidence, scores = detector.detect_streaming(data[start:start + step])
+    
+    assert detector.stream_samples == int(2.0 * sample_rate)
+    assert freq == target_freq
+    assert len(scores) == 4
+    
+    # Reset drops the filtered window
+    detector.reset_stream()
+    assert detector.stream_samples == 0
+    assert detector.detect_streaming(np.empty((0, 3))) == (0.0, 0.0, {})
+
+
+
+def _cca_reference(x, y):
+    """Textbook CCA via covariance matrices (largest canonical correlation)."""
+    x = x - x.mean(axis=0)
+    y = y - y.mean(axis=0)
+    cxx, cyy, cxy = x.T @ x, y.T @ y, x.T @ y
+    m = np.linalg.solve(cxx, cxy) @ np.linalg.solve(cyy, cxy.T)
+    return float(np.sqrt(np.max(np.linalg.eigvals(m).real)))
+
+
+def test_batched_cca_matches_covariance_cca():
+    """One-shot multi-frequency CCA should match per-frequency textbook CCA."""
+    frequencies = [8.0, 10.0, 12.0, 15.0]
+    config = SSVEPConfig(frequencies=frequencies, sample_rate=250.0, window_seconds=2.0, harmonics=3)
+    detector = SSVEPDetector(config)
+    
+    data = np.random.randn(500, 8)
+    rho = detector.compute_cca_all(data)
+    
+    assert rho.shape == (len(frequencies),)
+    for i, freq in enumerate(frequencies):
+        expected = _cca_reference(data, detector.references[freq])
+        assert rho[i] == pytest.approx(expected, abs=1e-8)
+        assert detector.compute_cca(data, detector.references[freq]) == pytest.approx(expected, abs=1e-8)
+    
+    # Shorter windows trim the references and get their own cached basis
+    short = detector.compute_cca_all(data[:300])
+    assert short.shape == (len(frequencies),)
+    assert set(detector._ref_bases) == {500, 300}
+    
+    # Leading batch dimensions are supported
+    stacked = detector.compute_cca_all(np.stack([data, data[::-1]]))
+    assert stacked.shape == (2, len(frequencies))
+    np.testing.assert_allclose(stacked[0], rho)
+
+
+def test_cca_redundant_channels():
+    """Duplicated channels must not inflate canonical correlations."""
+    config = SSVEPConfig(frequencies=[8.0, 10.0], sample_rate=250.0, window_seconds=2.0)
+    detector = SSVEPDetector(config)
+    
+    x = np.random.randn(500, 1)
+    rho_single = detector.compute_cca_all(x)
+    rho_dup = detector.compute_cca_all(np.hstack([x, x, x]))
+    np.testing.assert_allclose(rho_dup, rho_single, atol=1e-8)
+
+
+
+def test_fbcca_detection():
+    """FBCCA should detect the target from a short window with harmonics."""
+    target_freq = 10.0
+    sample_rate = 250.0
+    config = SSVEPConfig(
+        frequencies=[8.57, target_freq, 12.0, 15.0],
+        sample_rate=sample_rate,
+        window_seconds=1.0,
+        notch_freq=50.0,
+        method="fbcca"
+    )
+    detector = SSVEPDetector(config)
+    
+    assert detector.subband_sos is not None
+    n_bands = detector.subband_sos.shape[0]
+    assert n_bands == 3
+    assert detector.subband_weights[0] > detector.subband_weights[-1]
+    
+    n_samples = int(1.0 * sample_rate)
+    t = np.arange(n_samples) / sample_rate
+    signal = np.sin(2 * np.pi * target_freq * t) + 0.4 * np.sin(2 * np.pi * 2 * target_freq * t)
+    data = np.column_stack([signal + 0.3 * np.random.randn(n_samples) for _ in range(3)])
+    
+    bands = detector.filter_bank(data)
+    assert bands.shape == (n_bands, n_samples, 3)
+    
+    freq, confidence, scores = detector.detect(data)
+    assert freq == target_freq
+    assert len(scores) == 4
+    
+    # Streaming mode runs the same bank causally
+    detector.update_config(streaming=True)
+    for start in range(0, n_samples, 25):
+        freq, confidence, scores = detector.detect_streaming(data[start:start + 25])
+    assert detector._stream.window().shape == (n_bands, n_samples, 3)
+    assert freq == target_freq
+
+
+
+@pytest.mark.parametrize("method", ["cca", "power"])
+def test_incremental_matches_window_refit(method):
+    """Running window sums should give the same streaming scores as refitting the window."""
+    frequencies = [8.57, 10.0, 12.0, 15.0]
+    sample_rate = 250.0
+    base = dict(frequencies=frequencies, sample_rate=sample_rate, window_seconds=1.0,
+                notch_freq=50.0, streaming=True, method=method)
+    incremental = SSVEPDetector(SSVEPConfig(incremental=True, **base))
+    refit = SSVEPDetector(SSVEPConfig(incremental=False, **base))
+    
+    n_samples = int(8.0 * sample_rate)
+    t = np.arange(n_samples) / sample_rate
+    data = np.column_stack([np.sin(2 * np.pi * 10.0 * t) + np.random.randn(n_samples) for _ in range(4)])
+    
+    # Irregular chunk sizes, including one longer than the window
+    sizes = [1, 7, 60, 13, 300, 62, 62, 5, 400, 31]
+    start = 0
+    i = 0
+    while start < n_samples:
+        chunk = data[start:start + sizes[i % len(sizes)]]
+        start += chunk.shape[0]
+        i += 1
+        _, conf_a, scores_a = incremental.detect_streaming(chunk)
+        _, conf_b, scores_b = refit.detect_streaming(chunk)
+        np.testing.assert_allclose([scores_a[f] for f in frequencies],
+                                   [scores_b[f] for f in frequencies], rtol=1e-7, atol=1e-8)
+    
+    assert incremental._stats is not None and incremental._stats.count == 250
+    assert refit._stats is None
+
+
+def test_power_method_uses_exact_target_bins():
+    """Power detection should evaluate exact target frequencies, not the nearest FFT bin."""
+    frequencies = [8.57, 10.0, 12.0, 15.0]
+    sample_rate = 250.0
+    config = SSVEPConfig(frequencies=frequencies, sample_rate=sample_rate, window_seconds=1.0,
+                         harmonics=2, method="power")
+    detector = SSVEPDetector(config)
+    
+    # 8.57 Hz falls between 1 Hz FFT bins of a 1 s window
+    t = np.arange(250) / sample_rate
+    data = np.column_stack([np.sin(2 * np.pi * 8.57 * t), np.cos(2 * np.pi * 8.57 * t)])
+    power = detector.compute_power_all(data)
+    
+    assert power.shape == (4,)
+    assert int(np.argmax(power)) == 0
+    assert power[0] == pytest.approx((250 / 2) ** 2, rel=0.05)
+    assert detector.compute_power_spectrum(data, 8.57) == pytest.approx(power[0], rel=0.05)
+    
+    freq, _, _ = detector.detect(data)
+    assert freq == 8.57
+
+
+@pytest.mark.parametrize("method", ["cca", "fbcca", "power"])
+def test_detect_batch_matches_detect(method):
+    """Batched detection should reproduce per-window detect() results."""
+    frequencies = [8.57, 10.0, 12.0, 15.0]
+    sample_rate = 250.0
+    config = SSVEPConfig(
+        frequencies=frequencies,
+        sample_rate=sample_rate,
+        window_seconds=1.0,
+        channels=["O1", "Oz"],
+        notch_freq=50.0,
+        method=method
+    )
+    detector = SSVEPDetector(config)
+    
+    n_samples = int(6.0 * sample_rate)
+    t = np.arange(n_samples) / sample_rate
+    recording = np.column_stack([
+        np.sin(2 * np.pi * 12.0 * t) + 0.5 * np.random.randn(n_samples) for _ in range(3)
+    ])
+    channel_names = ["Fz", "O1", "Oz"]
+    windows = sliding_windows(recording, 250, 100)
+    assert windows.shape == (13, 250, 3)
+    np.testing.assert_array_equal(windows[1], recording[100:350])
+    
+    predicted, confidence, scores = detector.detect_batch(windows, channel_names, chunk_size=5)
+    assert predicted.shape == (13,) and confidence.shape == (13,) and scores.shape == (13, 4)
+    
+    for i, window in enumerate(windows):
+        freq, conf, score_dict = detector.detect(window, channel_names)
+        assert frequencies[predicted[i]] == freq
+        assert confidence[i] == pytest.approx(conf, rel=1e-6)
+        np.testing.assert_allclose(scores[i], [score_dict[f] for f in frequencies], rtol=1e-6, atol=1e-12)
+
+
+@pytest.mark.parametrize("method", ["cca", "power", "fbcca"])
+def test_multiwindow_matches_scoring_each_window(method):
+    """Nested windows from one preprocessing pass should score like each window on its own."""
+    frequencies = [8.57, 10.0, 12.0, 15.0]
+    sample_rate = 250.0
+    config = SSVEPConfig(frequencies=frequencies, sample_rate=sample_rate, method=method,
+                         window_lengths=(0.5, 1.0, 2.0, 3.0))
+    detector = SSVEPDetector(config)
+    
+    t = np.arange(int(3.0 * sample_rate)) / sample_rate
+    data = np.column_stack([np.sin(2 * np.pi * 12.0 * t) + np.random.randn(t.shape[0]) for _ in range(3)])
+    
+    results = detector.detect_multiwindow(data)
+    assert list(results) == [0.5, 1.0, 2.0, 3.0]
+    
+    filtered = detector.filter_bank(data) if method == "fbcca" else detector.preprocess(data)
+    for seconds, (freq, confidence, scores) in results.items():
+        n = int(seconds * sample_rate)
+        expected_freq, expected_conf, expected = detector._score(filtered[..., -n:, :])
+        np.testing.assert_allclose([scores[f] for f in frequencies],
+                                   [expected[f] for f in frequencies], rtol=1e-7, atol=1e-8)
+        assert freq == expected_freq
+    assert results[3.0][0] == 12.0
+
+
 if __name__ == '__main__':
-    pytest.main([__file__])
\ No newline at end of file
+    pytest.main([__file__])
@@ -0,0 +1,40 @@
+"""Tests for acquisition telemetry counters and histograms."""
+
+import json
+
+import numpy as np
+
+from neurorelay.stream.telemetry import AcquisitionTelemetry
+
+
+def test_counts_chunks_rate_and_sample_gaps():
+    tel = AcquisitionTelemetry(250.0)
+    stamps = np.arange(1000) / 250.0
+    stamps[600:] += 10 / 250.0  # 10 samples dropped mid-chunk
+    stamps[800:] += 5 / 250.0  # 5 more dropped exactly at a chunk boundary
+    for i, start in enumerate(range(0, 1000, 50)):
+        ts = stamps[start:start + 50]
+        tel.record_chunk(ts, arrival=0.2 * i, local_now=ts[-1] + 0.03)
+    tel.record_empty()
+
+    snap = tel.snapshot()
+    assert snap["samples"] == 1000 and snap["chunks"] == 20 and snap["empty_pulls"] == 1
+    assert snap["sample_gaps"] == 2 and snap["samples_missing"] == 15
+    assert abs(snap["rate_hz"] - 250.0) < 1.0
+    assert snap["chunk_size"]["p50"] == 50.0 and sum(snap["chunk_size"]["hist"]) == 20
+    assert abs(snap["inter_chunk_ms"]["mean"] - 200.0) < 1e-6
+    assert abs(snap["latency_ms"]["p50"] - 30.0) < 1e-6
+
+
+def test_latency_uses_clock_correction_and_snapshots_append(tmp_path):
+    tel = AcquisitionTelemetry(None)
+    tel.clock_correction = 100.0  # sender clock runs 100 s behind the local one
+    tel.record_chunk(np.array([1.0, 1.004]), arrival=0.0, local_now=101.014)
+    assert abs(tel.latency_ms.summary()["max"] - 10.0) < 1e-6
+    assert tel.snapshot()["sample_gaps"] == 0  # no nominal rate: gaps are not judged
+
+    path = tmp_path / "telemetry.jsonl"
+    tel.write_snapshot(path, {"stream": "test"})
+    tel.write_snapshot(path)
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(lines) == 2 and lines[0]["stream"] == "test" and lines[1]["samples"] == 2
@@ -0,0 +1,120 @@
+"""Tests for TRCA calibration and the trca detection method."""
+
+import numpy as np
+import pytest
+from neurorelay.signal.ssvep_detector import SSVEPDetector, SSVEPConfig
+from neurorelay.signal.trca import TRCAModel, train_trca
+
+FREQS = [8.57, 10.0, 12.0, 15.0]
+SR = 250.0
+
+
+def _trial(freq, n_samples, rng, phase=None, noise=0.5):
+    """Synthetic SSVEP trial: occipital mixture of fundamental + 2nd harmonic plus noise."""
+    if phase is None:
+        phase = rng.uniform(0, 2 * np.pi)
+    t = np.arange(n_samples) / SR
+    s = np.sin(2 * np.pi * freq * t + phase) + 0.4 * np.sin(2 * np.pi * 2 * freq * t + 2 * phase)
+    mix = np.array([0.9, 1.1, 0.95, 0.2])
+    return np.outer(s, mix) + noise * rng.standard_normal((n_samples, 4))
+
+
+def _calibration_set(rng, n_trials=4, seconds=3.0):
+    n = int(seconds * SR)
+    trials = []
+    labels = []
+    for k, f in enumerate(FREQS):
+        for _ in range(n_trials):
+            trials.append(_trial(f, n, rng))
+            labels.append(k)
+    return np.stack(trials), np.array(labels)
+
+
+@pytest.mark.parametrize("ensemble", [True, False])
+def test_trca_scores_unaligned_windows(ensemble):
+    """TRCA should classify short windows that start at arbitrary stimulus phase."""
+    rng = np.random.default_rng(0)
+    trials, labels = _calibration_set(rng)
+    model = train_trca(trials, labels, FREQS, SR, channels=["O1", "Oz", "O2", "Fz"], ensemble=ensemble)
+
+    assert model.filters.shape == (4, 4)
+    assert model.templates.shape[0] == 4 and model.templates.shape[2] == 4
+
+    n = int(1.0 * SR)
+    correct = 0
+    for k, f in enumerate(FREQS):
+        for _ in range(5):
+            scores = model.score(_trial(f, n, rng))
+            correct += int(np.argmax(scores) == k)
+    assert correct >= 18
+
+    # Batched windows score in one call
+    batch = np.stack([_trial(f, n, rng) for f in FREQS])
+    assert model.score(batch).shape == (4, 4)
+
+
+def test_trca_requires_two_trials_per_class():
+    rng = np.random.default_rng(1)
+    trials, labels = _calibration_set(rng, n_trials=1)
+    with pytest.raises(ValueError):
+        train_trca(trials, labels, FREQS, SR)
+
+
+def test_trca_model_roundtrip_and_detector(tmp_path):
+    """A saved model should load into SSVEPDetector(method='trca') and detect."""
+    rng = np.random.default_rng(2)
+    trials, labels = _calibration_set(rng)
+    model = train_trca(trials, labels, FREQS, SR, channels=["O1", "Oz", "O2", "Fz"])
+    path = tmp_path / "trca.npz"
+    model.save(path)
+
+    loaded = TRCAModel.load(path)
+    assert loaded.channels == ["O1", "Oz", "O2", "Fz"]
+    assert loaded.ensemble is True
+    np.testing.assert_allclose(loaded.filters, model.filters)
+
+    config = SSVEPConfig(
+        frequencies=FREQS,
+        sample_rate=SR,
+        window_seconds=1.0,
+        method="trca",
+        trca_model=str(path)
+    )
+    detector = SSVEPDetector(config)
+    freq, confidence, scores = detector.detect(_trial(12.0, int(SR), rng))
+    assert freq == 12.0
+    assert len(scores) == 4
+
+    # Without a model the method cannot score
+    with pytest.raises(ValueError):
+        SSVEPDetector(SSVEPConfig(frequencies=FREQS, sample_rate=SR, method="trca")).detect(np.ones((250, 4)))
+
+
+def test_trca_input_follows_model_channels(tmp_path):
+    """Inputs are reordered to the model's channels; mismatched models fail clearly."""
+    rng = np.random.default_rng(3)
+    trials, labels = _calibration_set(rng)
+    names = ["O1", "Oz", "O2", "Fz"]
+    model = train_trca(trials, labels, FREQS, SR, channels=names)
+    detector = SSVEPDetector(SSVEPConfig(frequencies=FREQS, sample_rate=SR, window_seconds=1.0, method="trca"))
+    detector.set_trca_model(model)
+
+    window = _trial(10.0, int(SR), rng)
+    order = [3, 1, 0, 2]
+    _, _, expected = detector.detect(window, names)
+    _, _, shuffled = detector.detect(window[:, order], [names[i] for i in order])
+    assert shuffled == pytest.approx(expected)
+    # Extra stream channels are ignored
+    padded = np.column_stack((window, rng.standard_normal(window.shape[0])))
+    assert detector.detect(padded, names + ["Cz"])[2] == pytest.approx(expected)
+
+    with pytest.raises(ValueError, match="Fz"):
+        detector.detect(window[:, :3], names[:3])
+    with pytest.raises(ValueError, match="expects 4 channels"):
+        detector.detect(window[:, :3])
+
+    # The model's sample rate must match the detector's
+    with pytest.raises(ValueError, match="250 Hz"):
+        SSVEPDetector(SSVEPConfig(frequencies=FREQS, sample_rate=500.0, method="trca")).set_trca_model(model)
+    with pytest.raises(ValueError, match="recalibrate"):
+        detector.update_config(sample_rate=500.0)